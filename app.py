@@ -1,245 +1,451 @@
 import streamlit as st
 import pandas as pd
-import io
+import html
+import json
+import math
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from langify_core import (
+    COMPARE_PHASES,
+    DUPLICATE_POLICIES,
+    MERGE_PHASES,
+    RESULT_CATEGORIES,
+    STREAMING_MEMORY_LIMIT_MB,
+    BackgroundJobs,
+    PerformanceRecorder,
+    SizedLRUCache,
+    add_change_summary,
+    build_excel_report,
+    build_csv,
+    build_delta_csv,
+    build_excel_workbook,
+    compare_csv_streaming,
+    compare_dataframes,
+    compare_dataframes_parallel,
+    compare_translation_columns,
+    comparison_result_bytes,
+    compute_diffs,
+    build_zip_archive,
+    create_delta,
+    create_merged_file,
+    detect_encoding,
+    detect_moved_entries,
+    filter_sort_positions,
+    load_export,
+    profile_call,
+    translation_cell_changes
+)
+
+# 업로드 파싱 캐시의 최대 크기 (MB)
+PARSE_CACHE_MAX_MB = 2048
+
+# 비교 결과 캐시의 최대 크기 (MB) - 모든 세션이 공유하며 LANGIFY_RESULT_CACHE_MB 환경 변수로 변경
+RESULT_CACHE_MAX_MB = int(os.environ.get('LANGIFY_RESULT_CACHE_MB', 1024))
+
+# 카테고리별 CSV 다운로드 파일 이름
+RESULT_FILE_NAMES = {
+    'only_in_a': "deleted_records.csv",
+    'only_in_b': "added_records.csv",
+    'col3_changes': "source_changes.csv",
+    'col4_changes': "translation_changes.csv",
+    'both_changes': "both_changes.csv",
+    'moved': "moved_records.csv",
+    'duplicates': "duplicate_keys.csv"
+}
+
+# 중복 키 처리 방식 표시 이름
+DUPLICATE_POLICY_LABELS = {
+    'first': "Use the first row",
+    'last': "Use the last row",
+    'error': "Stop with an error",
+    'position': "Pair rows by position"
+}
+
+# 결과 표 한 페이지의 행 수 선택지 (브라우저에는 현재 페이지만 전송)
+GRID_PAGE_SIZES = [100, 500, 1000]
+
+# inline diff 결과 캐시의 최대 크기 (MB)
+DIFF_CACHE_MAX_MB = 64
+
+# inline diff 워커 프로세스 수
+DIFF_POOL_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+# inline diff에서 처음 선택되는 행 수 (현재 페이지 기준)
+DIFF_DEFAULT_ROWS = 10
+
+# 비교/병합 백그라운드 작업을 동시에 실행하는 스레드 수 (모든 세션 공유)
+JOB_WORKERS = 2
+
+# 실행 중인 작업의 진행 상황을 다시 확인하는 간격 (초)
+JOB_POLL_SECONDS = 0.5
+
+# 끝난 뒤 찾아가지 않은 작업 결과를 보관하는 시간 (초) - 닫힌 세션의 결과가 계속 남지 않도록
+JOB_TTL_SECONDS = 1800
+
+# 찾아가지 않은 작업 결과의 최대 메모리 크기 (MB) - 넘으면 오래된 결과부터 삭제 (모든 세션 공유)
+JOB_RESULT_MAX_MB = 512
+
+# Performance 패널에 보관하는 최근 작업 기록 수 (세션별)
+PERFORMANCE_MAX_RUNS = 20
+
+# cProfile 측정 스위치 - ?profile=1은 다음 작업 한 번, LANGIFY_PROFILE=1은 모든 작업에 적용
+PROFILE_QUERY_PARAM = 'profile'
+PROFILE_ENV_VAR = 'LANGIFY_PROFILE'
+
+# inline diff 표시 스타일 (삭제 = 빨강 취소선, 추가 = 초록)
+DIFF_STYLE = """
+<style>
+.langify-diff { white-space: pre-wrap; word-break: break-word; font-family: monospace; font-size: 0.85rem;
+                padding: 0.5rem; border: 1px solid #e6e6e6; border-radius: 0.25rem; margin-bottom: 0.5rem; }
+.langify-diff del { background-color: #ffd7d5; text-decoration: line-through; }
+.langify-diff ins { background-color: #ccf5d3; text-decoration: none; }
+</style>
+"""
+
+@st.cache_resource
+def _get_parse_cache():
+    """
+    Streamlit rerun 사이에 유지되는 업로드 파싱 캐시를 반환합니다.
+    """
+    return SizedLRUCache(PARSE_CACHE_MAX_MB * 1024 * 1024)
 
-def create_merged_file(df_a, df_b, comparison_result, include_deleted, include_added,
-                       include_source_changes, include_translation_changes,
-                       include_both_changes):
+@st.cache_resource
+def _get_result_cache():
     """
-    사용자 옵션에 따라 병합된 DataFrame을 생성합니다.
-
-    Args:
-        df_a: Original/Live DataFrame
-        df_b: Modified DataFrame
-        comparison_result: compare_dataframes의 결과
-        include_deleted: A에만 있는 항목 포함 여부
-        include_added: B에만 있는 항목 포함 여부
-        include_source_changes: Source 변경 사항 포함 여부 ('use_a', 'use_b', 'skip')
-        include_translation_changes: Translation 변경 사항 포함 여부
-        include_both_changes: 양쪽 모두 변경된 항목 포함 여부
+    모든 세션이 공유하는 비교 결과 캐시를 반환합니다 (두 파일의 내용 해시 + 비교 옵션이 키).
+    """
+    return SizedLRUCache(RESULT_CACHE_MAX_MB * 1024 * 1024)
+
+@st.cache_resource
+def _get_diff_cache():
+    """
+    Streamlit rerun 사이에 유지되는 inline diff 결과 캐시를 반환합니다.
+    """
+    return SizedLRUCache(DIFF_CACHE_MAX_MB * 1024 * 1024)
+
+@st.cache_resource
+def _get_diff_pool():
+    """
+    inline diff 계산용 워커 프로세스 풀을 반환합니다 (rerun 사이에 재사용).
+    """
+    return ProcessPoolExecutor(max_workers=DIFF_POOL_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+
+@st.cache_resource
+def _get_jobs():
+    """
+    모든 세션이 공유하는 비교/병합 백그라운드 작업 풀을 반환합니다.
+    """
+    return BackgroundJobs(max_workers=JOB_WORKERS, max_result_bytes=JOB_RESULT_MAX_MB * 1024 * 1024,
+                          result_size=_job_result_bytes)
+
+def _job_result_bytes(output):
+    """
+    _run_measured 작업 결과(비교 결과 dict 또는 병합 DataFrame)의 메모리 크기(bytes)를 반환합니다.
+    """
+    value = output[0]
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    return comparison_result_bytes(value)
+
+def _run_measured(operation, func, *args, profile=False, progress=None, **kwargs):
+    """
+    함수의 단계별 실행 시간, 처리 행 수, 최대 메모리를 기록하며 실행합니다 (profile이면 cProfile도 함께 실행).
 
     Returns:
-        Merged DataFrame
+        (반환값, 성능 기록 dict, 프로파일 dict 또는 None)
+    """
+    with PerformanceRecorder(operation, progress) as recorder:
+        if profile:
+            value, profile_data = profile_call(func, *args, progress=recorder, **kwargs)
+        else:
+            value, profile_data = func(*args, progress=recorder, **kwargs), None
+    return value, recorder.finish(), profile_data
+
+def _take_profile_request():
     """
-    merged_records = []
-
-    # 키 컬럼 설정 (항상 ID + Name)
-    key_columns = df_a.columns[:2].tolist()
-
-    # 키 생성
-    df_a_copy = df_a.copy()
-    df_b_copy = df_b.copy()
-    df_a_copy['key'] = df_a_copy[key_columns].astype(str).agg('|'.join, axis=1)
-    df_b_copy['key'] = df_b_copy[key_columns].astype(str).agg('|'.join, axis=1)
-
-    # 처리된 키 추적
-    processed_keys = set()
-
-    # 1. A에만 있는 항목 (Deleted) - 선택 시 Live 버전 유지
-    if include_deleted and not comparison_result['only_in_a'].empty:
-        for _, row in comparison_result['only_in_a'].iterrows():
-            merged_records.append(row.to_dict())
-            # 키 추적 (항상 ID + Name)
-            row_copy = row.copy()
-            key = '|'.join([str(row_copy[col]) for col in df_a.columns[:2]])
-            processed_keys.add(key)
-
-    # 2. B에만 있는 항목 (Added) - 선택 시 Modified 버전 추가
-    if include_added and not comparison_result['only_in_b'].empty:
-        for _, row in comparison_result['only_in_b'].iterrows():
-            merged_records.append(row.to_dict())
-            # 키 추적 (항상 ID + Name)
-            row_copy = row.copy()
-            key = '|'.join([str(row_copy[col]) for col in df_b.columns[:2]])
-            processed_keys.add(key)
-
-    # 3. Source 변경 (col3_changes) - Before/After 컬럼을 원래 형식으로 복원
-    if include_source_changes != 'skip' and not comparison_result['col3_changes'].empty:
-        for _, row in comparison_result['col3_changes'].iterrows():
-            record = {}
-
-            # 키 컬럼들 복사
-            for i, col in enumerate(df_b.columns[:len(key_columns)]):
-                record[col] = row.iloc[i]
-
-            # Source 처리: use_b이면 After, use_a이면 Before 사용
-            if include_source_changes == 'use_b':
-                # B의 Source 사용 (After)
-                after_col = [c for c in row.index if '_After (File_B)' in c and df_b.columns[2] in c]
-                if after_col:
-                    record[df_b.columns[2]] = row[after_col[0]]
-            elif include_source_changes == 'use_a':
-                # A의 Source 사용 (Before)
-                before_col = [c for c in row.index if '_Before (File_A)' in c and df_b.columns[2] in c]
-                if before_col:
-                    record[df_b.columns[2]] = row[before_col[0]]
-
-            # Translation은 Unchanged 값 사용
-            unchanged_col = [c for c in row.index if '(Unchanged)' in c and df_b.columns[3] in c]
-            if unchanged_col:
-                record[df_b.columns[3]] = row[unchanged_col[0]]
-
-            merged_records.append(record)
-
-            # 키 추적 (항상 ID + Name)
-            key = '|'.join([str(record[col]) for col in df_b.columns[:2]])
-            processed_keys.add(key)
-
-    # 4. Translation 변경 (col4_changes)
-    if include_translation_changes and not comparison_result['col4_changes'].empty:
-        for _, row in comparison_result['col4_changes'].iterrows():
-            record = {}
-
-            # 키 컬럼들 복사
-            for i, col in enumerate(df_b.columns[:len(key_columns)]):
-                record[col] = row.iloc[i]
-
-            # Source는 Unchanged 값 사용
-            unchanged_col = [c for c in row.index if '(Unchanged)' in c and df_b.columns[2] in c]
-            if unchanged_col:
-                record[df_b.columns[2]] = row[unchanged_col[0]]
-
-            # Translation은 After 값 사용
-            after_col = [c for c in row.index if '_After (File_B)' in c and df_b.columns[3] in c]
-            if after_col:
-                record[df_b.columns[3]] = row[after_col[0]]
-
-            merged_records.append(record)
-
-            # 키 추적 (항상 ID + Name)
-            key = '|'.join([str(record[col]) for col in df_b.columns[:2]])
-            processed_keys.add(key)
-
-    # 5. Both 변경 (both_changes)
-    if include_both_changes and not comparison_result['both_changes'].empty:
-        for _, row in comparison_result['both_changes'].iterrows():
-            record = {}
-
-            # 키 컬럼들 복사
-            for i, col in enumerate(df_b.columns[:len(key_columns)]):
-                record[col] = row.iloc[i]
-
-            # Source와 Translation 모두 After 값 사용
-            source_after_col = [c for c in row.index if '_After (File_B)' in c and df_b.columns[2] in c]
-            if source_after_col:
-                record[df_b.columns[2]] = row[source_after_col[0]]
-
-            translation_after_col = [c for c in row.index if '_After (File_B)' in c and df_b.columns[3] in c]
-            if translation_after_col:
-                record[df_b.columns[3]] = row[translation_after_col[0]]
-
-            merged_records.append(record)
-
-            # 키 추적 (항상 ID + Name)
-            key = '|'.join([str(record[col]) for col in df_b.columns[:2]])
-            processed_keys.add(key)
-
-    # 6. 변경되지 않은 항목들 (모든 키에서 처리되지 않은 것들)
-    # Live 파일(A)의 모든 키 확인
-    for _, row in df_a_copy.iterrows():
-        if row['key'] not in processed_keys:
-            # 변경되지 않은 항목이므로 Live 버전 사용
-            record = {col: row[col] for col in df_a.columns}
-            merged_records.append(record)
-
-    # DataFrame 생성
-    merged_df = pd.DataFrame(merged_records)
-
-    # 컬럼 순서를 원본과 동일하게 유지
-    merged_df = merged_df[df_a.columns.tolist()]
-
-    return merged_df
-
-def compare_dataframes(df_a, df_b):
+    이번 작업을 cProfile로 측정할지 확인합니다 (쿼리 파라미터는 한 번 사용하면 제거).
     """
-    두 DataFrame을 비교하여 차이점을 분석합니다.
+    if st.query_params.get(PROFILE_QUERY_PARAM) == '1':
+        del st.query_params[PROFILE_QUERY_PARAM]
+        return True
+    return os.environ.get(PROFILE_ENV_VAR) == '1'
 
-    Args:
-        df_a (DataFrame): Live/Current CSV 데이터 (A.csv)
-        df_b (DataFrame): Modified CSV 데이터 (B.csv)
+def _record_performance(performance, profile=None):
     """
-    # 데이터 복사 (원본 보호)
-    df_a = df_a.copy()
-    df_b = df_b.copy()
-
-    # 컬럼 확인
-    if len(df_a.columns) < 4 or len(df_b.columns) < 4:
-        raise ValueError("CSV files must have at least 4 columns.")
-
-    # 키 컬럼 설정 (항상 ID + Name)
-    key_columns = df_a.columns[:2].tolist()
-
-    # 키 조합 생성
-    df_a['key'] = df_a[key_columns].astype(str).agg('|'.join, axis=1)
-    df_b['key'] = df_b[key_columns].astype(str).agg('|'.join, axis=1)
-
-    # 1. A에만 있는 자료 (A - B)
-    keys_only_in_a = set(df_a['key']) - set(df_b['key'])
-    only_in_a = df_a[df_a['key'].isin(keys_only_in_a)].drop('key', axis=1)
-
-    # 2. B에만 있는 자료 (B - A)
-    keys_only_in_b = set(df_b['key']) - set(df_a['key'])
-    only_in_b = df_b[df_b['key'].isin(keys_only_in_b)].drop('key', axis=1)
-
-    # 3. 키는 동일하지만 3번째 또는 4번째 컬럼이 다른 경우
-    common_keys = set(df_a['key']) & set(df_b['key'])
-
-    col3_changes = []  # 3번째 컬럼 변경 사항
-    col4_changes = []  # 4번째 컬럼 변경 사항
-    both_changes = []  # 둘 다 변경된 사항
-
-    for key in common_keys:
-        row_a = df_a[df_a['key'] == key].iloc[0]
-        row_b = df_b[df_b['key'] == key].iloc[0]
-
-        # 3번째 컬럼 (인덱스 2) 또는 4번째 컬럼 (인덱스 3) 비교
-        col3_diff = str(row_a.iloc[2]) != str(row_b.iloc[2])
-        col4_diff = str(row_a.iloc[3]) != str(row_b.iloc[3])
-
-        if col3_diff or col4_diff:
-            # 공통 데이터 (키 컬럼들 - 항상 ID + Name)
-            base_data = {col: row_a[col] for col in df_a.columns[:2] if col != 'key'}
-
-            if col3_diff and col4_diff:
-                # 둘 다 변경된 경우
-                change_record = {
-                    **base_data,
-                    f'{df_a.columns[2]}_Before (File_A)': row_a.iloc[2],
-                    f'{df_a.columns[2]}_After (File_B)': row_b.iloc[2],
-                    f'{df_a.columns[3]}_Before (File_A)': row_a.iloc[3],
-                    f'{df_a.columns[3]}_After (File_B)': row_b.iloc[3]
-                }
-                both_changes.append(change_record)
-            elif col3_diff:
-                # 3번째 컬럼만 변경
-                change_record = {
-                    **base_data,
-                    f'{df_a.columns[2]}_Before (File_A)': row_a.iloc[2],
-                    f'{df_a.columns[2]}_After (File_B)': row_b.iloc[2],
-                    f'{df_a.columns[3]} (Unchanged)': row_a.iloc[3]
-                }
-                col3_changes.append(change_record)
-            elif col4_diff:
-                # 4번째 컬럼만 변경
-                change_record = {
-                    **base_data,
-                    f'{df_a.columns[2]} (Unchanged)': row_a.iloc[2],
-                    f'{df_a.columns[3]}_Before (File_A)': row_a.iloc[3],
-                    f'{df_a.columns[3]}_After (File_B)': row_b.iloc[3]
-                }
-                col4_changes.append(change_record)
-
-    col3_changes_df = pd.DataFrame(col3_changes)
-    col4_changes_df = pd.DataFrame(col4_changes)
-    both_changes_df = pd.DataFrame(both_changes)
-
-    return {
-        'only_in_a': only_in_a,
-        'only_in_b': only_in_b,
-        'col3_changes': col3_changes_df,
-        'col4_changes': col4_changes_df,
-        'both_changes': both_changes_df
-    }
+    작업의 성능 기록을 세션에 추가하고, 프로파일이 있으면 최근 프로파일로 저장합니다.
+
+    단계가 없는 기록(파싱 캐시 적중 등)은 추가하지 않습니다.
+    """
+    if performance['phases']:
+        runs = st.session_state.setdefault('performance_runs', [])
+        runs.append(performance)
+        del runs[:-PERFORMANCE_MAX_RUNS]
+    if profile is not None:
+        st.session_state['profile'] = dict(profile, operation=performance['operation'],
+                                           started=performance['started'])
+
+def _measure(operation, func, *args, profile=False, **kwargs):
+    """
+    화면을 실행하는 중에 바로 처리하는 작업(파싱, 내보내기)을 측정하여 성능 기록에 추가합니다.
+    """
+    value, performance, profile_data = _run_measured(operation, func, *args, profile=profile, **kwargs)
+    _record_performance(performance, profile_data)
+    return value
+
+def _run_compare(df_a, df_b, key_a, key_b, fingerprints_a, fingerprints_b, duplicate_policy, workers,
+                 progress):
+    """
+    백그라운드 작업: 워커 수에 따라 단일 프로세스 또는 병렬로 비교합니다.
+    """
+    if workers > 1:
+        return compare_dataframes_parallel(df_a, df_b, workers=workers, duplicate_policy=duplicate_policy,
+                                           progress=progress)
+    return compare_dataframes(df_a, df_b, key_a, key_b, fingerprints_a, fingerprints_b, duplicate_policy,
+                              progress)
+
+def _job_running(job_key):
+    """
+    세션의 작업이 아직 대기 중이거나 실행 중인지 확인합니다.
+    """
+    status = _get_jobs().status(st.session_state.get(job_key))
+    return status is not None and status['state'] in ('queued', 'running')
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def _job_progress(job_key, label):
+    """
+    실행 중인 작업의 단계별 진행률과 Cancel 버튼을 표시합니다.
+
+    이 부분만 JOB_POLL_SECONDS마다 다시 실행하여 작업 상태를 확인하고,
+    작업이 끝나면 전체 화면을 다시 실행하여 결과를 표시합니다.
+    """
+    jobs = _get_jobs()
+    status = jobs.status(st.session_state.get(job_key))
+    if status is None or status['state'] not in ('queued', 'running'):
+        st.rerun()
+
+    phase = status['phase'] or "waiting in queue"
+    st.progress(status['progress'], text=f"{label}: {phase} ({status['elapsed']:.1f}s)")
+    if status['cancelling'] or st.button("✖ Cancel", key=f"{job_key}_cancel"):
+        jobs.cancel(st.session_state[job_key])
+        st.caption("Cancelling after the current phase...")
+
+def _cache_caption(cache, max_mb):
+    """
+    캐시의 항목 수, 사용량, 적중/실패 횟수와 적중률을 한 줄로 표시합니다.
+    """
+    hit_rate = cache.hit_rate()
+    return (f"Entries: {len(cache)} · {cache.total_bytes / 1024 / 1024:.1f} / {max_mb} MB · "
+            f"Hits: {cache.hits} · Misses: {cache.misses} · "
+            f"Hit rate: {'-' if hit_rate is None else f'{hit_rate:.0%}'}")
+
+def _set_comparison_result(result, duplicate_policy, from_cache):
+    """
+    비교 결과를 세션에 저장하고 이전 결과로 만든 리포트와 다운로드를 폐기합니다.
+
+    결과 캐시의 dict는 여러 세션이 공유하므로 얕은 복사본을 저장합니다.
+    세션에서 추가하는 항목(moved)은 캐시에 영향을 주지 않으며, 결과 DataFrame은 수정하지 않습니다.
+    """
+    st.session_state['comparison_result'] = dict(result)
+    st.session_state['comparison_duplicate_policy'] = duplicate_policy
+    st.session_state['comparison_from_cache'] = from_cache
+    st.session_state['excel_report'] = None
+    st.session_state['results_zip'] = None
+    st.session_state['csv_downloads'] = {}
+    st.session_state['display_frames'] = {}
+    st.session_state['language_result'] = None
+
+def _ingest_caption(ingest):
+    """
+    파일 파싱 정보(인코딩, 크기, 처리량)를 한 줄로 표시합니다.
+    """
+    throughput = f"{ingest['mb_per_s']:.0f} MB/s" if ingest['mb_per_s'] else "-"
+    return (f"{ingest['encoding']} · {ingest['bytes'] / 1024 / 1024:.1f} MB parsed in "
+            f"{ingest['seconds']:.2f}s ({throughput}, {ingest['engine']} reader)")
+
+def _csv_download(name, frame, file_name):
+    """
+    CSV 다운로드 버튼을 표시합니다.
+
+    CSV는 Prepare 버튼을 눌렀을 때만 청크 단위로 생성하고, 결과별로 csv_downloads에 캐시합니다.
+    """
+    downloads = st.session_state.setdefault('csv_downloads', {})
+    if name not in downloads:
+        if st.button("📄 Prepare CSV", key=f"prepare_csv_{name}", use_container_width=True):
+            with st.spinner('Building CSV...'):
+                downloads[name] = _measure('export', build_csv, frame, profile=_take_profile_request())
+
+    if name in downloads:
+        st.download_button(
+            label="📥 Download CSV",
+            data=downloads[name],
+            file_name=file_name,
+            mime="text/csv",
+            key=f"download_csv_{name}",
+            use_container_width=True
+        )
+
+def _performance_panel():
+    """
+    사이드바에 최근 작업의 단계별 실행 시간, 처리 행 수, 최대 메모리(RSS)와 JSON/프로파일 다운로드를 표시합니다.
+    """
+    st.sidebar.header("Performance")
+    runs = st.session_state.get('performance_runs', [])
+    if not runs:
+        st.sidebar.caption("Parse, compare, merge and export phases are measured here once they run.")
+    for run in reversed(runs[-3:]):
+        peaks = [phase['peak_rss_mb'] for phase in run['phases'] if phase['peak_rss_mb'] is not None]
+        peak = f" · peak {max(peaks):.0f} MB" if peaks else ""
+        phases = " · ".join(f"{phase['phase']} {phase['seconds']:.2f}s" for phase in run['phases'])
+        st.sidebar.caption(f"**{run['operation']}** {run['seconds']:.2f}s{peak}  \n{phases}")
+
+    if runs:
+        with st.sidebar.expander(f"All phases ({len(runs)} runs)"):
+            st.dataframe(
+                pd.DataFrame([phase for run in runs for phase in run['phases']]),
+                hide_index=True,
+                column_config={'peak_rss_mb': st.column_config.NumberColumn("peak RSS (MB)")}
+            )
+        st.sidebar.download_button(
+            label="📈 Download performance JSON",
+            data=json.dumps({'runs': runs}, indent=2),
+            file_name="langify_performance.json",
+            mime="application/json",
+            use_container_width=True
+        )
+
+    # cProfile 결과 (?profile=1 또는 LANGIFY_PROFILE=1로 실행한 최근 작업)
+    profile = st.session_state.get('profile')
+    if profile is not None:
+        st.sidebar.download_button(
+            label=f"🔬 Download profile ({profile['operation']})",
+            data=profile['stats'],
+            file_name=f"langify_{profile['operation'].replace(' ', '_')}.prof",
+            mime="application/octet-stream",
+            use_container_width=True,
+            help="Open with python -m pstats or snakeviz"
+        )
+        with st.sidebar.expander("Profile summary"):
+            st.code(profile['summary'], language=None)
+    else:
+        st.sidebar.caption(f"Add ?{PROFILE_QUERY_PARAM}=1 to the URL to profile the next compare, merge or export "
+                           f"(or set {PROFILE_ENV_VAR}=1 to profile every run).")
+
+def _result_grid(name, frame, column_config=None):
+    """
+    결과 DataFrame을 페이지 단위로 표시합니다.
+
+    검색/정렬은 서버에서 전체 행에 대해 처리하고, 브라우저에는 현재 페이지의 행만 보냅니다.
+    검색/정렬 결과(행 위치)는 비교 결과별로 display_frames에 캐시합니다.
+    """
+    display_frames = st.session_state.setdefault('display_frames', {})
+    columns = frame.columns.tolist()
+
+    col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
+    with col1:
+        search = st.text_input("🔎 Search", key=f"{name}_search", placeholder="Filter rows...")
+    with col2:
+        search_column = st.selectbox("Search in", ['All columns'] + columns, key=f"{name}_search_column")
+    with col3:
+        sort_column = st.selectbox("Sort by", ['(Original order)'] + columns, key=f"{name}_sort_column")
+    with col4:
+        descending = st.toggle("Descending", key=f"{name}_descending")
+
+    # 검색/정렬 조건이 바뀌었을 때만 다시 계산하고 첫 페이지로 이동
+    params = (search, search_column, sort_column, descending)
+    cached = display_frames.get(f'{name}_view')
+    if cached is None or cached[0] != params:
+        positions = filter_sort_positions(
+            frame,
+            search=search or None,
+            search_column=None if search_column == 'All columns' else search_column,
+            sort_column=None if sort_column == '(Original order)' else sort_column,
+            ascending=not descending
+        )
+        display_frames[f'{name}_view'] = (params, positions)
+        st.session_state[f'{name}_page'] = 1
+    positions = display_frames[f'{name}_view'][1]
+
+    col1, col2, col3 = st.columns([1, 1, 3])
+    with col1:
+        page_size = st.selectbox("Rows per page", GRID_PAGE_SIZES, key=f"{name}_page_size")
+    pages = max(1, math.ceil(len(positions) / page_size))
+    if st.session_state.get(f'{name}_page', 1) > pages:
+        st.session_state[f'{name}_page'] = pages
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=pages, key=f"{name}_page")
+
+    start = (page - 1) * page_size
+    page_df = frame.iloc[positions[start:start + page_size]]
+    st.dataframe(
+        page_df,
+        use_container_width=True,
+        height=400,
+        column_config=column_config
+    )
+
+    caption = f"Showing rows {min(start + 1, len(positions))}–{min(start + page_size, len(positions))} of {len(positions)}"
+    if len(positions) != len(frame):
+        caption += f" (filtered from {len(frame)})"
+    with col3:
+        st.caption(f"Page {page} of {pages}")
+    st.caption(caption)
+    return page_df
+
+def _diff_view(name, page_df):
+    """
+    현재 페이지에서 선택한 행의 Before/After 값을 단어/글자 단위 inline diff로 표시합니다.
+
+    diff는 토글을 켰을 때 선택한 행에 대해서만 워커 풀에서 계산하며,
+    diff 캐시에 보관하여 같은 값은 다시 계산하지 않습니다.
+    """
+    fields = [
+        (column[:-len('_Before (File_A)')], column, column.replace('_Before (File_A)', '_After (File_B)'))
+        for column in page_df.columns if column.endswith('_Before (File_A)')
+    ]
+    if page_df.empty or not fields:
+        return
+    if not st.toggle("🔍 Show inline diff for rows on this page", key=f"{name}_show_diff"):
+        return
+
+    labels = [f"{row_id} · {row_name}" for row_id, row_name in page_df.iloc[:, :2].itertuples(index=False, name=None)]
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        selected = st.multiselect(
+            "Rows",
+            range(len(labels)),
+            default=list(range(min(DIFF_DEFAULT_ROWS, len(labels)))),
+            format_func=lambda i: labels[i],
+            key=f"{name}_diff_rows_{len(labels)}"
+        )
+    with col2:
+        granularity = st.radio(
+            "Granularity",
+            ['word', 'char'],
+            format_func=lambda value: 'Word' if value == 'word' else 'Character',
+            key=f"{name}_diff_granularity",
+            horizontal=True
+        )
+
+    pairs = [(page_df.iloc[i][before], page_df.iloc[i][after]) for i in selected for _, before, after in fields]
+    try:
+        diffs = compute_diffs(pairs, granularity, _get_diff_cache(), _get_diff_pool())
+    except BrokenProcessPool:
+        # 워커가 비정상 종료되면 풀을 다시 만들고 이번에는 현재 프로세스에서 계산
+        _get_diff_pool.clear()
+        diffs = compute_diffs(pairs, granularity, _get_diff_cache())
+
+    st.markdown(DIFF_STYLE, unsafe_allow_html=True)
+    for n, i in enumerate(selected):
+        st.markdown(f"**{html.escape(labels[i])}**")
+        for k, (field, _, _) in enumerate(fields):
+            st.markdown(
+                f'<div class="langify-diff"><b>{html.escape(str(field))}</b>: {diffs[n * len(fields) + k]}</div>',
+                unsafe_allow_html=True
+            )
 
 def main():
     st.set_page_config(
@@ -426,7 +632,52 @@ def main():
         "✅ Excel/CSV export"
     )
 
+    # 대용량 파일 옵션
+    st.sidebar.header("Large Files")
+    streaming_mode = st.sidebar.checkbox(
+        "💾 Streaming mode (low memory)",
+        value=False,
+        help="Compare files in chunks on disk instead of loading them fully into memory"
+    )
+    memory_limit_mb = st.sidebar.number_input(
+        "Memory limit (MB)",
+        min_value=64,
+        value=STREAMING_MEMORY_LIMIT_MB,
+        step=64,
+        disabled=not streaming_mode,
+        help="Maximum amount of data held in memory at once during a streaming comparison"
+    )
+    compact_mode = st.sidebar.checkbox(
+        "🗜️ Compact memory mode",
+        value=False,
+        disabled=streaming_mode,
+        help="Store loaded files as Arrow strings with a dictionary-encoded Name column to reduce memory use"
+    )
+    parallel_workers = st.sidebar.number_input(
+        "Parallel workers",
+        min_value=1,
+        max_value=os.cpu_count() or 1,
+        value=1,
+        help="Number of processes used to compare large files (1 = single process)"
+    )
+
+    # 중복 키(ID + Name) 처리 방식
+    st.sidebar.header("Duplicate Keys")
+    duplicate_policy = st.sidebar.selectbox(
+        "When an ID + Name key occurs more than once",
+        DUPLICATE_POLICIES,
+        format_func=DUPLICATE_POLICY_LABELS.get,
+        key="duplicate_policy",
+        help="Pair rows by position compares the n-th duplicate in File A with the n-th duplicate in File B"
+    )
+
     # 파일 업로드 섹션
+    parse_cache = _get_parse_cache()
+    result_cache = _get_result_cache()
+    jobs = _get_jobs()
+    # 닫힌 세션이 찾아가지 않은 작업 결과는 rerun마다 정리
+    jobs.purge(JOB_TTL_SECONDS)
+    cache_hit_a = cache_hit_b = None
     col1, col2, col3 = st.columns([2, 2, 1])
 
     with col1:
@@ -440,9 +691,19 @@ def main():
             label_visibility="collapsed"
         )
 
-        if file_a:
-            df_a_preview = pd.read_csv(file_a, dtype=str)
+        if file_a and streaming_mode:
+            encoding = detect_encoding(file_a)
+            df_a_preview = pd.read_csv(file_a, dtype=str, nrows=10, encoding=encoding)
+            st.success(f"✅ Ready: {file_a.size / 1024 / 1024:.1f} MB (streaming mode)")
+
+            with st.expander("Preview File A"):
+                st.dataframe(df_a_preview)
+        elif file_a:
+            df_a_preview, key_a, fingerprints_a, ingest_a, cache_hit_a = _measure(
+                'parse File A', load_export, file_a, parse_cache, compact=compact_mode
+            )
             st.success(f"✅ Loaded: {len(df_a_preview)} records")
+            st.caption(_ingest_caption(ingest_a))
 
             with st.expander("Preview File A"):
                 st.dataframe(df_a_preview.head(10))
@@ -458,13 +719,30 @@ def main():
             label_visibility="collapsed"
         )
 
-        if file_b:
-            df_b_preview = pd.read_csv(file_b, dtype=str)
+        if file_b and streaming_mode:
+            encoding = detect_encoding(file_b)
+            df_b_preview = pd.read_csv(file_b, dtype=str, nrows=10, encoding=encoding)
+            st.success(f"✅ Ready: {file_b.size / 1024 / 1024:.1f} MB (streaming mode)")
+
+            with st.expander("Preview File B"):
+                st.dataframe(df_b_preview)
+        elif file_b:
+            df_b_preview, key_b, fingerprints_b, ingest_b, cache_hit_b = _measure(
+                'parse File B', load_export, file_b, parse_cache, compact=compact_mode
+            )
             st.success(f"✅ Loaded: {len(df_b_preview)} records")
+            st.caption(_ingest_caption(ingest_b))
 
             with st.expander("Preview File B"):
                 st.dataframe(df_b_preview.head(10))
 
+    # 파싱 캐시 상태 표시
+    st.sidebar.header("Parse Cache")
+    for label, cache_hit in (("File A", cache_hit_a), ("File B", cache_hit_b)):
+        if cache_hit is not None:
+            st.sidebar.caption(f"{label}: {'✅ cache hit' if cache_hit else '🔄 parsed (cache miss)'}")
+    st.sidebar.caption(_cache_caption(parse_cache, PARSE_CACHE_MAX_MB))
+
     # 비교 버튼을 파일 업로드 영역에 통합
     with col3:
         st.markdown("### 🔍 Analysis")
@@ -477,6 +755,7 @@ def main():
                 "▶ Compare Files",
                 type="primary",
                 use_container_width=True,
+                disabled=_job_running('compare_job'),
                 help="Click to analyze differences between the two files"
             )
         else:
@@ -484,34 +763,128 @@ def main():
             st.info("📤 Upload both Langify export files to enable comparison")
             compare_button = False
 
-    # 비교 실행
-    if file_a and file_b and compare_button:
+    # 스트리밍 비교 실행 - 결과는 디스크의 CSV 파일로 저장
+    # 결과 폴더는 세션이 소유 - 새 결과로 바뀌거나 실패하면 바로 지우고, 세션이 끝나면 폴더 객체와 함께 삭제
+    if file_a and file_b and compare_button and streaming_mode:
+        output_dir = tempfile.TemporaryDirectory(prefix='langify_compare_')
         try:
-            # 비교 실행 - 메모리에서 직접 처리
-            with st.spinner('Analyzing differences...'):
-                # DataFrame을 직접 사용하여 비교 수행
-                result = compare_dataframes(df_a_preview, df_b_preview)
+            with st.spinner('Analyzing differences in streaming mode...'):
+                with PerformanceRecorder('compare') as recorder:
+                    recorder('streaming compare')
+                    streaming_result = compare_csv_streaming(
+                        file_a, file_b, output_dir.name, memory_limit_mb=memory_limit_mb,
+                        duplicate_policy=duplicate_policy
+                    )
+                _record_performance(recorder.finish())
 
-                # 결과를 세션 상태에 저장
-                st.session_state['comparison_result'] = result
+            previous_dir = st.session_state.get('streaming_dir')
+            if previous_dir is not None:
+                previous_dir.cleanup()
+            st.session_state['streaming_dir'] = output_dir
+            st.session_state['streaming_result'] = streaming_result
 
         except Exception as e:
+            output_dir.cleanup()
             st.error(f"❌ Error: {str(e)}")
 
+    # 비교 실행 - 같은 파일 쌍과 옵션의 결과가 캐시에 있으면 다른 세션의 결과를 그대로 사용하고,
+    # 없으면 백그라운드 작업으로 시작하여 작업 ID만 세션에 보관 (다시 실행해도 새로 시작하지 않음)
+    elif file_a and file_b and compare_button and not _job_running('compare_job'):
+        cache_key = (ingest_a['content_hash'], ingest_b['content_hash'], compact_mode, duplicate_policy)
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            _set_comparison_result(cached, duplicate_policy, from_cache=True)
+        else:
+            st.session_state['compare_job'] = jobs.submit(
+                _run_measured, 'compare', _run_compare,
+                df_a_preview, df_b_preview, key_a, key_b, fingerprints_a, fingerprints_b,
+                duplicate_policy, parallel_workers, profile=_take_profile_request(), phases=COMPARE_PHASES
+            )
+            st.session_state['compare_job_policy'] = duplicate_policy
+            st.session_state['compare_job_cache_key'] = cache_key
+            # 이전 결과는 새 결과가 나올 때까지 숨김
+            st.session_state['comparison_result'] = None
+
+    # 비교 작업 상태 확인 - 끝났으면 결과를 세션에 저장, 실행 중이면 진행 상황 표시
+    compare_job = st.session_state.get('compare_job')
+    if compare_job is not None:
+        status = jobs.status(compare_job)
+        if status is None or status['state'] not in ('queued', 'running'):
+            output = jobs.pop(compare_job)
+            st.session_state['compare_job'] = None
+            if status is not None and status['state'] == 'done':
+                result, performance, profile = output
+                _record_performance(performance, profile)
+
+                # 다른 세션도 사용할 수 있도록 결과 캐시에 저장한 뒤 세션에 저장
+                result_cache.put(st.session_state['compare_job_cache_key'], result,
+                                 comparison_result_bytes(result))
+                _set_comparison_result(result, st.session_state['compare_job_policy'], from_cache=False)
+            elif status is not None and status['state'] == 'failed':
+                st.error(f"❌ Error: {status['error']}")
+            elif status is None:
+                st.warning("⚠️ The comparison result expired before it was shown. Please compare again.")
+            else:
+                st.warning("⏹️ Comparison cancelled")
+        else:
+            _job_progress('compare_job', "Analyzing differences")
+
+    # 결과 캐시 상태 표시 (모든 세션 공유)
+    st.sidebar.header("Result Cache")
+    st.sidebar.caption(_cache_caption(result_cache, RESULT_CACHE_MAX_MB))
+
+    # 스트리밍 모드 결과 표시 - 카테고리별 건수와 CSV 다운로드만 제공
+    if streaming_mode and st.session_state.get('streaming_result') is not None:
+        streaming_result = st.session_state['streaming_result']
+        category_labels = {
+            'only_in_a': '🗑️ Deleted',
+            'only_in_b': '➕ Added',
+            'col3_changes': '🔤 Source',
+            'col4_changes': '🌐 Translation',
+            'both_changes': '🔄 Both',
+            'duplicates': '👥 Duplicate keys'
+        }
+
+        st.markdown("---")
+        st.success("✅ Streaming analysis completed!")
+        st.caption("Results were written to disk partition by partition. "
+                   "Grid views and merge are available in normal mode.")
+
+        streaming_names = RESULT_CATEGORIES + ['duplicates']
+        for column, name in zip(st.columns(len(streaming_names)), streaming_names):
+            with column:
+                st.metric(category_labels[name], streaming_result[name]['count'])
+                with open(streaming_result[name]['path'], 'rb') as f:
+                    st.download_button(
+                        label="📥 Download CSV",
+                        data=f,
+                        file_name=f"{name}.csv",
+                        mime="text/csv",
+                        key=f"streaming_{name}",
+                        use_container_width=True
+                    )
+
     # 결과 영역을 완전히 분리하여 표시
-    if 'comparison_result' in st.session_state and st.session_state['comparison_result'] is not None:
+    if not streaming_mode and st.session_state.get('comparison_result') is not None:
         result = st.session_state['comparison_result']
+        display_frames = st.session_state.setdefault('display_frames', {})
 
         st.markdown("---")
-        st.success("✅ Analysis completed!")
+        if st.session_state.get('comparison_from_cache'):
+            st.success("✅ Analysis completed! (shared result from the result cache)")
+        else:
+            st.success("✅ Analysis completed!")
 
         # 전체 결과를 탭으로 구성 (Summary 포함)
-        tab_summary, tab1, tab2, tab3, tab4 = st.tabs([
+        tab_summary, tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
             "📊 Summary",
             "🗑️ Deleted (A only)",
             "➕ Added (B only)",
             "🔤 Source Changes",
-            "🌐 Translation Changes"
+            "🌐 Translation Changes",
+            "🔁 Both Changed",
+            "🚚 Moved",
+            "👥 Duplicate Keys"
         ])
 
         # Summary 탭
@@ -607,18 +980,11 @@ def main():
                 # CSV 다운로드 기능
                 col1, col2 = st.columns([3, 1])
                 with col1:
-                    st.markdown("**📊 Sortable Grid View** (Click column headers to sort)")
+                    st.markdown("**📊 Paged Grid View** (Search and sort apply to all rows)")
                 with col2:
-                    csv_data = result['only_in_a'].to_csv(index=False)
-                    st.download_button(
-                        label="📥 Download CSV",
-                        data=csv_data,
-                        file_name="deleted_records.csv",
-                        mime="text/csv",
-                        use_container_width=True
-                    )
+                    _csv_download('only_in_a', result['only_in_a'], RESULT_FILE_NAMES['only_in_a'])
 
-                st.dataframe(result['only_in_a'], use_container_width=True, height=400)
+                _result_grid('only_in_a', result['only_in_a'])
                 st.info(f"📈 Total Deleted Records: {len(result['only_in_a'])}")
             else:
                 st.info("No deleted records found")
@@ -630,18 +996,11 @@ def main():
                 # CSV 다운로드 기능
                 col1, col2 = st.columns([3, 1])
                 with col1:
-                    st.markdown("**📊 Sortable Grid View** (Click column headers to sort)")
+                    st.markdown("**📊 Paged Grid View** (Search and sort apply to all rows)")
                 with col2:
-                    csv_data = result['only_in_b'].to_csv(index=False)
-                    st.download_button(
-                        label="📥 Download CSV",
-                        data=csv_data,
-                        file_name="added_records.csv",
-                        mime="text/csv",
-                        use_container_width=True
-                    )
+                    _csv_download('only_in_b', result['only_in_b'], RESULT_FILE_NAMES['only_in_b'])
 
-                st.dataframe(result['only_in_b'], use_container_width=True, height=400)
+                _result_grid('only_in_b', result['only_in_b'])
                 st.info(f"📈 Total Added Records: {len(result['only_in_b'])}")
             else:
                 st.info("No added records found")
@@ -650,48 +1009,24 @@ def main():
             if not result['col3_changes'].empty:
                 st.markdown("### 🔤 Source Changes")
 
-                # Create enhanced dataframe with remarks
-                display_df = result['col3_changes'].copy()
-
-                # Check for Before/After columns and create remarks
-                before_cols = [col for col in display_df.columns if '_Before (File_A)' in col]
-                after_cols = [col for col in display_df.columns if '_After (File_B)' in col]
-
-                if before_cols and after_cols:
-                    # Create remarks column
-                    remarks = []
-                    for idx, row in display_df.iterrows():
-                        change_details = []
-                        for before_col in before_cols:
-                            after_col = before_col.replace('_Before (File_A)', '_After (File_B)')
-                            if after_col in display_df.columns:
-                                field_name = before_col.replace('_Before (File_A)', '')
-                                before_val = str(row[before_col])[:50] + "..." if len(str(row[before_col])) > 50 else str(row[before_col])
-                                after_val = str(row[after_col])[:50] + "..." if len(str(row[after_col])) > 50 else str(row[after_col])
-                                change_details.append(f"📝 {field_name}: '{before_val}' → '{after_val}'")
-                        remarks.append(" | ".join(change_details))
-
-                    display_df['🔍 Change Summary'] = remarks
+                # Create enhanced dataframe with remarks (cached with the comparison)
+                if 'col3_changes' not in display_frames:
+                    display_frames['col3_changes'] = add_change_summary(
+                        result['col3_changes'], '🔍 Change Summary', '📝', 50
+                    )
+                display_df = display_frames['col3_changes']
 
                 # CSV 다운로드 기능 추가
                 col1, col2 = st.columns([3, 1])
                 with col1:
-                    st.markdown("**📊 Sortable Grid View** (Click column headers to sort)")
+                    st.markdown("**📊 Paged Grid View** (Search and sort apply to all rows)")
                 with col2:
-                    csv_data = display_df.to_csv(index=False)
-                    st.download_button(
-                        label="📥 Download CSV",
-                        data=csv_data,
-                        file_name="source_changes.csv",
-                        mime="text/csv",
-                        use_container_width=True
-                    )
+                    _csv_download('col3_changes', display_df, RESULT_FILE_NAMES['col3_changes'])
 
-                # Display enhanced dataframe
-                st.dataframe(
+                # Display enhanced dataframe (현재 페이지만 전송)
+                page_df = _result_grid(
+                    'col3_changes',
                     display_df,
-                    use_container_width=True,
-                    height=400,
                     column_config={
                         "🔍 Change Summary": st.column_config.TextColumn(
                             "Change Summary",
@@ -701,6 +1036,9 @@ def main():
                     }
                 )
 
+                # 현재 페이지 행의 inline diff (요청 시에만 계산)
+                _diff_view('col3_changes', page_df)
+
                 # Quick stats
                 st.info(f"📈 Total Source Changes: {len(display_df)} records")
 
@@ -711,48 +1049,24 @@ def main():
             if not result['col4_changes'].empty:
                 st.markdown("### 🌐 Translation Changes")
 
-                # Create enhanced dataframe with remarks
-                display_df = result['col4_changes'].copy()
-
-                # Check for Before/After columns and create remarks
-                before_cols = [col for col in display_df.columns if '_Before (File_A)' in col]
-                after_cols = [col for col in display_df.columns if '_After (File_B)' in col]
-
-                if before_cols and after_cols:
-                    # Create remarks column for translations
-                    remarks = []
-                    for idx, row in display_df.iterrows():
-                        change_details = []
-                        for before_col in before_cols:
-                            after_col = before_col.replace('_Before (File_A)', '_After (File_B)')
-                            if after_col in display_df.columns:
-                                field_name = before_col.replace('_Before (File_A)', '')
-                                before_val = str(row[before_col])[:40] + "..." if len(str(row[before_col])) > 40 else str(row[before_col])
-                                after_val = str(row[after_col])[:40] + "..." if len(str(row[after_col])) > 40 else str(row[after_col])
-                                change_details.append(f"🌐 {field_name}: '{before_val}' → '{after_val}'")
-                        remarks.append(" | ".join(change_details))
-
-                    display_df['🔍 Translation Summary'] = remarks
+                # Create enhanced dataframe with remarks (cached with the comparison)
+                if 'col4_changes' not in display_frames:
+                    display_frames['col4_changes'] = add_change_summary(
+                        result['col4_changes'], '🔍 Translation Summary', '🌐', 40
+                    )
+                display_df = display_frames['col4_changes']
 
                 # CSV 다운로드 기능 추가
                 col1, col2 = st.columns([3, 1])
                 with col1:
-                    st.markdown("**📊 Sortable Grid View** (Click column headers to sort)")
+                    st.markdown("**📊 Paged Grid View** (Search and sort apply to all rows)")
                 with col2:
-                    csv_data = display_df.to_csv(index=False)
-                    st.download_button(
-                        label="📥 Download CSV",
-                        data=csv_data,
-                        file_name="translation_changes.csv",
-                        mime="text/csv",
-                        use_container_width=True
-                    )
+                    _csv_download('col4_changes', display_df, RESULT_FILE_NAMES['col4_changes'])
 
-                # Display enhanced dataframe
-                st.dataframe(
+                # Display enhanced dataframe (현재 페이지만 전송)
+                page_df = _result_grid(
+                    'col4_changes',
                     display_df,
-                    use_container_width=True,
-                    height=400,
                     column_config={
                         "🔍 Translation Summary": st.column_config.TextColumn(
                             "Translation Summary",
@@ -762,74 +1076,178 @@ def main():
                     }
                 )
 
+                # 현재 페이지 행의 inline diff (요청 시에만 계산)
+                _diff_view('col4_changes', page_df)
+
                 # Quick stats
                 st.info(f"📈 Total Translation Changes: {len(display_df)} records")
 
             else:
                 st.info("No translation changes found")
 
+        with tab5:
+            if not result['both_changes'].empty:
+                st.markdown("### 🔁 Both Changed (Source & Translation)")
+
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.markdown("**📊 Paged Grid View** (Search and sort apply to all rows)")
+                with col2:
+                    _csv_download('both_changes', result['both_changes'], RESULT_FILE_NAMES['both_changes'])
+
+                page_df = _result_grid('both_changes', result['both_changes'])
+
+                # 현재 페이지 행의 inline diff (요청 시에만 계산)
+                _diff_view('both_changes', page_df)
+
+                st.info(f"📈 Total Records with Both Changed: {len(result['both_changes'])}")
+            else:
+                st.info("No records with both columns changed")
+
+        with tab6:
+            st.markdown("### 🚚 Moved Records (ID changed)")
+            st.caption("Deleted and added records with the same Name and the same or near-identical source, "
+                       "e.g. a Shopify resource that was recreated with a new ID.")
+
+            # 요청 시에만 계산 - Deleted/Added 행만 인덱스로 짝지음
+            if 'moved' not in result:
+                if result['only_in_a'].empty or result['only_in_b'].empty:
+                    st.info("Moved records need both deleted and added records")
+                elif st.button("🔎 Detect Moved Records"):
+                    with st.spinner('Pairing deleted and added records...'):
+                        result['moved'] = detect_moved_entries(result['only_in_a'], result['only_in_b'])
+                    st.session_state['excel_report'] = None
+                    st.session_state['results_zip'] = None
+
+            if result.get('moved') is not None and not result['moved'].empty:
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.markdown("**📊 Paged Grid View** (Search and sort apply to all rows)")
+                with col2:
+                    _csv_download('moved', result['moved'], RESULT_FILE_NAMES['moved'])
+
+                page_df = _result_grid('moved', result['moved'])
+
+                # 현재 페이지 행의 inline diff (요청 시에만 계산)
+                _diff_view('moved', page_df)
+
+                st.info(f"📈 Total Moved Records: {len(result['moved'])} "
+                        f"({(result['moved']['Match'] == 'exact').sum()} exact, "
+                        f"{(result['moved']['Match'] == 'near').sum()} near)")
+            elif result.get('moved') is not None:
+                st.info("No moved records found")
+
+        with tab7:
+            duplicates = result.get('duplicates')
+            if duplicates is not None and not duplicates.empty:
+                st.markdown("### 👥 Rows with Duplicate ID + Name Keys")
+                st.caption(f"Compared with policy: "
+                           f"{DUPLICATE_POLICY_LABELS[st.session_state.get('comparison_duplicate_policy', 'first')]}. "
+                           "Row is the data row number in each file; Occurrence counts rows with the same key.")
+
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.markdown("**📊 Paged Grid View** (Search and sort apply to all rows)")
+                with col2:
+                    _csv_download('duplicates', duplicates, RESULT_FILE_NAMES['duplicates'])
+
+                _result_grid('duplicates', duplicates)
+                st.info(f"📈 Rows with duplicate keys: {(duplicates['File'] == 'A').sum()} in File A, "
+                        f"{(duplicates['File'] == 'B').sum()} in File B")
+            else:
+                st.info("No duplicate ID + Name keys found")
+
+        # 다국어 export - 4번째 이후 모든 번역 컬럼 비교 (요청 시에만 계산)
+        if file_a and file_b and len(df_a_preview.columns) > 4:
+            st.markdown("---")
+            st.subheader("🌍 All Language Columns")
+            st.caption(f"{len(df_a_preview.columns) - 3} translation columns found in File A. "
+                       "Compares every translation column and records which key changed in which language.")
+
+            if st.session_state.get('language_result') is None:
+                if st.button("🌍 Compare All Language Columns"):
+                    with st.spinner('Comparing language columns...'):
+                        st.session_state['language_result'] = compare_translation_columns(
+                            df_a_preview, df_b_preview, key_a, key_b,
+                            st.session_state.get('comparison_duplicate_policy', 'first')
+                        )
+
+            language_result = st.session_state.get('language_result')
+            if language_result is not None:
+                col1, col2 = st.columns([1, 2])
+                with col1:
+                    st.dataframe(
+                        language_result['counts'].rename_axis('Language').reset_index(name='Changed cells'),
+                        use_container_width=True,
+                        height=300
+                    )
+                    st.info(f"📈 Keys changed in at least one language: {len(language_result['matrix'])}")
+                    _csv_download('language_matrix', language_result['matrix'], "language_change_matrix.csv")
+
+                with col2:
+                    language = st.selectbox("Show changes for", language_result['languages'], key="language_select")
+
+                # 선택한 언어의 변경 셀만 Before/After 값으로 만듦
+                cells_name = f'language_cells_{language}'
+                if cells_name not in display_frames:
+                    display_frames[cells_name] = translation_cell_changes(
+                        df_a_preview, df_b_preview, language_result, [language]
+                    )
+                _result_grid(cells_name, display_frames[cells_name])
+
         # Excel 다운로드 및 Merge 기능
         st.markdown("---")
         st.subheader("📥 Download & Merge Options")
 
-        # 메모리에서 Excel 파일 생성
-        try:
-            import io
-            excel_buffer = io.BytesIO()
-
-            # 결과 데이터를 사용하여 Excel 파일 생성
-            with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                # 요약 시트
-                total_modified = len(result['col3_changes']) + len(result['col4_changes']) + len(result['both_changes'])
-                summary_data = {
-                    'Category': [
-                        '1. Records only in A (deleted)',
-                        '2. Records only in B (added)',
-                        '3-1. Source/Column3 changed only',
-                        '3-2. Data/Column4 changed only',
-                        '3-3. Both columns changed',
-                        'Total modified records'
-                    ],
-                    'Count': [
-                        len(result['only_in_a']),
-                        len(result['only_in_b']),
-                        len(result['col3_changes']),
-                        len(result['col4_changes']),
-                        len(result['both_changes']),
-                        total_modified
-                    ]
-                }
-                summary_df = pd.DataFrame(summary_data)
-                summary_df.to_excel(writer, sheet_name='0_Summary', index=False)
-
-                # 각 분석 결과를 별도 시트에 저장
-                if not result['only_in_a'].empty:
-                    result['only_in_a'].to_excel(writer, sheet_name='1_Only_in_A_Deleted', index=False)
-                if not result['only_in_b'].empty:
-                    result['only_in_b'].to_excel(writer, sheet_name='2_Only_in_B_Added', index=False)
-                if not result['col3_changes'].empty:
-                    result['col3_changes'].to_excel(writer, sheet_name='3-1_Source_Changes', index=False)
-                if not result['col4_changes'].empty:
-                    result['col4_changes'].to_excel(writer, sheet_name='3-2_Data_Changes', index=False)
-                if not result['both_changes'].empty:
-                    result['both_changes'].to_excel(writer, sheet_name='3-3_Both_Changed', index=False)
-
-            excel_buffer.seek(0)
-
-            # 다운로드 버튼들
-            col1, col2 = st.columns([1, 3])
-            with col1:
+        # Excel 리포트는 요청 시에만 생성하고 비교 결과별로 캐시
+        col1, col2, col3 = st.columns([1, 1, 2])
+        with col1:
+            if st.session_state.get('excel_report') is None:
+                if st.button("📊 Prepare Excel Report", use_container_width=True):
+                    try:
+                        with st.spinner('Building Excel report...'):
+                            st.session_state['excel_report'] = _measure(
+                                'export', build_excel_report, result, profile=_take_profile_request()
+                            )
+                    except Exception as e:
+                        st.error(f"Excel generation error: {str(e)}")
+                        st.info("💡 You can still download individual CSV files from each tab above.")
+
+            if st.session_state.get('excel_report') is not None:
                 st.download_button(
                     label="📊 Download Excel Report",
-                    data=excel_buffer.getvalue(),
+                    data=st.session_state['excel_report'],
                     file_name="langify_comparison_report.xlsx",
                     mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                     use_container_width=True
                 )
 
-        except Exception as e:
-            st.error(f"Excel generation error: {str(e)}")
-            st.info("💡 You can still download individual CSV files from each tab above.")
+        # 모든 카테고리 CSV (+ 병합 파일)를 하나의 ZIP으로 - 요청 시에만 생성
+        with col2:
+            if st.session_state.get('results_zip') is None:
+                if st.button("🗜️ Prepare ZIP (all CSVs)", use_container_width=True,
+                             help="All result categories plus the merged file (if generated) as one compressed archive"):
+                    with st.spinner('Building ZIP archive...'):
+                        files = [(RESULT_FILE_NAMES[name], result[name]) for name in RESULT_CATEGORIES]
+                        for name in ('moved', 'duplicates'):
+                            if result.get(name) is not None:
+                                files.append((RESULT_FILE_NAMES[name], result[name]))
+                        if st.session_state.get('language_result') is not None:
+                            files.append(("language_change_matrix.csv", st.session_state['language_result']['matrix']))
+                        if st.session_state.get('merged_file') is not None:
+                            files.append(("langify_merged_import.csv", st.session_state['merged_file']))
+                        st.session_state['results_zip'] = _measure(
+                            'export', build_zip_archive, files, profile=_take_profile_request()
+                        )
+
+            if st.session_state.get('results_zip') is not None:
+                st.download_button(
+                    label="🗜️ Download ZIP",
+                    data=st.session_state['results_zip'],
+                    file_name="langify_comparison_results.zip",
+                    mime="application/zip",
+                    use_container_width=True
+                )
 
         # Merge 기능 추가
         st.markdown("---")
@@ -878,40 +1296,87 @@ def main():
                 value=True,
                 help="Update records where both source and translation changed"
             )
+            include_moved = False
+            include_near_moved = False
+            if result.get('moved') is not None and not result['moved'].empty:
+                near_count = int((result['moved']['Match'] == 'near').sum())
+                include_moved = st.checkbox(
+                    f"Carry translations to moved records - {len(result['moved']) - near_count} exact matches",
+                    value=True,
+                    help="Apply B's translation to the record's new ID in A and skip B's old ID "
+                         "(records whose source is identical)"
+                )
+                # 유사 일치는 오탐일 수 있으므로 따로 선택
+                if near_count:
+                    include_near_moved = st.checkbox(
+                        f"Also carry translations to near matches - {near_count} records",
+                        value=False,
+                        disabled=not include_moved,
+                        help="Records whose source is only similar; review them in the Moved tab first"
+                    )
 
         # Merge 실행 버튼
-        if st.button("🔀 Generate Merged File", type="primary", use_container_width=False):
+        if st.button("🔀 Generate Merged File", type="primary", use_container_width=False,
+                     disabled=_job_running('merge_job')):
             # Source 옵션 검증
             if source_from_a and source_from_b:
                 st.error("❌ Please select only ONE source option (either A or B, not both)")
             else:
-                try:
-                    # Source 변경 처리 방식 결정
-                    if source_from_b:
-                        include_source_changes = 'use_b'
-                    elif source_from_a:
-                        include_source_changes = 'use_a'
-                    else:
-                        include_source_changes = 'skip'  # Manual review 필요
-
-                    # Merge 로직 실행
-                    merged_df = create_merged_file(
-                        df_a_preview, df_b_preview, result,
-                        include_deleted, include_added,
-                        include_source_changes, include_translation_changes,
-                        include_both_changes
-                    )
-
-                    # 세션에 저장
+                # Source 변경 처리 방식 결정
+                if source_from_b:
+                    include_source_changes = 'use_b'
+                elif source_from_a:
+                    include_source_changes = 'use_a'
+                else:
+                    include_source_changes = 'skip'  # Manual review 필요
+
+                # Merge 로직을 백그라운드 작업으로 실행 (같은 입력으로 delta도 만들 수 있도록 보관)
+                merge_inputs = (
+                    df_a_preview, df_b_preview, result,
+                    include_deleted, include_added,
+                    include_source_changes, include_translation_changes,
+                    include_both_changes, key_a, key_b, include_moved,
+                    st.session_state.get('comparison_duplicate_policy', 'first')
+                )
+                merge_kwargs = {'include_near_moved': include_moved and include_near_moved}
+                st.session_state['merge_job'] = jobs.submit(
+                    _run_measured, 'merge', create_merged_file, *merge_inputs, **merge_kwargs,
+                    profile=_take_profile_request(), phases=MERGE_PHASES
+                )
+                st.session_state['merge_job_source'] = include_source_changes
+                st.session_state['merge_job_inputs'] = (merge_inputs, merge_kwargs)
+
+        # 병합 작업 상태 확인
+        merge_job = st.session_state.get('merge_job')
+        if merge_job is not None:
+            status = jobs.status(merge_job)
+            if status is None or status['state'] not in ('queued', 'running'):
+                output = jobs.pop(merge_job)
+                st.session_state['merge_job'] = None
+                if status is not None and status['state'] == 'done':
+                    merged_df, performance, profile = output
+                    _record_performance(performance, profile)
+
+                    # 세션에 저장 (이전 병합 결과로 만든 Excel은 폐기)
                     st.session_state['merged_file'] = merged_df
+                    st.session_state['merged_inputs'] = st.session_state['merge_job_inputs']
+                    st.session_state['merged_excel'] = None
+                    st.session_state['merged_delta'] = None
+                    st.session_state['results_zip'] = None
+                    st.session_state.setdefault('csv_downloads', {}).pop('merged', None)
                     st.success(f"✅ Merged file created successfully! Total records: {len(merged_df)}")
 
                     # Source 처리 상태 알림
-                    if include_source_changes == 'skip' and len(result['col3_changes']) > 0:
+                    if st.session_state['merge_job_source'] == 'skip' and len(result['col3_changes']) > 0:
                         st.warning(f"⚠️ {len(result['col3_changes'])} source changes were skipped (manual review required)")
-
-                except Exception as e:
-                    st.error(f"❌ Merge error: {str(e)}")
+                elif status is not None and status['state'] == 'failed':
+                    st.error(f"❌ Merge error: {status['error']}")
+                elif status is None:
+                    st.warning("⚠️ The merge result expired before it was shown. Please merge again.")
+                else:
+                    st.warning("⏹️ Merge cancelled")
+            else:
+                _job_progress('merge_job', "Merging")
 
         # Merged 파일 다운로드
         if 'merged_file' in st.session_state and st.session_state['merged_file'] is not None:
@@ -921,35 +1386,57 @@ def main():
 
             col1, col2, col3 = st.columns([1, 1, 2])
             with col1:
-                # CSV 다운로드
-                merged_csv = merged_df.to_csv(index=False)
-                st.download_button(
-                    label="📄 Download CSV",
-                    data=merged_csv,
-                    file_name="langify_merged_import.csv",
-                    mime="text/csv",
-                    use_container_width=True
-                )
+                # CSV 다운로드 - 요청 시에만 생성
+                _csv_download('merged', merged_df, "langify_merged_import.csv")
 
             with col2:
-                # Excel 다운로드
-                merged_excel_buffer = io.BytesIO()
-                merged_df.to_excel(merged_excel_buffer, index=False, engine='openpyxl')
-                merged_excel_buffer.seek(0)
+                # Excel 다운로드 - 요청 시에만 생성
+                if st.session_state.get('merged_excel') is None:
+                    if st.button("📊 Prepare Excel", use_container_width=True):
+                        with st.spinner('Building Excel file...'):
+                            st.session_state['merged_excel'] = _measure(
+                                'export', build_excel_workbook, [('Sheet1', merged_df)],
+                                profile=_take_profile_request()
+                            )
+
+                if st.session_state.get('merged_excel') is not None:
+                    st.download_button(
+                        label="📊 Download Excel",
+                        data=st.session_state['merged_excel'],
+                        file_name="langify_merged_import.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        use_container_width=True
+                    )
 
-                st.download_button(
-                    label="📊 Download Excel",
-                    data=merged_excel_buffer.getvalue(),
-                    file_name="langify_merged_import.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    use_container_width=True
-                )
+            with col3:
+                # Delta 다운로드 - 병합과 같은 옵션으로 변경분만 (apply_delta / --apply-delta로 A에 적용)
+                if st.session_state.get('merged_delta') is None:
+                    if st.button("🧩 Prepare Delta", use_container_width=True,
+                                 help="Only the inserts, deletes and updates selected above, "
+                                      "to apply to the live export later with --apply-delta"):
+                        with st.spinner('Building delta...'):
+                            merge_inputs, merge_kwargs = st.session_state['merged_inputs']
+                            delta = _measure('merge', create_delta, *merge_inputs, **merge_kwargs)
+                            st.session_state['merged_delta'] = (len(delta), _measure('export', build_delta_csv, delta))
+
+                if st.session_state.get('merged_delta') is not None:
+                    changes, data = st.session_state['merged_delta']
+                    st.download_button(
+                        label=f"🧩 Download Delta ({changes} changes)",
+                        data=data,
+                        file_name="langify_merge_delta.csv.gz",
+                        mime="application/gzip",
+                        use_container_width=True
+                    )
 
             # 미리보기
             with st.expander("👁️ Preview Merged File"):
                 st.dataframe(merged_df.head(20), use_container_width=True)
                 st.info(f"📊 Total records in merged file: {len(merged_df)}")
 
+    # 단계별 성능 기록 (이번 실행에서 끝난 작업까지 포함)
+    _performance_panel()
+
     # 사용법 안내
     with st.expander("📖 How to Use - Langify Export Comparison"):
         st.markdown("""
@@ -957,7 +1444,7 @@ def main():
         - Export CSV files from Shopify Langify app
         - Files must have at least 4 columns (ID, Name, Source, Translation)
         - First row should contain headers
-        - Supports UTF-8 and CP949 encoding
+        - Supports UTF-8 (with or without BOM), CP949 and UTF-16 encoding (detected automatically)
 
         ### Langify Column Structure
         - **Column 1**: ID (unique identifier for each translation entry)
@@ -0,0 +1,223 @@
+"""
+비교/병합/내보내기 성능 벤치마크입니다.
+
+langify_synth로 생성한 export 쌍에 대해 각 단계의 실행 시간과 메모리 사용량을 측정하고
+결과를 JSON으로 저장합니다. --baseline으로 이전 결과와 비교할 수 있습니다.
+
+메모리는 두 가지로 기록합니다. peak_rss_delta_mb는 실행 중 프로세스 RSS의 최대값에서 실행 직전 RSS를 뺀 값으로,
+Arrow 문자열 버퍼를 포함하므로 회귀 비교에는 이 값을 사용합니다. peak_mb는 tracemalloc으로 추적되는
+Python/NumPy 할당의 최대값이며 Arrow 버퍼처럼 tracemalloc 밖에서 할당되는 메모리는 포함되지 않습니다.
+
+사용 예:
+    python langify_bench.py --rows 10000 100000 1000000 -o bench.json
+    python langify_bench.py --rows 100000 --baseline bench.json
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from langify_core import (
+    RESULT_CATEGORIES,
+    PerformanceRecorder,
+    build_csv,
+    build_excel_report,
+    build_zip_archive,
+    compare_dataframes,
+    create_merged_file,
+    load_export,
+    process_rss_bytes,
+    read_export
+)
+from langify_synth import generate_export_pair
+
+# Excel 시트 한 장의 최대 행 수보다 큰 입력은 Excel 벤치마크에서 제외
+EXCEL_MAX_ROWS = 1000000
+
+def measure(func, repeat=1, trace_memory=True):
+    """
+    함수를 repeat번 실행하여 최소 실행 시간과 최대 메모리 사용량을 측정합니다.
+
+    시간을 재는 실행마다 PerformanceRecorder로 프로세스 RSS를 샘플링하여 실행 직전 대비 최대 증가량을 구합니다
+    (샘플링 오버헤드는 무시할 수 있는 수준). 해제된 메모리를 할당기가 재사용하면 두 번째 실행부터는
+    증가량이 작게 나올 수 있으므로 실행 중 가장 큰 값을 사용합니다.
+    tracemalloc 측정은 오버헤드가 시간에 섞이지 않도록 따로 실행합니다.
+
+    Returns:
+        (반환값, 최소 실행 시간(초), tracemalloc peak 메모리(MB) 또는 None, peak RSS 증가량(MB) 또는 None)
+    """
+    times = []
+    rss_deltas = []
+    for _ in range(repeat):
+        gc.collect()
+        baseline = process_rss_bytes()
+        with PerformanceRecorder('benchmark') as recorder:
+            recorder('run')
+            start = time.perf_counter()
+            value = func()
+            times.append(time.perf_counter() - start)
+        peak_rss_mb = recorder.finish()['phases'][0]['peak_rss_mb']
+        if baseline is not None and peak_rss_mb is not None:
+            rss_deltas.append(max(peak_rss_mb - baseline / 1024 / 1024, 0.0))
+
+    peak_mb = None
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        finally:
+            tracemalloc.stop()
+    return value, min(times), peak_mb, max(rss_deltas) if rss_deltas else None
+
+def _git_revision():
+    """
+    현재 git 커밋 해시를 반환합니다 (git이 없으면 None).
+    """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(row_counts, repeat=1, trace_memory=True, excel_max_rows=EXCEL_MAX_ROWS,
+                   seed=0, log=print):
+    """
+    행 수별로 export 쌍을 생성하여 각 단계를 측정합니다.
+
+    Returns:
+        list: 벤치마크별 결과 dict
+    """
+    results = []
+
+    def record(benchmark, rows, func, output_rows=None):
+        value, seconds, peak_mb, rss_delta_mb = measure(func, repeat, trace_memory)
+        entry = {
+            'benchmark': benchmark,
+            'rows': rows,
+            'seconds': round(seconds, 4),
+            'peak_mb': None if peak_mb is None else round(peak_mb, 1),
+            'peak_rss_delta_mb': None if rss_delta_mb is None else round(rss_delta_mb, 1),
+            'output_rows': output_rows(value) if output_rows else None
+        }
+        results.append(entry)
+        log(f"{benchmark:<16} rows={rows:<9} {entry['seconds']:>9.3f}s "
+            f"rss=+{entry['peak_rss_delta_mb'] if entry['peak_rss_delta_mb'] is not None else '-'} MB "
+            f"traced={entry['peak_mb'] if entry['peak_mb'] is not None else '-'} MB")
+        return value
+
+    for rows in row_counts:
+        df_a, df_b = generate_export_pair(rows, seed=seed)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path_a = os.path.join(tmp, 'A.csv')
+            path_b = os.path.join(tmp, 'B.csv')
+            df_a.to_csv(path_a, index=False)
+            df_b.to_csv(path_b, index=False)
+
+            # 1. CSV 파싱만 (인코딩 감지 + 멀티스레드 파싱) - 처리량 MB/s 함께 기록
+            record('read_export', rows, lambda: read_export(path_a), lambda value: len(value[0]))
+            size_mb = os.path.getsize(path_a) / 1024 / 1024
+            results[-1]['mb_per_s'] = round(size_mb / results[-1]['seconds'], 1)
+            log(f"{'':<16} {size_mb:.1f} MB -> {results[-1]['mb_per_s']} MB/s")
+
+            # CSV 파싱 + 키/fingerprint 생성
+            df_a, key_a, fingerprints_a, _, _ = record('load_export', rows, lambda: load_export(path_a),
+                                                       lambda value: len(value[0]))
+            df_b, key_b, fingerprints_b, _, _ = load_export(path_b)
+
+        # 2. 비교
+        result = record('compare', rows, lambda: compare_dataframes(
+            df_a, df_b, key_a, key_b, fingerprints_a, fingerprints_b
+        ), lambda value: sum(len(value[name]) for name in RESULT_CATEGORIES))
+
+        # 3. 병합 (UI 기본 옵션 + B의 Source 사용)
+        merged_df = record('merge', rows, lambda: create_merged_file(
+            df_a, df_b, result, True, True, 'use_b', True, True, key_a, key_b
+        ), len)
+
+        # 4. Excel 리포트
+        if rows <= excel_max_rows:
+            record('excel_report', rows, lambda: build_excel_report(result), len)
+        else:
+            log(f"{'excel_report':<16} rows={rows:<9} skipped (> {excel_max_rows} rows)")
+
+        # 5. 다운로드 파일 생성 (앱/서버와 같은 함수) - 병합 CSV, 카테고리별 CSV + 병합 파일 ZIP
+        record('csv_merged', rows, lambda: build_csv(merged_df), len)
+        files = [(f'{name}.csv', result[name]) for name in RESULT_CATEGORIES]
+        files += [('duplicate_keys.csv', result['duplicates']), ('langify_merged_import.csv', merged_df)]
+        record('zip_archive', rows, lambda: build_zip_archive(files), len)
+
+    return results
+
+def compare_with_baseline(results, baseline, log=print):
+    """
+    이전 벤치마크 결과와 실행 시간, peak RSS 증가량을 비교하여 출력합니다.
+    """
+    previous = {(entry['benchmark'], entry['rows']): entry for entry in baseline['results']}
+    log(f"\nCompared with baseline {baseline.get('git_revision') or '(unknown revision)'}:")
+    for entry in results:
+        old = previous.get((entry['benchmark'], entry['rows']))
+        if old is None or not old['seconds']:
+            continue
+        ratio = entry['seconds'] / old['seconds']
+        memory = ''
+        if old.get('peak_rss_delta_mb') is not None and entry['peak_rss_delta_mb'] is not None:
+            memory = f"  rss +{old['peak_rss_delta_mb']} -> +{entry['peak_rss_delta_mb']} MB"
+        log(f"{entry['benchmark']:<16} rows={entry['rows']:<9} "
+            f"{old['seconds']:>9.3f}s -> {entry['seconds']:>9.3f}s  (x{ratio:.2f}){memory}")
+
+def build_parser():
+    """
+    명령줄 인자 파서를 생성합니다.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark Langify compare/merge/export.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000],
+                        help="Row counts to benchmark (default: 10000 100000)")
+    parser.add_argument('--repeat', type=int, default=1, help="Timed runs per benchmark (minimum is kept)")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc memory run")
+    parser.add_argument('--excel-max-rows', type=int, default=EXCEL_MAX_ROWS,
+                        help=f"Skip the Excel benchmark above this many rows (default: {EXCEL_MAX_ROWS})")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default='bench_results.json', help="JSON result file")
+    parser.add_argument('--baseline', help="Previous JSON result file to compare against")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    results = run_benchmarks(args.rows, args.repeat, not args.no_memory, args.excel_max_rows, args.seed)
+    report = {
+        'git_revision': _git_revision(),
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults -> {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            compare_with_baseline(results, json.load(f))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
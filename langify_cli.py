@@ -0,0 +1,376 @@
+"""
+Langify export 비교/병합 명령줄 도구입니다.
+
+Streamlit 없이 두 export 파일을 비교하여 카테고리별 CSV, Excel 리포트,
+병합된 import 파일을 생성합니다. cron 작업이나 파이프라인에서 사용할 수 있습니다.
+
+사용 예:
+    python langify_cli.py live.csv modified.csv -o results --excel --merged --source-changes use_b
+    python langify_cli.py tonight.csv --snapshot-dir snapshots -o results
+    python langify_cli.py live.csv modified.csv -o results --delta changes.csv.gz --source-changes use_b
+    python langify_cli.py live.csv --apply-delta changes.csv.gz -o results
+    python langify_cli.py live.csv modified.csv -o results --perf-json perf.json --profile compare.prof
+"""
+import argparse
+import json
+import os
+import sys
+
+from langify_core import (
+    DUPLICATE_POLICIES,
+    RESULT_CATEGORIES,
+    STREAMING_MEMORY_LIMIT_MB,
+    PerformanceRecorder,
+    apply_delta,
+    build_excel_report,
+    compare_csv_streaming,
+    compare_dataframes,
+    compare_dataframes_parallel,
+    compare_translation_columns,
+    compare_with_snapshot,
+    create_delta,
+    create_merged_file,
+    detect_moved_entries,
+    latest_snapshot,
+    load_export,
+    profile_call,
+    save_snapshot,
+    translation_cell_changes
+)
+
+def build_parser():
+    """
+    명령줄 인자 파서를 생성합니다.
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare two Langify export files and write the results."
+    )
+    parser.add_argument('exports', nargs='+', metavar='FILE',
+                        help="Current live export (A) and modified export (B), "
+                             "or only the new export with --snapshot-dir")
+    parser.add_argument('-o', '--output-dir', default='.',
+                        help="Directory for the result files (default: current directory)")
+
+    # 출력 옵션
+    parser.add_argument('--excel', action='store_true',
+                        help="Also write the Excel report (langify_comparison_report.xlsx)")
+    parser.add_argument('--merged', action='store_true',
+                        help="Also write the merged import file (langify_merged_import.csv)")
+    parser.add_argument('--all-languages', action='store_true',
+                        help="Also compare every translation column after column 3 "
+                             "(language_change_matrix.csv, language_changes.csv)")
+    parser.add_argument('--detect-moved', action='store_true',
+                        help="Pair deleted and added records with the same or near-identical source "
+                             "as moved (ID changed) records (moved_records.csv); with --merged or --delta, "
+                             "translations of exact matches are carried over to the new ID")
+    parser.add_argument('--merge-near-moved', action='store_true',
+                        help="With --detect-moved, also carry over translations of near (not identical) matches")
+
+    # Merge 옵션 (create_merged_file 인자와 동일)
+    parser.add_argument('--include-deleted', action=argparse.BooleanOptionalAction, default=True,
+                        help="Keep items only in live (A) in the merged file")
+    parser.add_argument('--include-added', action=argparse.BooleanOptionalAction, default=True,
+                        help="Add new items from modified (B) to the merged file")
+    parser.add_argument('--source-changes', choices=['use_a', 'use_b', 'skip'], default='skip',
+                        help="Which source text to use for source changes (default: skip)")
+    parser.add_argument('--include-translation-changes', action=argparse.BooleanOptionalAction,
+                        default=True, help="Apply translation changes from B")
+    parser.add_argument('--include-both-changes', action=argparse.BooleanOptionalAction,
+                        default=True, help="Apply changes where both source and translation changed")
+
+    # 중복 키 옵션
+    parser.add_argument('--duplicate-policy', choices=DUPLICATE_POLICIES, default='first',
+                        help="How to compare ID + Name keys that occur more than once: use the first or last "
+                             "row, stop with an error, or pair rows by position (default: first)")
+
+    # 대용량 파일 옵션
+    parser.add_argument('--streaming', action='store_true',
+                        help="Compare in chunks on disk (category CSVs only)")
+    parser.add_argument('--memory-limit-mb', type=int, default=STREAMING_MEMORY_LIMIT_MB,
+                        help=f"Memory limit for --streaming (default: {STREAMING_MEMORY_LIMIT_MB})")
+    parser.add_argument('--compact', action='store_true',
+                        help="Load exports as Arrow strings with a dictionary-encoded Name column (less memory)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Compare in parallel with this many processes (default: 1)")
+
+    # 스냅샷 옵션
+    parser.add_argument('--snapshot-dir',
+                        help="Compare the new export against the latest snapshot in this directory, "
+                             "then store it as the next snapshot")
+
+    # Delta 옵션 - 병합 파일 대신 변경분만 기록하고, 나중에 live export에 스트리밍으로 적용
+    parser.add_argument('--delta', metavar='PATH',
+                        help="Also write a compact delta with only the inserts, deletes and updates selected "
+                             "by the merge options (gzip if PATH ends with .gz)")
+    parser.add_argument('--apply-delta', metavar='DELTA',
+                        help="Apply a delta to one live export in chunks and write langify_merged_import.csv")
+
+    # 성능 측정 옵션
+    parser.add_argument('--perf-json', metavar='PATH',
+                        help="Write the wall time, rows and peak memory (RSS) of each parse, compare, "
+                             "merge and export phase as JSON")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="Run under cProfile and write the profile to PATH "
+                             "(open with pstats or snakeviz)")
+    return parser
+
+def print_ingest(label, ingest):
+    """
+    파일 파싱 정보(인코딩, 크기, 처리량)를 출력합니다.
+    """
+    throughput = f"{ingest['mb_per_s']:.1f} MB/s" if ingest['mb_per_s'] else "-"
+    print(f"Parsed {label}: {ingest['bytes'] / 1024 / 1024:.1f} MB in {ingest['seconds']:.2f}s "
+          f"({throughput}, {ingest['encoding']}, {ingest['engine']} reader)")
+
+def write_results(result, args, progress=None):
+    """
+    카테고리별 CSV와 (요청 시) 이동 항목, Excel 리포트를 출력 폴더에 기록합니다.
+
+    progress가 주어지면 파일마다 progress(phase, rows)로 알립니다 (PerformanceRecorder).
+    """
+    def report(phase, rows=None):
+        if progress is not None:
+            progress(phase, rows)
+
+    for name in RESULT_CATEGORIES:
+        path = os.path.join(args.output_dir, f'{name}.csv')
+        report(f'{name}.csv', len(result[name]))
+        result[name].to_csv(path, index=False)
+        print(f"{name}: {len(result[name])} records -> {path}")
+
+    # 이동(ID 변경) 항목 - Deleted/Added 행 중 Source가 같거나 거의 같은 쌍
+    if args.detect_moved:
+        report('detect moved', len(result['only_in_a']) + len(result['only_in_b']))
+        result['moved'] = detect_moved_entries(result['only_in_a'], result['only_in_b'])
+        path = os.path.join(args.output_dir, 'moved_records.csv')
+        report('moved_records.csv', len(result['moved']))
+        result['moved'].to_csv(path, index=False)
+        print(f"moved: {len(result['moved'])} records -> {path}")
+
+    # 중복 키 행 (비교 결과에 있는 경우)
+    if 'duplicates' in result:
+        path = os.path.join(args.output_dir, 'duplicate_keys.csv')
+        report('duplicate_keys.csv', len(result['duplicates']))
+        result['duplicates'].to_csv(path, index=False)
+        print(f"duplicates: {len(result['duplicates'])} rows with duplicate keys -> {path}")
+
+    # Excel 리포트 (openpyxl은 이 경우에만 로딩됨)
+    if args.excel:
+        path = os.path.join(args.output_dir, 'langify_comparison_report.xlsx')
+        with open(path, 'wb') as f:
+            f.write(build_excel_report(result, progress))
+        print(f"Excel report -> {path}")
+
+def run_snapshot(args, performance):
+    """
+    새 export를 최근 스냅샷과 비교하여 결과를 기록하고, 새 export를 스냅샷으로 저장합니다.
+    """
+    with PerformanceRecorder('parse') as recorder:
+        df_b, key_b, fingerprints_b, ingest_b, _ = load_export(args.exports[0], compact=args.compact,
+                                                               progress=recorder)
+    performance.append(recorder.finish())
+    print_ingest(args.exports[0], ingest_b)
+
+    previous = latest_snapshot(args.snapshot_dir)
+    if previous is None:
+        print("No previous snapshot found; storing the first one.")
+    else:
+        print(f"Comparing against snapshot {previous}")
+        try:
+            with PerformanceRecorder('compare') as recorder:
+                recorder('snapshot compare', len(df_b))
+                result = compare_with_snapshot(previous, df_b, key_b, fingerprints_b, args.duplicate_policy)
+        except ValueError as e:
+            # --duplicate-policy error에서 중복 키가 있는 경우 등 (스냅샷은 저장하지 않음)
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        finally:
+            performance.append(recorder.finish())
+        with PerformanceRecorder('export') as recorder:
+            write_results(result, args, recorder)
+        performance.append(recorder.finish())
+
+    with PerformanceRecorder('export') as recorder:
+        recorder('snapshot', len(df_b))
+        path = save_snapshot(df_b, args.snapshot_dir, fingerprints=fingerprints_b)
+    performance.append(recorder.finish())
+    print(f"Snapshot saved -> {path}")
+    return 0
+
+def run_apply_delta(args, performance):
+    """
+    Live export에 delta를 청크 단위로 적용하여 병합된 import 파일을 기록합니다.
+    """
+    path = os.path.join(args.output_dir, 'langify_merged_import.csv')
+    with PerformanceRecorder('merge') as recorder:
+        try:
+            stats = apply_delta(args.exports[0], args.apply_delta, path, progress=recorder)
+        except (KeyError, ValueError) as e:
+            # delta 컬럼이 없거나 작업 종류가 잘못된 경우 등
+            print(f"Error: invalid delta {args.apply_delta}: {e}", file=sys.stderr)
+            return 1
+    performance.append(recorder.finish())
+    print(f"Merged file: {stats['rows']} records -> {path} "
+          f"({stats['deleted']} deleted, {stats['updated']} updated, {stats['inserted']} inserted)")
+    if stats['skipped']:
+        print(f"Warning: {stats['skipped']} delta rows did not match the live export and were skipped",
+              file=sys.stderr)
+    return 0
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.snapshot_dir:
+        if len(args.exports) != 1:
+            parser.error("--snapshot-dir takes exactly one export file")
+        if (args.merged or args.all_languages or args.streaming or args.workers > 1
+                or args.delta or args.apply_delta):
+            parser.error("--merged, --all-languages, --streaming, --workers, --delta "
+                         "and --apply-delta are not available with --snapshot-dir")
+    elif args.apply_delta:
+        if len(args.exports) != 1:
+            parser.error("--apply-delta takes exactly one export file")
+        if (args.excel or args.merged or args.all_languages or args.detect_moved or args.streaming
+                or args.delta or args.workers > 1):
+            parser.error("--excel, --merged, --all-languages, --detect-moved, --streaming, --delta and --workers "
+                         "are not available with --apply-delta")
+    elif len(args.exports) != 2:
+        parser.error("two export files are required (A and B)")
+
+    if args.merge_near_moved and not args.detect_moved:
+        parser.error("--merge-near-moved requires --detect-moved")
+
+    if args.streaming and (args.excel or args.merged or args.all_languages or args.compact or args.detect_moved
+                           or args.delta):
+        parser.error("--excel, --merged, --all-languages, --compact, --detect-moved and --delta are not available "
+                     "with --streaming")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    # 단계별 성능 기록 - --profile이면 전체 실행을 cProfile로 측정
+    performance = []
+    if args.profile:
+        code, profile = profile_call(run, args, performance)
+        with open(args.profile, 'wb') as f:
+            f.write(profile['stats'])
+        print(f"Profile -> {args.profile}")
+    else:
+        code = run(args, performance)
+
+    if args.perf_json:
+        with open(args.perf_json, 'w', encoding='utf-8') as f:
+            json.dump({'runs': performance}, f, indent=2)
+        print(f"Performance -> {args.perf_json}")
+    return code
+
+def run(args, performance):
+    """
+    검증된 인자로 비교/병합을 실행하고, 작업별 성능 기록(PerformanceRecorder.finish)을 performance에 추가합니다.
+    """
+    # 스냅샷 비교 - 이전 스냅샷의 fingerprint와 증분 비교 후 새 스냅샷 저장
+    if args.snapshot_dir:
+        return run_snapshot(args, performance)
+    if args.apply_delta:
+        return run_apply_delta(args, performance)
+
+    file_a, file_b = args.exports
+
+    # 스트리밍 비교 - 결과는 파티션 단위로 디스크에 기록됨
+    if args.streaming:
+        with PerformanceRecorder('compare') as recorder:
+            recorder('streaming compare')
+            result = compare_csv_streaming(file_a, file_b, args.output_dir,
+                                           memory_limit_mb=args.memory_limit_mb,
+                                           duplicate_policy=args.duplicate_policy)
+        performance.append(recorder.finish())
+        for name in RESULT_CATEGORIES + ['duplicates']:
+            print(f"{name}: {result[name]['count']} records -> {result[name]['path']}")
+        return 0
+
+    # 병합 파일이나 전체 언어 비교가 필요 없으면 비교에 필요한 4개 컬럼만 읽음
+    project = not (args.merged or args.all_languages or args.delta)
+    loaded = []
+    for label, path in (('parse A', file_a), ('parse B', file_b)):
+        with PerformanceRecorder(label) as recorder:
+            loaded.append(load_export(path, compact=args.compact, project=project, progress=recorder))
+        performance.append(recorder.finish())
+    df_a, key_a, fingerprints_a, ingest_a, _ = loaded[0]
+    df_b, key_b, fingerprints_b, ingest_b, _ = loaded[1]
+    print_ingest(file_a, ingest_a)
+    print_ingest(file_b, ingest_b)
+    try:
+        with PerformanceRecorder('compare') as recorder:
+            if args.workers > 1:
+                result = compare_dataframes_parallel(df_a, df_b, workers=args.workers,
+                                                     duplicate_policy=args.duplicate_policy,
+                                                     progress=recorder)
+            else:
+                result = compare_dataframes(df_a, df_b, key_a, key_b, fingerprints_a, fingerprints_b,
+                                            args.duplicate_policy, recorder)
+    except ValueError as e:
+        # --duplicate-policy error에서 중복 키가 있는 경우 등
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        performance.append(recorder.finish())
+
+    with PerformanceRecorder('export') as recorder:
+        write_results(result, args, recorder)
+
+        # 모든 번역 컬럼의 변경 행렬 + 변경 셀 목록
+        if args.all_languages:
+            recorder('language compare', len(df_a) + len(df_b))
+            language_result = compare_translation_columns(df_a, df_b, key_a, key_b,
+                                                          args.duplicate_policy)
+            path = os.path.join(args.output_dir, 'language_change_matrix.csv')
+            recorder('language_change_matrix.csv', len(language_result['matrix']))
+            language_result['matrix'].to_csv(path, index=False)
+            print(f"language_change_matrix: {len(language_result['matrix'])} keys x "
+                  f"{len(language_result['languages'])} languages -> {path}")
+            path = os.path.join(args.output_dir, 'language_changes.csv')
+            cells = translation_cell_changes(df_a, df_b, language_result)
+            recorder('language_changes.csv', len(cells))
+            cells.to_csv(path, index=False)
+            print(f"language_changes: {len(cells)} changed cells -> {path}")
+    performance.append(recorder.finish())
+
+    merge_options = (args.include_deleted, args.include_added, args.source_changes,
+                     args.include_translation_changes, args.include_both_changes)
+
+    # 병합 옵션으로 선택된 변경만 담은 delta
+    if args.delta:
+        with PerformanceRecorder('merge') as recorder:
+            delta = create_delta(df_a, df_b, result, *merge_options, key_a, key_b,
+                                 include_moved=args.detect_moved, duplicate_policy=args.duplicate_policy,
+                                 progress=recorder, include_near_moved=args.merge_near_moved)
+        performance.append(recorder.finish())
+        with PerformanceRecorder('export') as recorder:
+            recorder(os.path.basename(args.delta), len(delta))
+            delta.to_csv(args.delta, index=False)
+        performance.append(recorder.finish())
+        print(f"Delta: {len(delta)} changes -> {args.delta}")
+
+    # 병합된 import 파일
+    if args.merged:
+        with PerformanceRecorder('merge') as recorder:
+            merged_df = create_merged_file(
+                df_a, df_b, result, *merge_options, key_a, key_b, include_moved=args.detect_moved,
+                duplicate_policy=args.duplicate_policy, progress=recorder, include_near_moved=args.merge_near_moved
+            )
+        performance.append(recorder.finish())
+        path = os.path.join(args.output_dir, 'langify_merged_import.csv')
+        with PerformanceRecorder('export') as recorder:
+            recorder('langify_merged_import.csv', len(merged_df))
+            merged_df.to_csv(path, index=False)
+        performance.append(recorder.finish())
+        print(f"Merged file: {len(merged_df)} records -> {path}")
+
+        if args.source_changes == 'skip' and len(result['col3_changes']) > 0:
+            print(f"Warning: {len(result['col3_changes'])} source changes were skipped "
+                  f"(manual review required)", file=sys.stderr)
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,2508 @@
+"""
+Langify export 비교/병합 핵심 로직입니다.
+
+Streamlit UI(app.py)와 명령줄 도구(langify_cli.py)에서 함께 사용하며, streamlit을 import하지 않습니다.
+"""
+import codecs
+import contextlib
+import cProfile
+import datetime
+import difflib
+import glob
+import gzip
+import hashlib
+import html
+import io
+import marshal
+import math
+import multiprocessing
+import os
+import pstats
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# 비교 결과 카테고리 (compare_dataframes 반환 dict의 키)
+RESULT_CATEGORIES = ['only_in_a', 'only_in_b', 'col3_changes', 'col4_changes', 'both_changes']
+
+# 비교/병합/파일 로딩의 진행 단계 (progress 콜백에 전달되는 이름)
+COMPARE_PHASES = ['key build', 'join', 'classify']
+MERGE_PHASES = ['key build', 'join', 'merge']
+LOAD_PHASES = ['read', 'key build', 'fingerprint']
+
+# 단계별 최대 메모리(RSS)를 읽는 간격 (초)
+PERF_MEMORY_SAMPLE_SECONDS = 0.01
+
+# 프로파일 요약에 표시하는 함수 수 (누적 시간 순)
+PROFILE_SUMMARY_LINES = 40
+
+# 중복 키(ID + Name) 처리 방식
+# first/last: 키마다 첫/마지막 행만 비교, error: 중복이 있으면 오류, position: 같은 순번의 행끼리 비교
+DUPLICATE_POLICIES = ['first', 'last', 'error', 'position']
+
+# position 방식에서 결과에 추가하는 키 순번 컬럼 (1부터 시작)
+KEY_OCCURRENCE_COLUMN = 'Key Occurrence'
+
+# 스트리밍 비교 모드의 기본 메모리 한도 (MB)
+STREAMING_MEMORY_LIMIT_MB = 512
+
+# CSV 크기 대비 DataFrame + 비교 작업에 필요한 메모리 배수 (추정치)
+STREAMING_MEMORY_FACTOR = 6
+
+# Excel 기록 시 한 번에 변환하는 행 수
+EXCEL_CHUNK_ROWS = 10000
+
+# CSV/ZIP 기록 시 한 번에 직렬화하는 행 수
+CSV_CHUNK_ROWS = 50000
+
+# ZIP 압축 수준 (1 = 가장 빠름, 9 = 가장 작음)
+ZIP_COMPRESS_LEVEL = 1
+
+# 병렬 비교에서 워커 하나당 나눌 파티션 수
+PARALLEL_PARTITIONS_PER_WORKER = 4
+
+# 스냅샷 Parquet 파일의 row group 크기 (변경된 행이 있는 row group만 읽음)
+SNAPSHOT_ROW_GROUP_SIZE = 65536
+
+# 스냅샷에 함께 저장하는 Source/Translation fingerprint 컬럼
+SNAPSHOT_FINGERPRINT_COLUMNS = ['__langify_fp_col3', '__langify_fp_col4']
+
+# delta 파일의 작업 컬럼과 키 순번 컬럼 (나머지 컬럼은 A와 동일)
+DELTA_OP_COLUMN = '__langify_op'
+DELTA_OCCURRENCE_COLUMN = '__langify_occurrence'
+
+# delta 작업 종류 - update_*는 A 행의 Source/Translation만 바꾸고, insert는 B의 전체 행을 끝에 추가
+DELTA_OPS = ['delete', 'update_source', 'update_translation', 'update_both', 'insert']
+
+# 메모리 절약 모드에서 사용하는 Arrow 기반 문자열 dtype
+COMPACT_STRING_DTYPE = 'string[pyarrow]'
+
+# fingerprint 계산 시 한 번에 Python 문자열로 변환하는 행 수
+FINGERPRINT_CHUNK_ROWS = 65536
+
+# 글자 단위 diff의 최대 토큰 수 (넘으면 단어 단위로 비교)
+DIFF_MAX_TOKENS = 20000
+
+# 단어 단위 diff 토큰 - HTML 태그, 공백, 단어, 기호
+_DIFF_TOKEN_PATTERN = re.compile(r'<[^>]*>|\s+|\w+|[^\w\s]')
+
+# 이동(ID 변경) 항목으로 판정하는 최소 Source 유사도 (태그를 뺀 단어 목록의 difflib 유사도)
+MOVED_SIMILARITY_THRESHOLD = 0.9
+
+# LSH 후보로 남기는 최소 추정 Jaccard 유사도 (단어 3-gram 집합) - 단어 하나만 바뀌어도 3-gram 여러 개가 바뀌므로
+# MOVED_SIMILARITY_THRESHOLD보다 낮게 두고, 후보마다 실제 유사도로 다시 확인
+MOVED_CANDIDATE_SIMILARITY = 0.5
+
+# 유사 일치로 판정하는 Source의 최소 단어 수 (태그 제외) - 짧은 값은 완전 일치만 사용
+MOVED_MIN_WORDS = 8
+
+# 유사도 계산용 shingle의 단어 수
+MOVED_SHINGLE_WORDS = 3
+
+# MinHash 서명 길이와 LSH band 수 (band당 MINHASH_PERMUTATIONS // LSH_BANDS개 값)
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+
+# 한쪽 행 수가 이보다 많은 LSH 버킷은 후보에서 제외 ('Red' 같은 짧은 공통 값)
+LSH_MAX_BUCKET_ROWS = 20
+
+# MinHash 서명 계산 시 한 번에 shingle로 나누는 행 수
+MINHASH_CHUNK_ROWS = 8192
+
+# 유사도 계산용 단어 토큰과 제거할 HTML 태그 (태그 이름과 속성은 유사도에서 제외)
+_SHINGLE_PATTERN = re.compile(r'\w+')
+_HTML_TAG_PATTERN = re.compile(r'<[^>]*>')
+
+# 인코딩 감지에 사용하는 파일 앞부분 크기 (bytes)
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+# 빈 값(NaN)으로 읽는 문자열 (pandas read_csv 기본값과 동일)
+CSV_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
+class SizedLRUCache:
+    """
+    전체 크기(bytes) 한도를 넘으면 가장 오래 사용하지 않은 항목부터 제거하는 LRU 캐시입니다.
+
+    여러 세션(스레드)에서 함께 사용할 수 있습니다. 캐시된 값은 공유되므로 수정하면 안 됩니다.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        캐시된 값을 반환합니다. 없으면 None을 반환합니다.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, value, size):
+        """
+        값을 저장하고 한도를 넘는 만큼 오래된 항목을 제거합니다.
+        """
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.total_bytes += size
+
+            # 방금 넣은 항목은 한도를 넘더라도 유지
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    def hit_rate(self):
+        """
+        조회 중 캐시 적중 비율(0~1)을 반환합니다. 조회가 없었으면 None을 반환합니다.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class JobCancelled(Exception):
+    """
+    백그라운드 작업이 취소되어 다음 단계로 진행하지 않을 때 발생합니다.
+    """
+
+class JobQueueFull(Exception):
+    """
+    대기 중이거나 실행 중인 작업 수가 한도에 도달하여 새 작업을 받을 수 없을 때 발생합니다.
+    """
+
+class BackgroundJobs:
+    """
+    비교/병합 작업을 스레드 풀에서 실행하고 작업 ID로 진행 상황을 조회하거나 취소합니다.
+
+    작업 함수는 progress 키워드 인자로 단계 이름(과 처리 행 수)을 알리는 함수를 받습니다.
+    취소는 다음 단계가 시작될 때 JobCancelled를 발생시키는 방식이므로 진행 중인 단계는 끝까지 실행됩니다.
+    max_pending을 주면 대기 중 + 실행 중인 작업이 그 수에 도달했을 때 submit이 JobQueueFull을 발생시킵니다.
+    max_result_bytes를 주면 작업이 끝날 때마다 끝난 작업 결과의 크기(result_size) 합계가 그 값 이하가 되도록
+    가장 오래전에 끝난 작업부터 목록에서 제거합니다 (방금 끝난 작업은 남김).
+    """
+
+    def __init__(self, max_workers=1, max_pending=None, max_result_bytes=None, result_size=None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='langify-job')
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_result_bytes = max_result_bytes
+        self._result_size = result_size
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, phases=None, **kwargs):
+        """
+        작업을 대기열에 넣고 작업 ID를 반환합니다.
+
+        Args:
+            func: 실행할 함수 (progress 키워드 인자를 받아야 함)
+            phases (list): 진행률 계산에 사용할 단계 이름 목록 (COMPARE_PHASES 등)
+            *args, **kwargs: func에 전달할 인자
+
+        Returns:
+            str: 작업 ID
+
+        Raises:
+            JobQueueFull: max_pending개의 작업이 이미 대기 중이거나 실행 중인 경우
+        """
+        job = {
+            'id': uuid.uuid4().hex,
+            'state': 'queued',
+            'phase': None,
+            'phases': list(phases or []),
+            'submitted': time.time(),
+            'started': None,
+            'finished': None,
+            'result': None,
+            'error': None,
+            'cancel': threading.Event()
+        }
+
+        def progress(phase, rows=None):
+            if job['cancel'].is_set():
+                raise JobCancelled()
+            job['phase'] = phase
+
+        def run():
+            if job['cancel'].is_set():
+                job['state'] = 'cancelled'
+                job['finished'] = time.time()
+                return
+            job['state'] = 'running'
+            job['started'] = time.time()
+            try:
+                job['result'] = func(*args, progress=progress, **kwargs)
+                job['state'] = 'done'
+            except JobCancelled:
+                job['state'] = 'cancelled'
+            except Exception as e:
+                job['error'] = str(e)
+                job['state'] = 'failed'
+            job['finished'] = time.time()
+            self._trim_results()
+
+        with self._lock:
+            if self.max_pending is not None and self._pending() >= self.max_pending:
+                raise JobQueueFull(f"{self.max_pending} jobs are already queued or running.")
+            self._jobs[job['id']] = job
+        self._executor.submit(run)
+        return job['id']
+
+    def _pending(self):
+        return sum(1 for job in self._jobs.values() if job['state'] in ('queued', 'running'))
+
+    def _trim_results(self):
+        if self.max_result_bytes is None:
+            return
+        with self._lock:
+            finished = sorted((job for job in self._jobs.values() if job['finished'] is not None),
+                              key=lambda job: job['finished'], reverse=True)
+            total = 0
+            for index, job in enumerate(finished):
+                if job['result'] is not None:
+                    total += self._result_size(job['result'])
+                if index and total > self.max_result_bytes:
+                    del self._jobs[job['id']]
+
+    def counts(self):
+        """
+        상태별 작업 수를 반환합니다.
+
+        Returns:
+            dict: queued, running, done, failed, cancelled
+        """
+        with self._lock:
+            states = [job['state'] for job in self._jobs.values()]
+        return {state: states.count(state) for state in ('queued', 'running', 'done', 'failed', 'cancelled')}
+
+    def status(self, job_id):
+        """
+        작업 상태를 반환합니다. 없는 작업이면 None을 반환합니다.
+
+        Returns:
+            dict: state ('queued', 'running', 'done', 'failed', 'cancelled'), phase, progress (0~1),
+                elapsed (초), cancelling, error
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if job['state'] == 'done':
+            progress = 1.0
+        elif job['phase'] in job['phases']:
+            progress = job['phases'].index(job['phase']) / len(job['phases'])
+        else:
+            progress = 0.0
+        start = job['started'] or job['submitted']
+        return {
+            'state': job['state'],
+            'phase': job['phase'],
+            'progress': progress,
+            'elapsed': (job['finished'] or time.time()) - start,
+            'cancelling': job['cancel'].is_set() and job['state'] in ('queued', 'running'),
+            'error': job['error']
+        }
+
+    def cancel(self, job_id):
+        """
+        작업 취소를 요청합니다. 대기 중인 작업은 시작하지 않고, 실행 중인 작업은 다음 단계에서 멈춥니다.
+        """
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job['cancel'].set()
+
+    def result(self, job_id):
+        """
+        완료된 작업의 결과를 반환합니다 (완료되지 않았거나 없으면 None). 작업은 목록에 남습니다.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job['state'] != 'done':
+            return None
+        return job['result']
+
+    def purge(self, max_age):
+        """
+        끝난 지 max_age초가 지난 작업을 목록에서 제거합니다.
+
+        Returns:
+            int: 제거한 작업 수
+        """
+        cutoff = time.time() - max_age
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job['finished'] is not None and job['finished'] < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+    def pop(self, job_id):
+        """
+        끝난 작업을 목록에서 제거하고 결과를 반환합니다 (끝나지 않았거나 없으면 None).
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['state'] in ('queued', 'running'):
+                return None
+            del self._jobs[job_id]
+        return job['result']
+
+def process_rss_bytes():
+    """
+    현재 프로세스의 메모리 사용량(RSS, bytes)을 반환합니다.
+
+    /proc이 없는 경우 지금까지의 최대 RSS를 사용하며, 둘 다 알 수 없으면 None을 반환합니다.
+    """
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 bytes, 그 외는 KB 단위
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+class PerformanceRecorder:
+    """
+    작업 단계별 실행 시간, 처리 행 수, 최대 메모리(RSS)를 기록합니다.
+
+    progress 콜백으로 사용합니다 (recorder(phase, rows)). 다른 progress 콜백을 감싸면 단계를 그대로
+    전달하므로 BackgroundJobs의 취소와 함께 사용할 수 있습니다.
+    메모리는 백그라운드 스레드가 프로세스 RSS를 주기적으로 읽은 최대값이므로 Arrow 버퍼를 포함하지만,
+    동시에 실행 중인 다른 작업의 메모리도 함께 포함됩니다.
+    """
+
+    def __init__(self, operation, progress=None, sample_seconds=PERF_MEMORY_SAMPLE_SECONDS):
+        self.operation = operation
+        self.phases = []
+        self.started = datetime.datetime.now().isoformat(timespec='seconds')
+        self._progress = progress
+        self._sample_seconds = sample_seconds
+        self._start = time.perf_counter()
+        self._phase = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+        self._report = None
+
+    def __call__(self, phase, rows=None):
+        if self._progress is not None:
+            self._progress(phase, rows)
+        self._end_phase()
+        rss = process_rss_bytes()
+        with self._lock:
+            self._phase = {'phase': phase, 'rows': rows, 'start': time.perf_counter(), 'peak': rss}
+        if self._sampler is None and rss is not None:
+            self._sampler = threading.Thread(target=self._sample, name='langify-perf', daemon=True)
+            self._sampler.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.finish()
+
+    def _sample(self):
+        while not self._stop.wait(self._sample_seconds):
+            rss = process_rss_bytes()
+            with self._lock:
+                if self._phase is not None and rss is not None and rss > self._phase['peak']:
+                    self._phase['peak'] = rss
+
+    def _end_phase(self):
+        with self._lock:
+            phase, self._phase = self._phase, None
+        if phase is None:
+            return
+        rss = process_rss_bytes()
+        peak = max(phase['peak'], rss) if rss is not None else phase['peak']
+        self.phases.append({
+            'operation': self.operation,
+            'phase': phase['phase'],
+            'seconds': round(time.perf_counter() - phase['start'], 4),
+            'rows': phase['rows'],
+            'peak_rss_mb': None if peak is None else round(peak / 1024 / 1024, 1)
+        })
+
+    def finish(self):
+        """
+        진행 중인 단계를 마치고 기록을 반환합니다 (여러 번 호출해도 같은 기록 반환).
+
+        Returns:
+            dict: operation, started (ISO 시각), seconds (전체), phases (단계별 phase, seconds, rows, peak_rss_mb)
+        """
+        if self._report is None:
+            self._end_phase()
+            self._stop.set()
+            if self._sampler is not None:
+                self._sampler.join()
+            self._report = {
+                'operation': self.operation,
+                'started': self.started,
+                'seconds': round(time.perf_counter() - self._start, 4),
+                'phases': self.phases
+            }
+        return self._report
+
+def profile_call(func, *args, **kwargs):
+    """
+    함수를 cProfile로 실행합니다 (함수를 호출한 스레드만 측정).
+
+    Returns:
+        (반환값, dict): stats (pstats/snakeviz에서 열 수 있는 .prof 파일 bytes),
+            summary (누적 시간 상위 PROFILE_SUMMARY_LINES개 함수 텍스트)
+    """
+    profiler = cProfile.Profile()
+    value = profiler.runcall(func, *args, **kwargs)
+    summary = io.StringIO()
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.sort_stats('cumulative').print_stats(PROFILE_SUMMARY_LINES)
+    return value, {'stats': marshal.dumps(stats.stats), 'summary': summary.getvalue()}
+
+def _report_phase(progress, phase, rows=None):
+    """
+    진행 콜백이 있으면 새 단계의 시작과 처리할 행 수를 알립니다 (취소된 작업이면 콜백에서 JobCancelled 발생).
+    """
+    if progress is not None:
+        progress(phase, rows)
+
+def _merge_plan(df_a, df_b, comparison_result, include_deleted, include_added,
+                include_source_changes, include_translation_changes, include_both_changes,
+                key_a, key_b, include_moved, duplicate_policy, progress, include_near_moved=False):
+    """
+    병합 옵션에 따라 A에서 유지할 행, B에서 복사할 컬럼 값, 추가할 B 행을 계산합니다.
+
+    create_merged_file(병합 DataFrame)과 create_delta(delta 파일)가 같은 계획을 사용합니다.
+
+    Returns:
+        dict: keep (A 행 마스크), updates ((A 행 위치, B 행 위치, 컬럼 번호 목록)의 목록),
+            added (추가할 B 행 마스크), key_a, key_b, by_position (position 방식 여부)
+    """
+    # 키 생성 (항상 ID + Name)
+    _report_phase(progress, 'key build', len(df_a) + len(df_b))
+    if key_a is None:
+        key_a = _make_key(df_a)
+    if key_b is None:
+        key_b = _make_key(df_b)
+
+    # 비교와 같은 방식으로 중복 키 처리 (position 방식이면 순번이 추가된 키 사용)
+    prepared = _prepare_duplicate_keys(key_a, key_b, duplicate_policy)
+    join_key_a = prepared['key_a']
+    join_key_b = prepared['key_b']
+    by_position = prepared['occurrences'] is not None
+
+    def in_category(key, name):
+        category = comparison_result[name]
+        if category.empty:
+            return np.zeros(len(key), dtype=bool)
+        category_key = _make_key(category)
+        if by_position:
+            if KEY_OCCURRENCE_COLUMN not in category.columns:
+                raise ValueError("The comparison was not made with the 'position' duplicate key policy.")
+            category_key = _occurrence_key(category_key, category[KEY_OCCURRENCE_COLUMN].to_numpy() - 1)
+        return key.isin(category_key)
+
+    # Live 파일(A)을 기준으로 시작 - 변경되지 않은 항목은 그대로 유지
+    keep = np.ones(len(df_a), dtype=bool)
+    updates = []
+
+    # 1. A에만 있는 항목 (Deleted) - 선택하지 않으면 제외
+    if not include_deleted:
+        keep &= ~in_category(join_key_a, 'only_in_a')
+
+    # 공통 키의 A/B 행 위치
+    _report_phase(progress, 'join', len(df_a) + len(df_b))
+    pos_a, pos_b = _join_on_key(join_key_a, join_key_b, prepared['keep'])
+    joined_keys = join_key_a[pos_a]
+    _report_phase(progress, 'merge', len(df_a) + len(df_b))
+
+    def apply_from_b(category, columns):
+        # 카테고리에 속한 공통 키 행에 B의 값을 컬럼 단위로 복사
+        mask = in_category(joined_keys, category)
+        updates.append((pos_a[mask], pos_b[mask], columns))
+
+    # 2. Source 변경 (col3_changes) - use_b이면 B의 Source, use_a이면 A의 Source 유지
+    if include_source_changes == 'use_b' and not comparison_result['col3_changes'].empty:
+        apply_from_b('col3_changes', [2])
+
+    # 3. Translation 변경 (col4_changes) - B의 Translation 사용
+    if include_translation_changes and not comparison_result['col4_changes'].empty:
+        apply_from_b('col4_changes', [3])
+
+    # 4. Both 변경 (both_changes) - Source와 Translation 모두 B의 값 사용
+    if include_both_changes and not comparison_result['both_changes'].empty:
+        apply_from_b('both_changes', [2, 3])
+
+    # 5. 이동 항목 (moved) - ID가 바뀐 A 행에 B의 Translation을 적용하고 삭제 옵션과 관계없이 유지
+    #    (유사 일치는 include_near_moved일 때만)
+    moved = comparison_result.get('moved')
+    moved_keys_b = None
+    if moved is not None and not include_near_moved:
+        moved = moved[moved['Match'] == 'exact']
+    if include_moved and moved is not None and not moved.empty:
+        moved_keys_a = pd.MultiIndex.from_arrays([_key_values(moved.iloc[:, 0]), _key_values(moved.iloc[:, 2])])
+        moved_keys_b = pd.MultiIndex.from_arrays([_key_values(moved.iloc[:, 1]), _key_values(moved.iloc[:, 2])])
+        rows_a, moved_a = _join_on_key(key_a, moved_keys_a, prepared['keep'])
+        rows_b, moved_b = _join_on_key(key_b, moved_keys_b, prepared['keep'])
+        row_b_of_moved = np.full(len(moved), -1)
+        row_b_of_moved[moved_b] = rows_b
+        rows_b = row_b_of_moved[moved_a]
+        found = rows_b >= 0
+        updates.append((rows_a[found], rows_b[found], [3]))
+        keep[rows_a] = True
+
+    # 중복 키는 비교에 사용한 행만 포함 (position 방식은 순번마다 한 행씩 모두 포함)
+    if not by_position:
+        keep &= ~key_a.duplicated(keep=prepared['keep'])
+
+    # 6. B에만 있는 항목 (Added) - 선택 시 Modified 버전을 마지막에 추가 (이동 항목의 옛 ID 행 제외)
+    added = np.zeros(len(df_b), dtype=bool)
+    if include_added and not comparison_result['only_in_b'].empty:
+        added = in_category(join_key_b, 'only_in_b')
+        if not by_position:
+            added &= ~key_b.duplicated(keep=prepared['keep'])
+        if moved_keys_b is not None:
+            added &= ~key_b.isin(moved_keys_b)
+
+    return {'keep': keep, 'updates': updates, 'added': added, 'key_a': key_a, 'key_b': key_b,
+            'by_position': by_position}
+
+def create_merged_file(df_a, df_b, comparison_result, include_deleted, include_added,
+                       include_source_changes, include_translation_changes,
+                       include_both_changes, key_a=None, key_b=None, include_moved=False,
+                       duplicate_policy='first', progress=None, include_near_moved=False):
+    """
+    사용자 옵션에 따라 병합된 DataFrame을 생성합니다.
+
+    A를 기준으로 카테고리 마스크에 따라 컬럼 단위로 B의 값을 덮어쓰므로,
+    A의 원래 행 순서가 유지되고 B에만 있는 항목은 마지막에 추가됩니다.
+
+    Args:
+        df_a: Original/Live DataFrame
+        df_b: Modified DataFrame
+        comparison_result: compare_dataframes의 결과
+        include_deleted: A에만 있는 항목 포함 여부
+        include_added: B에만 있는 항목 포함 여부
+        include_source_changes: Source 변경 사항 포함 여부 ('use_a', 'use_b', 'skip')
+        include_translation_changes: Translation 변경 사항 포함 여부
+        include_both_changes: 양쪽 모두 변경된 항목 포함 여부
+        key_a: 미리 생성한 A의 키 (없으면 새로 생성)
+        key_b: 미리 생성한 B의 키 (없으면 새로 생성)
+        include_moved: 이동 항목(comparison_result['moved'])의 B Translation을 A의 새 ID 행에 적용하고
+            B의 옛 ID 행은 추가하지 않을지 여부 (기본은 Source가 완전히 같은 항목만)
+        duplicate_policy: 비교에 사용한 중복 키 처리 방식 (DUPLICATE_POLICIES)
+            - first/last: 중복 키마다 비교한 행 하나만 포함
+            - position: 순번마다 한 행씩 모두 포함 (comparison_result도 position 방식이어야 함)
+        progress: 단계(MERGE_PHASES)가 시작될 때마다 progress(phase, rows)로 호출할 함수
+            (BackgroundJobs, PerformanceRecorder)
+        include_near_moved: include_moved일 때 Source가 유사한 이동 항목(Match가 'near')도 적용할지 여부
+
+    Returns:
+        Merged DataFrame
+    """
+    plan = _merge_plan(df_a, df_b, comparison_result, include_deleted, include_added,
+                       include_source_changes, include_translation_changes, include_both_changes,
+                       key_a, key_b, include_moved, duplicate_policy, progress, include_near_moved)
+
+    merged_df = df_a.copy()
+    for rows_a, rows_b, columns in plan['updates']:
+        for column in columns:
+            merged_df.iloc[rows_a, column] = df_b.iloc[rows_b, column].array
+    merged_df = merged_df[plan['keep']]
+
+    # B에만 있는 항목은 마지막에 추가
+    if plan['added'].any():
+        added = df_b[plan['added']].reindex(columns=df_a.columns)
+        merged_df, added = _align_categories(merged_df, added)
+        merged_df = pd.concat([merged_df, added])
+
+    # 컬럼 순서를 원본과 동일하게 유지
+    return merged_df[df_a.columns.tolist()].reset_index(drop=True)
+
+def _align_categories(frame_a, frame_b):
+    """
+    두 DataFrame의 category 컬럼이 같은 카테고리를 갖도록 맞춥니다.
+
+    카테고리가 다른 컬럼을 concat하면 object 컬럼으로 바뀌므로, 합치기 전에 호출합니다.
+    """
+    frame_a = frame_a.copy(deep=False)
+    frame_b = frame_b.copy(deep=False)
+    for i in range(len(frame_a.columns)):
+        values_a = frame_a.iloc[:, i]
+        values_b = frame_b.iloc[:, i]
+        if isinstance(values_a.dtype, pd.CategoricalDtype) and isinstance(values_b.dtype, pd.CategoricalDtype):
+            categories = values_a.cat.categories.union(values_b.cat.categories)
+            frame_a.isetitem(i, values_a.cat.set_categories(categories))
+            frame_b.isetitem(i, values_b.cat.set_categories(categories))
+    return frame_a, frame_b
+
+def create_delta(df_a, df_b, comparison_result, include_deleted, include_added,
+                 include_source_changes, include_translation_changes,
+                 include_both_changes, key_a=None, key_b=None, include_moved=False,
+                 duplicate_policy='first', progress=None, include_near_moved=False):
+    """
+    병합 옵션으로 선택된 변경만 담은 delta(patch)를 생성합니다.
+
+    병합 파일 전체 대신 A에 적용할 키 단위 작업(delete, update_*, insert)만 기록하므로
+    변경이 적으면 export 전체보다 훨씬 작습니다. apply_delta로 A에 적용하면
+    create_merged_file과 같은 결과를 얻습니다. 인자는 create_merged_file과 같습니다.
+
+    각 행은 (ID, Name, 키 순번)으로 A의 행을 가리킵니다. 키 순번은 같은 키 안에서 몇 번째 행인지(0부터)이며,
+    insert는 A에 그 순번의 행이 없을 때만 추가됩니다.
+
+    Returns:
+        DataFrame: DELTA_OP_COLUMN, DELTA_OCCURRENCE_COLUMN + A의 컬럼
+            (delete는 ID/Name만, update_*는 ID/Name과 바뀌는 값만, insert는 B의 전체 행)
+    """
+    plan = _merge_plan(df_a, df_b, comparison_result, include_deleted, include_added,
+                       include_source_changes, include_translation_changes, include_both_changes,
+                       key_a, key_b, include_moved, duplicate_policy, progress, include_near_moved)
+
+    # A 행마다 Source/Translation 값을 가져올 B 행 (-1 = 바뀌지 않음)
+    value_rows = {2: np.full(len(df_a), -1), 3: np.full(len(df_a), -1)}
+    for rows_a, rows_b, columns in plan['updates']:
+        for column in columns:
+            value_rows[column][rows_a] = rows_b
+
+    deleted = np.flatnonzero(~plan['keep'])
+    updated = np.flatnonzero(plan['keep'] & ((value_rows[2] >= 0) | (value_rows[3] >= 0)))
+    rows_a = np.concatenate([deleted, updated])
+
+    # delete/update 행 - 바뀌지 않는 값은 빈 값
+    columns = [df_a.iloc[rows_a, i].to_numpy(dtype=object) if i < 2 else np.full(len(rows_a), np.nan, dtype=object)
+               for i in range(len(df_a.columns))]
+    for column, source_rows in value_rows.items():
+        source_rows = source_rows[updated]
+        changed = source_rows >= 0
+        columns[column][len(deleted) + np.flatnonzero(changed)] = \
+            df_b.iloc[source_rows[changed], column].to_numpy(dtype=object)
+    changes = pd.DataFrame(dict(enumerate(columns)))
+    changes.columns = df_a.columns
+    source_changed = value_rows[2][updated] >= 0
+    translation_changed = value_rows[3][updated] >= 0
+    ops = np.concatenate([
+        np.full(len(deleted), 'delete', dtype=object),
+        np.select([source_changed & translation_changed, source_changed],
+                  ['update_both', 'update_source'], 'update_translation').astype(object)
+    ])
+    occurrences = _key_occurrence(plan['key_a'])[rows_a]
+
+    # insert 행 - B의 행을 A의 컬럼 순서로 (position 방식이 아니면 키마다 한 행이므로 순번 0)
+    inserted = np.flatnonzero(plan['added'])
+    inserts = df_b.iloc[inserted].reindex(columns=df_a.columns).astype(object)
+    insert_occurrences = (_key_occurrence(plan['key_b'])[inserted] if plan['by_position']
+                          else np.zeros(len(inserted), dtype=np.intp))
+
+    delta = pd.concat([changes, inserts], ignore_index=True)
+    delta.insert(0, DELTA_OCCURRENCE_COLUMN, np.concatenate([occurrences, insert_occurrences]))
+    delta.insert(0, DELTA_OP_COLUMN, np.concatenate([ops, np.full(len(inserted), 'insert', dtype=object)]))
+    return delta
+
+def apply_delta(source_a, delta, output, chunksize=CSV_CHUNK_ROWS, progress=None):
+    """
+    Live export(A)를 청크 단위로 읽으면서 delta를 적용하여 병합된 import CSV를 기록합니다.
+
+    A 전체를 메모리에 올리지 않으므로 메모리 사용량은 청크 크기와 delta 크기로 제한됩니다.
+    같은 A에 적용하면 create_merged_file과 같은 CSV가 만들어지고, 더 새로운 export에 적용하면
+    A에 없는 키의 delete/update와 이미 있는 키의 insert는 건너뜁니다.
+
+    Args:
+        source_a: Live export CSV 경로 또는 파일 객체
+        delta: create_delta의 DataFrame 또는 delta CSV 경로 (.gz 등 압축은 확장자로 판단)
+        output: 병합된 CSV를 기록할 경로 또는 바이너리 파일 객체
+        chunksize (int): 한 번에 읽는 A의 행 수
+        progress: 시작할 때 progress(phase, rows)로 호출할 함수 (PerformanceRecorder, rows는 delta 행 수)
+
+    Returns:
+        dict: rows (기록한 행 수), deleted, updated, inserted, skipped (적용하지 않은 delta 행 수)
+    """
+    if not isinstance(delta, pd.DataFrame):
+        delta = pd.read_csv(delta, dtype=str)
+    _report_phase(progress, 'apply delta', len(delta))
+    ops = delta[DELTA_OP_COLUMN].to_numpy(dtype=object)
+    unknown = set(ops) - set(DELTA_OPS)
+    if unknown:
+        raise ValueError(f"Unknown delta operations: {', '.join(sorted(map(str, unknown)))}")
+    occurrences = delta[DELTA_OCCURRENCE_COLUMN].astype(int).to_numpy()
+    values = delta.drop(columns=[DELTA_OP_COLUMN, DELTA_OCCURRENCE_COLUMN])
+
+    # delta에 나오는 키만 추적 - A의 행마다 (키, 순번)으로 delete/update 작업을 찾음
+    delta_key = _make_key(values)
+    tracked = delta_key.unique()
+    key_ids = tracked.get_indexer(delta_key)
+    is_insert = ops == 'insert'
+    row_ops = np.flatnonzero(~is_insert)
+    row_op_index = pd.MultiIndex.from_arrays([key_ids[row_ops], occurrences[row_ops]])
+    seen = np.zeros(len(tracked), dtype=np.intp)
+    applied = np.zeros(len(delta), dtype=bool)
+    rows_written = 0
+
+    encoding = detect_encoding(source_a)
+    header = pd.read_csv(_rewind(source_a), dtype=str, nrows=0, encoding=encoding)
+    if len(header.columns) < 4:
+        raise ValueError("CSV files must have at least 4 columns.")
+
+    with contextlib.ExitStack() as stack:
+        handle = output if hasattr(output, 'write') else stack.enter_context(open(output, 'wb'))
+        header.to_csv(handle, index=False, encoding='utf-8')
+        for chunk in pd.read_csv(_rewind(source_a), dtype=str, chunksize=chunksize, encoding=encoding):
+            chunk_ids = tracked.get_indexer(_make_key(chunk))
+            hits = np.flatnonzero(chunk_ids >= 0)
+            if len(hits):
+                # 청크 앞까지 나온 행 수 + 청크 안에서의 순번 = 전체 키 순번
+                hit_ids = chunk_ids[hits]
+                hit_occurrences = seen[hit_ids] + pd.Series(hit_ids).groupby(hit_ids).cumcount().to_numpy()
+                seen += np.bincount(hit_ids, minlength=len(tracked))
+
+                matched = row_op_index.get_indexer(pd.MultiIndex.from_arrays([hit_ids, hit_occurrences]))
+                found = matched >= 0
+                rows = hits[found]
+                delta_rows = row_ops[matched[found]]
+                applied[delta_rows] = True
+                row_ops_found = ops[delta_rows]
+
+                for column, names in ((2, ('update_source', 'update_both')),
+                                      (3, ('update_translation', 'update_both'))):
+                    selected = np.isin(row_ops_found, names)
+                    if selected.any():
+                        chunk.iloc[rows[selected], column] = values.iloc[delta_rows[selected], column].to_numpy()
+                keep = np.ones(len(chunk), dtype=bool)
+                keep[rows[row_ops_found == 'delete']] = False
+                chunk = chunk[keep]
+            chunk.to_csv(handle, index=False, header=False, encoding='utf-8')
+            rows_written += len(chunk)
+
+        # A에 해당 순번의 행이 없는 insert만 마지막에 추가
+        inserts = np.flatnonzero(is_insert)
+        inserts = inserts[seen[key_ids[inserts]] <= occurrences[inserts]]
+        applied[inserts] = True
+        added = values.iloc[inserts]
+        added = added.set_axis(range(len(added.columns)), axis=1).reindex(columns=range(len(header.columns)))
+        added.to_csv(handle, index=False, header=False, encoding='utf-8')
+        rows_written += len(added)
+
+    applied_ops = ops[applied]
+    return {
+        'rows': rows_written,
+        'deleted': int((applied_ops == 'delete').sum()),
+        'updated': int(np.char.startswith(applied_ops.astype(str), 'update').sum()),
+        'inserted': len(inserts),
+        'skipped': int((~applied).sum())
+    }
+
+def _key_values(values):
+    """
+    키 컬럼 값을 MultiIndex 생성용 배열로 변환합니다. 빈 값은 ''로 채웁니다.
+
+    Arrow 문자열/category 컬럼(메모리 절약 모드)은 object로 변환하지 않고 그대로 사용합니다.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        if values.hasnans and '' not in values.cat.categories:
+            values = values.cat.add_categories([''])
+        return values.fillna('').array
+    if isinstance(values.dtype, pd.StringDtype):
+        return values.fillna('').array
+    return values.fillna('').astype(str).to_numpy(dtype=object)
+
+def _make_key(df):
+    """
+    처음 두 컬럼(ID + Name)으로 비교용 키를 생성합니다.
+
+    '|'.join 문자열 대신 컬럼별로 factorize된 MultiIndex를 사용하므로
+    행마다 문자열을 만들지 않고, '|'가 포함된 ID/Name도 서로 충돌하지 않습니다.
+    업로드된 파일마다 한 번 생성하여 compare_dataframes와 create_merged_file에서 재사용합니다.
+
+    Args:
+        df (DataFrame): Langify export 데이터
+
+    Returns:
+        MultiIndex: 행 순서와 동일한 (ID, Name) 키
+    """
+    return pd.MultiIndex.from_arrays(
+        [_key_values(df.iloc[:, i]) for i in range(2)],
+        names=['ID', 'Name']
+    )
+
+def _join_on_key(key_a, key_b, keep='first'):
+    """
+    두 키를 해시 조인하여 공통 키의 위치를 반환합니다.
+
+    중복 키는 keep에 따라 첫 번째 또는 마지막 행만 사용합니다.
+
+    Args:
+        key_a (MultiIndex): A의 키 (_make_key)
+        key_b (MultiIndex): B의 키 (_make_key)
+        keep (str): 중복 키에서 사용할 행 ('first' 또는 'last')
+
+    Returns:
+        (pos_a, pos_b): 공통 키에 해당하는 A/B 행의 위치 배열 (A의 행 순서)
+    """
+    # 각 키의 첫 번째(또는 마지막) 행만 남김
+    first_a = np.flatnonzero(~key_a.duplicated(keep=keep))
+    first_b = np.flatnonzero(~key_b.duplicated(keep=keep))
+
+    # B의 고유 키 인덱스에서 A의 키 위치를 한 번에 조회 (-1 = 없음)
+    matched = key_b[first_b].get_indexer(key_a[first_a])
+    found = matched >= 0
+
+    return first_a[found], first_b[matched[found]]
+
+def _key_occurrence(key):
+    """
+    각 행이 같은 키의 몇 번째 행인지(0부터) 계산합니다.
+
+    MultiIndex의 레벨 코드로 groupby하므로 키 값을 다시 해시하지 않습니다.
+    """
+    codes = pd.DataFrame({i: level_codes for i, level_codes in enumerate(key.codes)})
+    return codes.groupby(list(codes.columns), sort=False).cumcount().to_numpy()
+
+def _occurrence_key(key, occurrence):
+    """
+    키에 순번 레벨을 추가하여 중복 키가 없는 조인용 키를 만듭니다 (position 방식).
+    """
+    return pd.MultiIndex(
+        levels=list(key.levels) + [np.arange(occurrence.max() + 1 if len(occurrence) else 0)],
+        codes=list(key.codes) + [occurrence],
+        names=list(key.names) + ['Occurrence'],
+        verify_integrity=False
+    )
+
+def _prepare_duplicate_keys(key_a, key_b, duplicate_policy):
+    """
+    중복 키를 한 번에 찾고 처리 방식에 맞는 조인용 키를 준비합니다.
+
+    Args:
+        key_a, key_b (MultiIndex): A/B의 키 (_make_key)
+        duplicate_policy (str): DUPLICATE_POLICIES 중 하나
+
+    Returns:
+        dict:
+            duplicated_a, duplicated_b: 키가 두 번 이상 나오는 행 마스크
+            key_a, key_b: 조인용 키 (position 방식이면 순번 레벨이 추가된 키)
+            occurrences: position 방식이면 A/B 행의 키 순번 (occurrence_a, occurrence_b), 아니면 None
+            keep: 조인에 사용할 중복 행 ('first' 또는 'last')
+
+    Raises:
+        ValueError: 알 수 없는 처리 방식이거나, error 방식에서 중복 키가 있는 경우
+    """
+    if duplicate_policy not in DUPLICATE_POLICIES:
+        raise ValueError(f"Unknown duplicate key policy: {duplicate_policy}")
+
+    duplicated_a = key_a.duplicated(keep=False)
+    duplicated_b = key_b.duplicated(keep=False)
+    if duplicate_policy == 'error' and (duplicated_a.any() or duplicated_b.any()):
+        raise ValueError(f"Duplicate ID + Name keys found ({duplicated_a.sum()} rows in File A, "
+                         f"{duplicated_b.sum()} rows in File B).")
+
+    prepared = {
+        'duplicated_a': duplicated_a,
+        'duplicated_b': duplicated_b,
+        'key_a': key_a,
+        'key_b': key_b,
+        'occurrences': None,
+        'keep': 'last' if duplicate_policy == 'last' else 'first'
+    }
+    if duplicate_policy == 'position':
+        # 중복이 있는 쪽만 순번을 계산 (없으면 모두 0)
+        occurrence_a = _key_occurrence(key_a) if duplicated_a.any() else np.zeros(len(key_a), dtype=np.intp)
+        occurrence_b = _key_occurrence(key_b) if duplicated_b.any() else np.zeros(len(key_b), dtype=np.intp)
+        prepared['key_a'] = _occurrence_key(key_a, occurrence_a)
+        prepared['key_b'] = _occurrence_key(key_b, occurrence_b)
+        prepared['occurrences'] = (occurrence_a, occurrence_b)
+    return prepared
+
+def duplicate_key_report(df_a, df_b, duplicated_a, duplicated_b):
+    """
+    키(ID + Name)가 두 번 이상 나오는 행을 A/B 모두 모아 보고용 DataFrame으로 만듭니다.
+
+    Args:
+        df_a, df_b: 비교한 DataFrame
+        duplicated_a, duplicated_b: 중복 키 행 마스크 (_prepare_duplicate_keys)
+
+    Returns:
+        DataFrame: File, Row (1부터), ID, Name, Source, Translation, Occurrence, Count
+    """
+    columns = df_a.columns[:4].tolist()
+    frames = []
+    for label, df, duplicated in (('A', df_a, duplicated_a), ('B', df_b, duplicated_b)):
+        if not duplicated.any():
+            continue
+        rows = np.flatnonzero(duplicated)
+        duplicates = df.iloc[rows, :4]
+        key = _make_key(duplicates)
+        codes = pd.DataFrame(dict(enumerate(key.codes)))
+        group = codes.groupby(list(codes.columns), sort=False).ngroup().to_numpy()
+        frame = pd.DataFrame({'File': label, 'Row': rows + 1})
+        for i, column in enumerate(columns):
+            frame[column] = duplicates.iloc[:, i].to_numpy(dtype=object)
+        frame['Occurrence'] = _key_occurrence(key) + 1
+        frame['Count'] = np.bincount(group)[group]
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=['File', 'Row'] + columns + ['Occurrence', 'Count'])
+    return pd.concat(frames, ignore_index=True)
+
+def _values_differ(values_a, values_b):
+    """
+    두 컬럼 값을 비교합니다. 양쪽 모두 비어 있으면 같은 값으로 봅니다.
+
+    값을 문자열로 복사하지 않고 배열 그대로 비교합니다 (export는 dtype=str로 읽음).
+    Arrow 문자열 배열끼리는 Arrow에서 직접 비교합니다.
+    """
+    both_na = pd.isna(values_a) & pd.isna(values_b)
+    differ = values_a != values_b
+    if not isinstance(differ, np.ndarray):
+        # Arrow 비교 결과의 빈 값(NA)은 한쪽만 비어 있는 경우
+        differ = differ.to_numpy(dtype=bool, na_value=True)
+    return differ & ~both_na
+
+def _fingerprint(values):
+    """
+    컬럼 값마다 64비트 content fingerprint를 계산합니다. 빈 값(NaN)끼리는 같은 값을 가집니다.
+
+    Arrow 문자열 컬럼은 FINGERPRINT_CHUNK_ROWS행씩만 Python 문자열로 변환하여 해시합니다.
+    """
+    values = pd.Series(values, copy=False)
+    if values.dtype == object:
+        return pd.util.hash_array(values.to_numpy(na_value=np.nan), categorize=False)
+
+    hashes = np.empty(len(values), dtype=np.uint64)
+    for start in range(0, len(values), FINGERPRINT_CHUNK_ROWS):
+        block = values.iloc[start:start + FINGERPRINT_CHUNK_ROWS].to_numpy(dtype=object, na_value=np.nan)
+        hashes[start:start + len(block)] = pd.util.hash_array(block, categorize=False)
+    return hashes
+
+def _row_fingerprints(df):
+    """
+    3번째(Source)/4번째(Translation) 컬럼의 fingerprint를 계산합니다.
+
+    업로드된 파일마다 한 번 계산하여 키와 함께 보관하고 비교에 재사용합니다.
+
+    Returns:
+        ndarray: (2, 행 수) uint64 배열 - [Source fingerprint, Translation fingerprint]
+    """
+    return np.vstack([_fingerprint(df.iloc[:, 2]), _fingerprint(df.iloc[:, 3])])
+
+def _column_differs(df_a, df_b, column, fingerprints_a, fingerprints_b, pos_a, pos_b):
+    """
+    공통 키 행의 컬럼 값이 다른지 fingerprint로 판별합니다.
+
+    fingerprint가 다르면 값도 다르므로 바로 변경으로 판정하고,
+    fingerprint가 같은 행만 해시 충돌을 배제하기 위해 실제 값을 비교합니다.
+    """
+    differ = fingerprints_a[pos_a] != fingerprints_b[pos_b]
+    same = np.flatnonzero(~differ)
+    differ[same] = _values_differ(
+        df_a.iloc[pos_a[same], column].array,
+        df_b.iloc[pos_b[same], column].array
+    )
+    return differ
+
+def _build_result(df_a, df_b, only_a_mask, only_b_mask, pos_a, pos_b, col3_diff=None, col4_diff=None,
+                  occurrences=None):
+    """
+    조인 위치와 변경 여부로 compare_dataframes 결과 dict를 구성합니다.
+
+    Args:
+        df_a, df_b: 비교한 DataFrame
+        only_a_mask, only_b_mask: A에만 / B에만 있는 행 마스크
+        pos_a, pos_b: 공통 키의 A/B 행 위치 (A의 행 순서)
+        col3_diff, col4_diff: 3번째/4번째 컬럼 변경 여부 (없으면 새로 비교)
+        occurrences: position 방식의 A/B 행 키 순번 (있으면 KEY_OCCURRENCE_COLUMN 컬럼 추가)
+    """
+    # 키 컬럼 설정 (항상 ID + Name)
+    key_columns = df_a.columns[:2].tolist()
+
+    # 원래 dtype(Arrow 문자열/category 포함)을 유지하도록 .array로 가져옴
+    id_values = df_a.iloc[pos_a, 0].array
+    name_values = df_a.iloc[pos_a, 1].array
+    col3_a = df_a.iloc[pos_a, 2].array
+    col3_b = df_b.iloc[pos_b, 2].array
+    col4_a = df_a.iloc[pos_a, 3].array
+    col4_b = df_b.iloc[pos_b, 3].array
+
+    # 3번째 컬럼 (인덱스 2) 또는 4번째 컬럼 (인덱스 3) 비교
+    if col3_diff is None:
+        col3_diff = _values_differ(col3_a, col3_b)
+    if col4_diff is None:
+        col4_diff = _values_differ(col4_a, col4_b)
+
+    col3_name = df_a.columns[2]
+    col4_name = df_a.columns[3]
+
+    def build_changes(mask, columns):
+        # 공통 데이터 (키 컬럼들 - 항상 ID + Name) + 카테고리별 컬럼
+        data = {key_columns[0]: id_values[mask], key_columns[1]: name_values[mask]}
+        for name, values in columns:
+            data[name] = values[mask]
+        if occurrences is not None:
+            data[KEY_OCCURRENCE_COLUMN] = occurrences[0][pos_a][mask] + 1
+        return pd.DataFrame(data)
+
+    # 둘 다 변경된 경우
+    both_changes_df = build_changes(col3_diff & col4_diff, [
+        (f'{col3_name}_Before (File_A)', col3_a),
+        (f'{col3_name}_After (File_B)', col3_b),
+        (f'{col4_name}_Before (File_A)', col4_a),
+        (f'{col4_name}_After (File_B)', col4_b),
+    ])
+
+    # 3번째 컬럼만 변경
+    col3_changes_df = build_changes(col3_diff & ~col4_diff, [
+        (f'{col3_name}_Before (File_A)', col3_a),
+        (f'{col3_name}_After (File_B)', col3_b),
+        (f'{col4_name} (Unchanged)', col4_a),
+    ])
+
+    # 4번째 컬럼만 변경
+    col4_changes_df = build_changes(~col3_diff & col4_diff, [
+        (f'{col3_name} (Unchanged)', col3_a),
+        (f'{col4_name}_Before (File_A)', col4_a),
+        (f'{col4_name}_After (File_B)', col4_b),
+    ])
+
+    only_in_a = df_a[only_a_mask]
+    only_in_b = df_b[only_b_mask]
+    if occurrences is not None:
+        only_in_a = only_in_a.assign(**{KEY_OCCURRENCE_COLUMN: occurrences[0][only_a_mask] + 1})
+        only_in_b = only_in_b.assign(**{KEY_OCCURRENCE_COLUMN: occurrences[1][only_b_mask] + 1})
+
+    return {
+        'only_in_a': only_in_a,
+        'only_in_b': only_in_b,
+        'col3_changes': col3_changes_df,
+        'col4_changes': col4_changes_df,
+        'both_changes': both_changes_df
+    }
+
+def compare_dataframes(df_a, df_b, key_a=None, key_b=None, fingerprints_a=None, fingerprints_b=None,
+                       duplicate_policy='first', progress=None):
+    """
+    두 DataFrame을 비교하여 차이점을 분석합니다.
+
+    ID + Name 키로 A와 B를 한 번에 조인한 뒤, Source/Translation fingerprint를 먼저 비교하고
+    fingerprint가 같은 행만 실제 값을 비교하여 3번째/4번째 컬럼 변경 여부를 판별합니다.
+    중복 키는 조인 전에 한 번에 찾아 duplicates로 보고하고 duplicate_policy에 따라 처리합니다.
+
+    Args:
+        df_a (DataFrame): Live/Current CSV 데이터 (A.csv)
+        df_b (DataFrame): Modified CSV 데이터 (B.csv)
+        key_a (MultiIndex): 미리 생성한 A의 키 (없으면 새로 생성)
+        key_b (MultiIndex): 미리 생성한 B의 키 (없으면 새로 생성)
+        fingerprints_a (ndarray): 미리 계산한 A의 fingerprint (없으면 새로 계산)
+        fingerprints_b (ndarray): 미리 계산한 B의 fingerprint (없으면 새로 계산)
+        duplicate_policy (str): 중복 키 처리 방식 (DUPLICATE_POLICIES)
+            - first/last: 키마다 첫/마지막 행만 비교 (나머지 중복 행은 결과에서 제외)
+            - error: 중복 키가 있으면 ValueError
+            - position: A와 B에서 같은 순번의 중복 행끼리 비교 (결과에 KEY_OCCURRENCE_COLUMN 추가)
+        progress: 단계(COMPARE_PHASES)가 시작될 때마다 progress(phase, rows)로 호출할 함수
+            (BackgroundJobs, PerformanceRecorder)
+
+    Returns:
+        dict: only_in_a, only_in_b, col3_changes, col4_changes, both_changes, duplicates
+    """
+    # 컬럼 확인
+    if len(df_a.columns) < 4 or len(df_b.columns) < 4:
+        raise ValueError("CSV files must have at least 4 columns.")
+
+    # 키 조합 생성
+    _report_phase(progress, 'key build', len(df_a) + len(df_b))
+    if key_a is None:
+        key_a = _make_key(df_a)
+    if key_b is None:
+        key_b = _make_key(df_b)
+
+    # 중복 키 확인 (position 방식이면 순번이 추가된 키로 조인)
+    prepared = _prepare_duplicate_keys(key_a, key_b, duplicate_policy)
+    key_a = prepared['key_a']
+    key_b = prepared['key_b']
+
+    # 1. A에만 있는 자료 (A - B) / 2. B에만 있는 자료 (B - A)
+    _report_phase(progress, 'join', len(df_a) + len(df_b))
+    only_a_mask = ~key_a.isin(key_b)
+    only_b_mask = ~key_b.isin(key_a)
+
+    # 3. 키는 동일하지만 3번째 또는 4번째 컬럼이 다른 경우
+    pos_a, pos_b = _join_on_key(key_a, key_b, prepared['keep'])
+
+    _report_phase(progress, 'classify', len(pos_a))
+    if fingerprints_a is None:
+        fingerprints_a = _row_fingerprints(df_a)
+    if fingerprints_b is None:
+        fingerprints_b = _row_fingerprints(df_b)
+    col3_diff = _column_differs(df_a, df_b, 2, fingerprints_a[0], fingerprints_b[0], pos_a, pos_b)
+    col4_diff = _column_differs(df_a, df_b, 3, fingerprints_a[1], fingerprints_b[1], pos_a, pos_b)
+
+    result = _build_result(df_a, df_b, only_a_mask, only_b_mask, pos_a, pos_b, col3_diff, col4_diff,
+                           prepared['occurrences'])
+    result['duplicates'] = duplicate_key_report(df_a, df_b, prepared['duplicated_a'], prepared['duplicated_b'])
+    return result
+
+def comparison_result_bytes(result):
+    """
+    비교 결과 dict에 포함된 DataFrame의 메모리 크기(bytes) 합계를 반환합니다 (결과 캐시 크기 계산용).
+    """
+    return int(sum(frame.memory_usage(deep=True).sum() for frame in result.values()
+                   if isinstance(frame, pd.DataFrame)))
+
+def compare_translation_columns(df_a, df_b, key_a=None, key_b=None, duplicate_policy='first'):
+    """
+    다국어 export의 모든 번역 컬럼(4번째 컬럼 이후)을 한 번에 비교합니다.
+
+    카테고리별 Before/After DataFrame을 만들지 않고, 공통 키 × 언어의 bool 변경 행렬만 만듭니다.
+    실제 값이 필요하면 translation_cell_changes로 선택한 언어의 변경 셀만 가져옵니다.
+    번역 컬럼은 A의 4번째 이후 컬럼 중 B에도 같은 이름으로 있는 컬럼입니다.
+
+    Args:
+        df_a (DataFrame): Live/Current CSV 데이터 (A.csv)
+        df_b (DataFrame): Modified CSV 데이터 (B.csv)
+        key_a (MultiIndex): 미리 생성한 A의 키 (없으면 새로 생성)
+        key_b (MultiIndex): 미리 생성한 B의 키 (없으면 새로 생성)
+        duplicate_policy (str): 중복 키 처리 방식 (DUPLICATE_POLICIES, compare_dataframes와 동일)
+
+    Returns:
+        dict:
+            languages: 비교한 번역 컬럼 이름 목록
+            matrix: ID, Name + 언어별 변경 여부(bool) 컬럼 (하나 이상 변경된 키만,
+                position 방식이면 KEY_OCCURRENCE_COLUMN 추가)
+            counts: 언어별 변경 셀 수 (Series)
+            pos_a, pos_b: matrix 각 행의 A/B 행 위치
+
+    Raises:
+        ValueError: 알 수 없는 처리 방식이거나, error 방식에서 중복 키가 있는 경우
+    """
+    if len(df_a.columns) < 4 or len(df_b.columns) < 4:
+        raise ValueError("CSV files must have at least 4 columns.")
+
+    if key_a is None:
+        key_a = _make_key(df_a)
+    if key_b is None:
+        key_b = _make_key(df_b)
+
+    # 중복 키는 compare_dataframes와 같은 방식으로 처리 (position 방식이면 순번이 추가된 키로 조인)
+    prepared = _prepare_duplicate_keys(key_a, key_b, duplicate_policy)
+    pos_a, pos_b = _join_on_key(prepared['key_a'], prepared['key_b'], prepared['keep'])
+
+    columns_b = set(df_b.columns)
+    languages = [column for column in df_a.columns[3:] if column in columns_b]
+
+    # 언어마다 공통 키 행의 값만 비교 - 변경 여부(1 byte/셀)만 보관
+    changed = np.zeros((len(pos_a), len(languages)), dtype=bool)
+    for i, language in enumerate(languages):
+        changed[:, i] = _values_differ(
+            df_a[language].iloc[pos_a].array,
+            df_b[language].iloc[pos_b].array
+        )
+
+    rows = np.flatnonzero(changed.any(axis=1))
+    key_columns = df_a.columns[:2].tolist()
+    matrix = pd.DataFrame({
+        key_columns[0]: df_a.iloc[pos_a[rows], 0].array,
+        key_columns[1]: df_a.iloc[pos_a[rows], 1].array
+    })
+    for i, language in enumerate(languages):
+        matrix[language] = changed[rows, i]
+    if prepared['occurrences'] is not None:
+        matrix[KEY_OCCURRENCE_COLUMN] = prepared['occurrences'][0][pos_a[rows]] + 1
+
+    return {
+        'languages': languages,
+        'matrix': matrix,
+        'counts': pd.Series(changed.sum(axis=0), index=languages, dtype=np.int64),
+        'pos_a': pos_a[rows],
+        'pos_b': pos_b[rows]
+    }
+
+def translation_cell_changes(df_a, df_b, language_result, languages=None):
+    """
+    compare_translation_columns 결과에서 변경된 셀만 Before/After 값과 함께 가져옵니다.
+
+    Args:
+        df_a, df_b: compare_translation_columns에 사용한 DataFrame
+        language_result (dict): compare_translation_columns의 결과
+        languages (list): 가져올 번역 컬럼 (없으면 모든 언어)
+
+    Returns:
+        DataFrame: ID, Name, Language, Before (File_A), After (File_B) - 변경된 셀당 한 행
+            (matrix에 KEY_OCCURRENCE_COLUMN이 있으면 함께 포함)
+    """
+    matrix = language_result['matrix']
+    key_columns = matrix.columns[:2].tolist()
+    columns = key_columns + ['Language', 'Before (File_A)', 'After (File_B)']
+    by_position = KEY_OCCURRENCE_COLUMN in matrix.columns
+    if by_position:
+        columns.append(KEY_OCCURRENCE_COLUMN)
+    frames = []
+    for language in languages or language_result['languages']:
+        rows = np.flatnonzero(matrix[language].to_numpy())
+        frame = pd.DataFrame({
+            key_columns[0]: matrix.iloc[rows, 0].array,
+            key_columns[1]: matrix.iloc[rows, 1].array,
+            'Language': language,
+            'Before (File_A)': df_a[language].iloc[language_result['pos_a'][rows]].array,
+            'After (File_B)': df_b[language].iloc[language_result['pos_b'][rows]].array
+        })
+        if by_position:
+            frame[KEY_OCCURRENCE_COLUMN] = matrix[KEY_OCCURRENCE_COLUMN].to_numpy()[rows]
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+def _splitmix64(values):
+    """
+    uint64 배열에 splitmix64 혼합 함수를 적용합니다 (MinHash 순열 대신 사용).
+    """
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+def _text_words(text):
+    """
+    HTML 태그를 제거하고 엔티티를 풀어 소문자 단어 목록으로 나눕니다 (유사 일치 비교용).
+    """
+    return _SHINGLE_PATTERN.findall(html.unescape(_HTML_TAG_PATTERN.sub(' ', text)).lower())
+
+def _minhash_signatures(word_lists):
+    """
+    단어 목록마다 연속한 MOVED_SHINGLE_WORDS개 단어(3-gram) 집합의 MinHash 서명을 계산합니다.
+
+    MINHASH_CHUNK_ROWS행씩 shingle 해시를 한 배열로 모은 뒤,
+    순열마다 np.minimum.reduceat으로 행별 최솟값을 구합니다.
+    단어가 MOVED_MIN_WORDS개 미만인 행은 서명을 만들지 않습니다.
+
+    Returns:
+        (signatures, has_tokens): (행 수, MINHASH_PERMUTATIONS) uint64 서명, 서명을 만든 행 마스크
+    """
+    signatures = np.full((len(word_lists), MINHASH_PERMUTATIONS), np.iinfo(np.uint64).max, dtype=np.uint64)
+    has_tokens = np.zeros(len(word_lists), dtype=bool)
+    seeds = _splitmix64(np.arange(MINHASH_PERMUTATIONS, dtype=np.uint64))
+
+    for start in range(0, len(word_lists), MINHASH_CHUNK_ROWS):
+        tokens = []
+        counts = np.zeros(min(MINHASH_CHUNK_ROWS, len(word_lists) - start), dtype=np.int64)
+        for i, words in enumerate(word_lists[start:start + len(counts)]):
+            if len(words) >= MOVED_MIN_WORDS:
+                shingles = {' '.join(words[j:j + MOVED_SHINGLE_WORDS])
+                            for j in range(len(words) - MOVED_SHINGLE_WORDS + 1)}
+                tokens.extend(shingles)
+                counts[i] = len(shingles)
+        if not tokens:
+            continue
+
+        token_hashes = pd.util.hash_array(np.array(tokens, dtype=object), categorize=False)
+        rows = start + np.flatnonzero(counts)
+        starts = (np.cumsum(counts) - counts)[counts > 0]
+        has_tokens[rows] = True
+        for i, seed in enumerate(seeds):
+            signatures[rows, i] = np.minimum.reduceat(_splitmix64(token_hashes ^ seed), starts)
+    return signatures, has_tokens
+
+def _lsh_candidates(signatures_a, names_a, signatures_b, names_b, threshold):
+    """
+    LSH band 버킷을 하나 이상 공유하고 Name이 같은 A/B 행 쌍 중 추정 유사도가 threshold 이상인 쌍을 찾습니다.
+
+    band마다 후보 쌍의 유사도를 바로 계산하여 통과한 쌍만 보관합니다.
+
+    Returns:
+        (rows_a, rows_b, scores): 중복 없는 쌍의 행 위치와 추정 유사도
+    """
+    band_rows = MINHASH_PERMUTATIONS // LSH_BANDS
+
+    def band_table(signatures, names, band):
+        # band의 서명 값들을 하나의 버킷 해시로 합침
+        bucket = signatures[:, band * band_rows]
+        for i in range(1, band_rows):
+            bucket = _splitmix64(bucket ^ signatures[:, band * band_rows + i])
+        table = pd.DataFrame({'name': names, 'bucket': bucket, 'row': np.arange(len(names))})
+        size = table.groupby(['name', 'bucket'])['row'].transform('size')
+        return table[size <= LSH_MAX_BUCKET_ROWS]
+
+    frames = []
+    for band in range(LSH_BANDS):
+        pairs = band_table(signatures_a, names_a, band).merge(
+            band_table(signatures_b, names_b, band), on=['name', 'bucket'], suffixes=('_a', '_b')
+        )
+        rows_a = pairs['row_a'].to_numpy()
+        rows_b = pairs['row_b'].to_numpy()
+        scores = (signatures_a[rows_a] == signatures_b[rows_b]).mean(axis=1)
+        passed = scores >= threshold
+        frames.append(pd.DataFrame({'row_a': rows_a[passed], 'row_b': rows_b[passed], 'score': scores[passed]}))
+
+    pairs = pd.concat(frames, ignore_index=True).drop_duplicates(['row_a', 'row_b'])
+    return pairs['row_a'].to_numpy(), pairs['row_b'].to_numpy(), pairs['score'].to_numpy()
+
+def _verify_similarity(words_a, words_b, rows_a, rows_b, threshold):
+    """
+    LSH 후보 쌍마다 태그를 뺀 단어 목록의 실제 유사도(difflib ratio)를 계산하여 threshold 이상인 쌍만 남깁니다.
+
+    숫자가 들어간 단어(사이즈, 모델 번호 등)는 다른 상품을 구분하는 경우가 많으므로
+    양쪽의 숫자 단어가 모두 같은 쌍만 비교합니다.
+
+    Returns:
+        (rows_a, rows_b, scores): 통과한 쌍의 행 위치와 유사도
+    """
+    def numbers(words):
+        return sorted(word for word in words if any(char.isdigit() for char in word))
+
+    scores = np.zeros(len(rows_a))
+    for i, (row_a, row_b) in enumerate(zip(rows_a, rows_b)):
+        if numbers(words_a[row_a]) != numbers(words_b[row_b]):
+            continue
+        matcher = difflib.SequenceMatcher(None, words_a[row_a], words_b[row_b], autojunk=False)
+        # 길이만으로 계산하는 상한이 threshold보다 낮으면 비교하지 않음
+        if matcher.real_quick_ratio() >= threshold and matcher.quick_ratio() >= threshold:
+            scores[i] = matcher.ratio()
+    passed = scores >= threshold
+    return rows_a[passed], rows_b[passed], scores[passed]
+
+def _greedy_pairs(rows_a, rows_b, scores):
+    """
+    유사도가 높은 후보부터 A/B 행이 한 번씩만 쓰이도록 1:1 쌍을 고릅니다.
+    """
+    chosen = []
+    used_a = set()
+    used_b = set()
+    for i in np.lexsort((rows_b, rows_a, -scores)):
+        if rows_a[i] in used_a or rows_b[i] in used_b:
+            continue
+        used_a.add(rows_a[i])
+        used_b.add(rows_b[i])
+        chosen.append(i)
+    return np.array(chosen, dtype=np.int64)
+
+def detect_moved_entries(only_in_a, only_in_b, threshold=MOVED_SIMILARITY_THRESHOLD):
+    """
+    A에만 / B에만 있는 행 중 Name이 같고 Source가 같거나 거의 같은 행을 이동(ID 변경) 항목으로 짝짓습니다.
+
+    Shopify 리소스를 다시 만들면 ID가 바뀌어 같은 항목이 삭제 + 추가로 나타납니다.
+    먼저 (Name, Source fingerprint)가 같은 행을 버킷 안에서 순서대로 짝짓습니다.
+    남은 행은 HTML 태그를 뺀 단어가 MOVED_MIN_WORDS개 이상인 행만 단어 3-gram 집합의 MinHash 서명을
+    LSH band 버킷으로 나누어 버킷을 공유하는 쌍만 후보로 삼으므로 A × B 전체를 비교하지 않습니다.
+    후보는 숫자 단어가 모두 같고 단어 목록의 difflib 유사도가 threshold 이상일 때만 유사 일치(near)로 판정합니다.
+
+    Args:
+        only_in_a (DataFrame): compare_dataframes 결과의 only_in_a
+        only_in_b (DataFrame): compare_dataframes 결과의 only_in_b
+        threshold (float): 유사 항목으로 판정하는 최소 Source 유사도 (0~1)
+
+    Returns:
+        DataFrame: ID (File_A), ID (File_B), Name, Source/Translation Before/After, Similarity, Match
+            (Similarity는 완전 일치면 1.0, 유사 일치면 태그를 뺀 단어 목록의 difflib 유사도)
+    """
+    id_column, name_column, col3_name, col4_name = only_in_a.columns[:4]
+
+    # 양쪽 Name을 같은 정수 코드로 변환
+    names = np.concatenate([
+        np.asarray(_key_values(only_in_a.iloc[:, 1]), dtype=object),
+        np.asarray(_key_values(only_in_b.iloc[:, 1]), dtype=object)
+    ])
+    name_codes = pd.factorize(names)[0]
+    names_a = name_codes[:len(only_in_a)]
+    names_b = name_codes[len(only_in_a):]
+
+    # 1. 완전 일치 - (Name, Source fingerprint, 버킷 안 순번)으로 해시 조인
+    fingerprints_a = _fingerprint(only_in_a.iloc[:, 2].array)
+    fingerprints_b = _fingerprint(only_in_b.iloc[:, 2].array)
+
+    def bucket_key(names, fingerprints):
+        frame = pd.DataFrame({'name': names, 'fingerprint': fingerprints})
+        occurrence = frame.groupby(['name', 'fingerprint']).cumcount().to_numpy()
+        return pd.MultiIndex.from_arrays([names, fingerprints, occurrence])
+
+    source_a = only_in_a.iloc[:, 2].fillna('').astype(str).to_numpy(dtype=object)
+    source_b = only_in_b.iloc[:, 2].fillna('').astype(str).to_numpy(dtype=object)
+    matched = bucket_key(names_b, fingerprints_b).get_indexer(bucket_key(names_a, fingerprints_a))
+    exact_a = np.flatnonzero(matched >= 0)
+    exact_b = matched[exact_a]
+
+    # 빈 Source는 제외하고, 해시 충돌을 배제하기 위해 실제 값을 비교
+    same = (source_a[exact_a] == source_b[exact_b]) & (source_a[exact_a] != '')
+    exact_a = exact_a[same]
+    exact_b = exact_b[same]
+
+    # 2. 유사 일치 - 남은 행만 MinHash + LSH 후보 쌍으로 비교
+    rest_a = np.setdiff1d(np.arange(len(only_in_a)), exact_a)
+    rest_b = np.setdiff1d(np.arange(len(only_in_b)), exact_b)
+    near_a = near_b = np.empty(0, dtype=np.int64)
+    near_scores = np.empty(0)
+    if len(rest_a) and len(rest_b):
+        words_a = [_text_words(text) for text in source_a[rest_a]]
+        words_b = [_text_words(text) for text in source_b[rest_b]]
+        signatures_a, tokens_a = _minhash_signatures(words_a)
+        signatures_b, tokens_b = _minhash_signatures(words_b)
+        rest_a = rest_a[tokens_a]
+        rest_b = rest_b[tokens_b]
+        signatures_a = signatures_a[tokens_a]
+        signatures_b = signatures_b[tokens_b]
+        words_a = [words for words, kept in zip(words_a, tokens_a) if kept]
+        words_b = [words for words, kept in zip(words_b, tokens_b) if kept]
+
+        rows_a, rows_b, _ = _lsh_candidates(
+            signatures_a, names_a[rest_a], signatures_b, names_b[rest_b],
+            min(threshold, MOVED_CANDIDATE_SIMILARITY)
+        )
+        rows_a, rows_b, scores = _verify_similarity(words_a, words_b, rows_a, rows_b, threshold)
+
+        chosen = _greedy_pairs(rows_a, rows_b, scores)
+        near_a = rest_a[rows_a[chosen]]
+        near_b = rest_b[rows_b[chosen]]
+        near_scores = scores[chosen]
+
+    pos_a = np.concatenate([exact_a, near_a]).astype(np.int64)
+    pos_b = np.concatenate([exact_b, near_b]).astype(np.int64)
+    similarity = np.concatenate([np.ones(len(exact_a)), near_scores])
+    match = np.array(['exact'] * len(exact_a) + ['near'] * len(near_a), dtype=object)
+
+    # A의 행 순서로 정렬
+    order = np.argsort(pos_a, kind='stable')
+    pos_a, pos_b, similarity, match = pos_a[order], pos_b[order], similarity[order], match[order]
+
+    return pd.DataFrame({
+        f'{id_column} (File_A)': only_in_a.iloc[pos_a, 0].array,
+        f'{id_column} (File_B)': only_in_b.iloc[pos_b, 0].array,
+        name_column: only_in_a.iloc[pos_a, 1].array,
+        f'{col3_name}_Before (File_A)': only_in_a.iloc[pos_a, 2].array,
+        f'{col3_name}_After (File_B)': only_in_b.iloc[pos_b, 2].array,
+        f'{col4_name}_Before (File_A)': only_in_a.iloc[pos_a, 3].array,
+        f'{col4_name}_After (File_B)': only_in_b.iloc[pos_b, 3].array,
+        'Similarity': similarity.round(3),
+        'Match': match
+    })
+
+def _share_columns(df, partition_ids, partitions):
+    """
+    처음 4개 컬럼을 파티션 순서로 정렬하여 공유 메모리의 UTF-8 버퍼로 옮깁니다.
+
+    파티션마다 컬럼 값을 '\\0'으로 이어 붙여 기록하므로 워커는 DataFrame을 pickle로 받지 않고
+    자신의 파티션 구간만 읽어서 문자열로 복원합니다. 빈 값(NaN)은 별도 마스크로 전달합니다.
+
+    Returns:
+        (order, blocks, sides)
+        order: 파티션 정렬 후 각 행의 원래 위치
+        blocks: 생성한 SharedMemory 목록 (호출한 쪽에서 해제)
+        sides: 파티션별 워커 작업 정보
+    """
+    partition_ids = partition_ids.astype(np.intp)
+    order = np.argsort(partition_ids, kind='stable')
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(partition_ids, minlength=partitions))])
+
+    blocks = []
+    nulls = np.empty((4, len(df)), dtype=bool)
+    parts = []
+    spans = [[] for _ in range(partitions)]
+    offset = 0
+    for column in range(4):
+        values = df.iloc[order, column]
+        nulls[column] = values.isna().to_numpy()
+        if not pd.api.types.is_string_dtype(values):
+            values = values.astype(str).where(~nulls[column])
+        text = values.to_numpy(dtype=object, na_value='')
+        for partition in range(partitions):
+            rows = text[bounds[partition]:bounds[partition + 1]]
+            joined = '\0'.join(rows)
+            if joined.count('\0') > max(0, len(rows) - 1):
+                # 구분자가 값에 포함되어 있으면 병렬 비교를 사용할 수 없음
+                raise ValueError("Values containing NUL characters cannot be compared in parallel.")
+            encoded = joined.encode('utf-8')
+            parts.append(encoded)
+            spans[partition].append((offset, len(encoded)))
+            offset += len(encoded)
+
+    text_block = shared_memory.SharedMemory(create=True, size=max(1, offset))
+    blocks.append(text_block)
+    position = 0
+    for encoded in parts:
+        text_block.buf[position:position + len(encoded)] = encoded
+        position += len(encoded)
+
+    null_block = shared_memory.SharedMemory(create=True, size=max(1, nulls.nbytes))
+    blocks.append(null_block)
+    np.ndarray(nulls.shape, dtype=bool, buffer=null_block.buf)[:] = nulls
+
+    sides = [{
+        'text': text_block.name,
+        'nulls': null_block.name,
+        'total_rows': len(df),
+        'rows': (int(bounds[partition]), int(bounds[partition + 1])),
+        'spans': spans[partition]
+    } for partition in range(partitions)]
+    return order, blocks, sides
+
+def _read_shared_partition(side):
+    """
+    공유 메모리에서 한 파티션의 4개 컬럼을 읽어 object 배열로 복원합니다.
+
+    Returns:
+        (columns, nulls): 컬럼별 값 배열 (빈 값은 '')과 빈 값 마스크
+    """
+    text_block = shared_memory.SharedMemory(name=side['text'])
+    null_block = shared_memory.SharedMemory(name=side['nulls'])
+    try:
+        start, end = side['rows']
+        view = np.ndarray((4, side['total_rows']), dtype=bool, buffer=null_block.buf)
+        nulls = view[:, start:end].copy()
+        del view
+
+        columns = []
+        for column, (offset, length) in enumerate(side['spans']):
+            if end == start:
+                values = np.empty(0, dtype=object)
+            else:
+                text = bytes(text_block.buf[offset:offset + length]).decode('utf-8')
+                values = np.array(text.split('\0'), dtype=object)
+            columns.append(values)
+    finally:
+        text_block.close()
+        null_block.close()
+    return columns, nulls
+
+def _compare_partition(task):
+    """
+    프로세스 풀 워커: 한 파티션의 A/B를 비교하여 파티션 내 행 위치로 결과를 반환합니다.
+    """
+    (id_a, name_a, col3_a, col4_a), nulls_a = _read_shared_partition(task['a'])
+    (id_b, name_b, col3_b, col4_b), nulls_b = _read_shared_partition(task['b'])
+
+    # 빈 키 값은 _make_key와 동일하게 빈 문자열로 처리
+    key_a = pd.MultiIndex.from_arrays([id_a, name_a])
+    key_b = pd.MultiIndex.from_arrays([id_b, name_b])
+
+    # 같은 키는 항상 같은 파티션에 있으므로 파티션 안에서 중복 키를 처리 (error는 호출한 쪽에서 판단)
+    policy = task['duplicate_policy']
+    prepared = _prepare_duplicate_keys(key_a, key_b, 'first' if policy == 'error' else policy)
+    key_a = prepared['key_a']
+    key_b = prepared['key_b']
+    pos_a, pos_b = _join_on_key(key_a, key_b, prepared['keep'])
+
+    # 빈 값(NaN)은 _values_differ에서 빈 값끼리 같은 값으로 처리되도록 None으로 복원
+    for values, nulls in ((col3_a, nulls_a[2]), (col4_a, nulls_a[3]),
+                          (col3_b, nulls_b[2]), (col4_b, nulls_b[3])):
+        values[nulls] = None
+
+    return {
+        'only_in_a': np.flatnonzero(~key_a.isin(key_b)),
+        'only_in_b': np.flatnonzero(~key_b.isin(key_a)),
+        'pos_a': pos_a,
+        'pos_b': pos_b,
+        'col3_diff': _values_differ(col3_a[pos_a], col3_b[pos_b]),
+        'col4_diff': _values_differ(col4_a[pos_a], col4_b[pos_b]),
+        'duplicated_a': np.flatnonzero(prepared['duplicated_a']),
+        'duplicated_b': np.flatnonzero(prepared['duplicated_b']),
+        'occurrences': prepared['occurrences']
+    }
+
+def compare_dataframes_parallel(df_a, df_b, workers=None, partitions=None, duplicate_policy='first',
+                                progress=None):
+    """
+    키 해시로 A와 B를 파티션으로 나누어 프로세스 풀에서 병렬로 비교합니다.
+
+    워커에는 DataFrame 대신 공유 메모리의 컬럼 버퍼를 전달하고, 워커가 반환한 행 위치를
+    모아 compare_dataframes와 동일한 결과 dict(같은 행 순서)를 구성합니다.
+
+    Args:
+        df_a (DataFrame): Live/Current CSV 데이터 (A.csv)
+        df_b (DataFrame): Modified CSV 데이터 (B.csv)
+        workers (int): 워커 프로세스 수 (없으면 CPU 코어 수)
+        partitions (int): 파티션 수 (없으면 워커 수 x PARALLEL_PARTITIONS_PER_WORKER)
+        duplicate_policy (str): 중복 키 처리 방식 (compare_dataframes와 동일)
+        progress: 단계(COMPARE_PHASES)가 시작될 때마다 progress(phase, rows)로 호출할 함수
+            (BackgroundJobs, PerformanceRecorder)
+
+    Returns:
+        dict: only_in_a, only_in_b, col3_changes, col4_changes, both_changes, duplicates
+    """
+    if len(df_a.columns) < 4 or len(df_b.columns) < 4:
+        raise ValueError("CSV files must have at least 4 columns.")
+    if duplicate_policy not in DUPLICATE_POLICIES:
+        raise ValueError(f"Unknown duplicate key policy: {duplicate_policy}")
+
+    workers = workers or os.cpu_count() or 1
+    partitions = partitions or workers * PARALLEL_PARTITIONS_PER_WORKER
+
+    # 키 해시로 파티션을 나누고 공유 메모리로 옮김 - 조인과 분류는 워커에서 실행
+    _report_phase(progress, 'key build', len(df_a) + len(df_b))
+    blocks = []
+    try:
+        order_a, blocks_a, sides_a = _share_columns(df_a, _partition_ids(df_a, partitions), partitions)
+        blocks += blocks_a
+        order_b, blocks_b, sides_b = _share_columns(df_b, _partition_ids(df_b, partitions), partitions)
+        blocks += blocks_b
+
+        # spawn: Streamlit처럼 스레드를 사용하는 프로세스에서도 안전하게 워커 생성
+        tasks = [{'a': side_a, 'b': side_b, 'duplicate_policy': duplicate_policy}
+                 for side_a, side_b in zip(sides_a, sides_b)]
+        _report_phase(progress, 'join', len(df_a) + len(df_b))
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            partial_results = list(pool.map(_compare_partition, tasks))
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    # 파티션 내 위치를 원래 행 위치로 변환
+    _report_phase(progress, 'classify', len(df_a) + len(df_b))
+    only_a_mask = np.zeros(len(df_a), dtype=bool)
+    only_b_mask = np.zeros(len(df_b), dtype=bool)
+    duplicated_a = np.zeros(len(df_a), dtype=bool)
+    duplicated_b = np.zeros(len(df_b), dtype=bool)
+    occurrences = None
+    if duplicate_policy == 'position':
+        occurrences = (np.zeros(len(df_a), dtype=np.intp), np.zeros(len(df_b), dtype=np.intp))
+    joined = {'pos_a': [], 'pos_b': [], 'col3_diff': [], 'col4_diff': []}
+    for side_a, side_b, partial in zip(sides_a, sides_b, partial_results):
+        start_a, end_a = side_a['rows']
+        start_b, end_b = side_b['rows']
+        only_a_mask[order_a[start_a + partial['only_in_a']]] = True
+        only_b_mask[order_b[start_b + partial['only_in_b']]] = True
+        duplicated_a[order_a[start_a + partial['duplicated_a']]] = True
+        duplicated_b[order_b[start_b + partial['duplicated_b']]] = True
+        if occurrences is not None:
+            # 파티션 안의 행은 원래 순서를 유지하므로 파티션 내 순번이 전체 순번과 같음
+            occurrences[0][order_a[start_a:end_a]] = partial['occurrences'][0]
+            occurrences[1][order_b[start_b:end_b]] = partial['occurrences'][1]
+        joined['pos_a'].append(order_a[start_a + partial['pos_a']])
+        joined['pos_b'].append(order_b[start_b + partial['pos_b']])
+        joined['col3_diff'].append(partial['col3_diff'])
+        joined['col4_diff'].append(partial['col4_diff'])
+
+    # 공통 키를 A의 행 순서로 정렬 (compare_dataframes와 동일한 순서)
+    joined = {name: np.concatenate(parts) for name, parts in joined.items()}
+    ordered = np.argsort(joined['pos_a'], kind='stable')
+
+    if duplicate_policy == 'error' and (duplicated_a.any() or duplicated_b.any()):
+        raise ValueError(f"Duplicate ID + Name keys found ({duplicated_a.sum()} rows in File A, "
+                         f"{duplicated_b.sum()} rows in File B).")
+
+    result = _build_result(
+        df_a, df_b, only_a_mask, only_b_mask,
+        joined['pos_a'][ordered], joined['pos_b'][ordered],
+        joined['col3_diff'][ordered].astype(bool), joined['col4_diff'][ordered].astype(bool),
+        occurrences
+    )
+    result['duplicates'] = duplicate_key_report(df_a, df_b, duplicated_a, duplicated_b)
+    return result
+
+def _rewind(source):
+    """
+    파일 객체이면 처음 위치로 되돌리고 그대로 반환합니다 (경로는 그대로 반환).
+    """
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return source
+
+def _source_size(source):
+    """
+    CSV 경로 또는 파일 객체의 크기(bytes)를 반환합니다.
+    """
+    if hasattr(source, 'seek'):
+        source.seek(0, os.SEEK_END)
+        size = source.tell()
+        source.seek(0)
+        return size
+    return os.path.getsize(source)
+
+def _read_sample(source, sample_size):
+    """
+    CSV 경로 또는 파일 객체의 앞부분 sample_size bytes를 읽습니다.
+    """
+    if hasattr(source, 'read'):
+        sample = _rewind(source).read(sample_size)
+        _rewind(source)
+    else:
+        with open(source, 'rb') as f:
+            sample = f.read(sample_size)
+    if isinstance(sample, str):
+        sample = sample.encode('utf-8')
+    return sample
+
+def _estimate_row_bytes(source, sample_size=1024 * 1024):
+    """
+    파일 앞부분을 샘플링하여 한 행의 평균 크기(bytes)를 추정합니다.
+    """
+    sample = _read_sample(source, sample_size)
+    return max(1, len(sample) // max(1, sample.count(b'\n')))
+
+def detect_encoding(source):
+    """
+    파일 앞부분으로 CSV 인코딩을 감지합니다.
+
+    BOM이 있으면 BOM으로 판단하고(UTF-8 BOM, UTF-16), 없으면 0 바이트 비율로 UTF-16을,
+    그 외에는 UTF-8 → CP949 순서로 디코딩을 시도합니다.
+
+    Args:
+        source: CSV 경로 또는 파일 객체
+
+    Returns:
+        str: 'utf-8', 'utf-8-sig', 'utf-16', 'utf-16-le', 'utf-16-be', 'cp949' 중 하나
+    """
+    sample = _read_sample(source, ENCODING_SAMPLE_BYTES)
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+
+    # BOM 없는 UTF-16 - ASCII 문자마다 0 바이트가 섞여 있음
+    if sample[1::2].count(0) > len(sample) // 4:
+        return 'utf-16-le'
+    if sample[0::2].count(0) > len(sample) // 4:
+        return 'utf-16-be'
+
+    for encoding in ('utf-8', 'cp949'):
+        try:
+            # final=False - 샘플 끝에서 잘린 멀티바이트 문자는 오류로 보지 않음
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("Unsupported file encoding. Please save the CSV as UTF-8 or CP949.")
+
+def _partition_ids(chunk, partitions):
+    """
+    ID + Name의 64비트 해시로 각 행의 파티션 번호를 계산합니다.
+
+    A와 B에서 같은 키는 항상 같은 파티션에 들어갑니다.
+    """
+    keys = pd.DataFrame({
+        i: chunk.iloc[:, i].fillna('').astype(str).to_numpy(dtype=object) for i in range(2)
+    })
+    hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+    return hashes % np.uint64(partitions)
+
+def _spill_partitions(source, spill_dir, prefix, partitions, chunksize):
+    """
+    CSV를 청크 단위로 읽어 키 해시 기준 파티션 파일로 나누어 저장합니다.
+
+    Returns:
+        list: 파티션별 spill 파일 경로
+    """
+    paths = [os.path.join(spill_dir, f'{prefix}_{i}.csv') for i in range(partitions)]
+    handles = [open(path, 'w', encoding='utf-8', newline='') for path in paths]
+    try:
+        # 빈 파티션도 컬럼 정보를 갖도록 헤더는 모든 파일에 기록
+        encoding = detect_encoding(source)
+        header = pd.read_csv(_rewind(source), dtype=str, nrows=0, encoding=encoding)
+        if len(header.columns) < 4:
+            raise ValueError("CSV files must have at least 4 columns.")
+        for handle in handles:
+            header.to_csv(handle, index=False)
+
+        for chunk in pd.read_csv(_rewind(source), dtype=str, chunksize=chunksize, encoding=encoding):
+            # 청크 안의 행 순서를 유지한 채 파티션별로 추가
+            partition_ids = _partition_ids(chunk, partitions)
+            for partition, rows in chunk.groupby(partition_ids, sort=False):
+                rows.to_csv(handles[int(partition)], index=False, header=False)
+    finally:
+        for handle in handles:
+            handle.close()
+    return paths
+
+def compare_csv_streaming(file_a, file_b, output_dir, memory_limit_mb=STREAMING_MEMORY_LIMIT_MB,
+                          chunksize=None, duplicate_policy='first'):
+    """
+    메모리보다 큰 CSV를 비교하기 위한 스트리밍 비교 모드입니다.
+
+    두 CSV를 청크 단위로 읽어 키 해시 기준으로 디스크의 파티션 파일에 나누어 저장한 뒤,
+    파티션마다 compare_dataframes를 실행하고 5개 카테고리 결과를 CSV로 이어서 기록합니다.
+    파티션 수는 한 파티션의 A + B가 memory_limit_mb 안에 들어가도록 정해집니다.
+    결과 행은 A의 전체 순서가 아니라 파티션 순서로 기록됩니다.
+
+    Args:
+        file_a: Live/Current CSV 경로 또는 파일 객체 (A.csv)
+        file_b: Modified CSV 경로 또는 파일 객체 (B.csv)
+        output_dir (str): 카테고리별 결과 CSV를 저장할 폴더
+        memory_limit_mb (int): 한 번에 메모리에 올릴 데이터의 최대 크기 (MB)
+        chunksize (int): 청크당 행 수 (없으면 memory_limit_mb에 맞춰 계산)
+        duplicate_policy (str): 중복 키 처리 방식 (compare_dataframes와 동일)
+
+    Returns:
+        dict: 카테고리별 + duplicates의 {'path': 결과 CSV 경로, 'count': 행 수}
+            (duplicates에는 파티션 안의 위치만 알 수 있으므로 Row 컬럼이 없음)
+    """
+    limit_bytes = memory_limit_mb * 1024 * 1024
+    total_bytes = _source_size(file_a) + _source_size(file_b)
+    partitions = max(1, math.ceil(total_bytes * STREAMING_MEMORY_FACTOR / limit_bytes))
+
+    if chunksize is None:
+        row_bytes = max(_estimate_row_bytes(file_a), _estimate_row_bytes(file_b))
+        chunksize = max(1000, int(limit_bytes / (STREAMING_MEMORY_FACTOR * row_bytes) / 2))
+
+    os.makedirs(output_dir, exist_ok=True)
+    result = {
+        name: {'path': os.path.join(output_dir, f'{name}.csv'), 'count': 0}
+        for name in RESULT_CATEGORIES + ['duplicates']
+    }
+
+    with tempfile.TemporaryDirectory(dir=output_dir) as spill_dir:
+        # 1. 키 해시 기준으로 A, B를 파티션 파일로 분할
+        parts_a = _spill_partitions(file_a, spill_dir, 'a', partitions, chunksize)
+        parts_b = _spill_partitions(file_b, spill_dir, 'b', partitions, chunksize)
+
+        # 2. 파티션별로 비교하고 결과를 카테고리 파일에 이어서 기록
+        handles = {
+            name: open(info['path'], 'w', encoding='utf-8', newline='')
+            for name, info in result.items()
+        }
+        try:
+            for i, (part_a, part_b) in enumerate(zip(parts_a, parts_b)):
+                partition_result = compare_dataframes(
+                    pd.read_csv(part_a, dtype=str),
+                    pd.read_csv(part_b, dtype=str),
+                    duplicate_policy=duplicate_policy
+                )
+                partition_result['duplicates'] = partition_result['duplicates'].drop(columns='Row')
+                for name, frame in partition_result.items():
+                    frame.to_csv(handles[name], index=False, header=(i == 0))
+                    result[name]['count'] += len(frame)
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+    return result
+
+def diff_segments(before, after, granularity='word'):
+    """
+    두 문자열의 단어 또는 글자 단위 차이를 계산합니다.
+
+    단어 단위에서는 HTML 태그 하나를 하나의 토큰으로 취급합니다.
+    글자 단위 토큰이 DIFF_MAX_TOKENS를 넘으면 단어 단위로 비교합니다.
+
+    Args:
+        before (str): 변경 전 값 (빈 값은 '')
+        after (str): 변경 후 값 (빈 값은 '')
+        granularity (str): 'word' 또는 'char'
+
+    Returns:
+        list: (op, text) 목록 - op는 'equal', 'delete', 'insert'
+    """
+    if granularity == 'char' and max(len(before), len(after)) <= DIFF_MAX_TOKENS:
+        tokens_a, tokens_b = list(before), list(after)
+    else:
+        tokens_a = _DIFF_TOKEN_PATTERN.findall(before)
+        tokens_b = _DIFF_TOKEN_PATTERN.findall(after)
+
+    segments = []
+    matcher = difflib.SequenceMatcher(None, tokens_a, tokens_b, autojunk=False)
+    for op, a_start, a_end, b_start, b_end in matcher.get_opcodes():
+        if op in ('equal', 'delete', 'replace'):
+            segments.append(('equal' if op == 'equal' else 'delete', ''.join(tokens_a[a_start:a_end])))
+        if op in ('insert', 'replace'):
+            segments.append(('insert', ''.join(tokens_b[b_start:b_end])))
+    return segments
+
+def diff_to_html(segments):
+    """
+    diff_segments 결과를 삭제는 <del>, 추가는 <ins>로 표시한 HTML로 변환합니다 (값은 escape).
+    """
+    tags = {'delete': 'del', 'insert': 'ins'}
+    parts = []
+    for op, text in segments:
+        text = html.escape(text)
+        parts.append(f'<{tags[op]}>{text}</{tags[op]}>' if op in tags else text)
+    return ''.join(parts)
+
+def _diff_task(task):
+    """
+    워커 프로세스에서 실행되는 diff 작업입니다. (before, after, granularity) → HTML
+    """
+    before, after, granularity = task
+    return diff_to_html(diff_segments(before, after, granularity))
+
+def compute_diffs(pairs, granularity='word', cache=None, executor=None):
+    """
+    (before, after) 값 쌍의 inline diff HTML을 계산합니다.
+
+    화면에 표시되거나 선택된 행에 대해서만 호출하도록 만든 함수로,
+    cache에 있는 결과는 재사용하고 나머지만 executor(워커 풀)에서 계산합니다.
+
+    Args:
+        pairs (list): (before, after) 목록 - 빈 값(NaN/NA)은 ''로 취급
+        granularity (str): 'word' 또는 'char'
+        cache (SizedLRUCache): diff 결과 캐시 (없으면 캐시하지 않음)
+        executor (Executor): diff 계산용 워커 풀 (없으면 현재 프로세스에서 계산)
+
+    Returns:
+        list: pairs 순서와 같은 HTML 문자열 목록
+    """
+    tasks = [('' if pd.isna(before) else str(before), '' if pd.isna(after) else str(after), granularity)
+             for before, after in pairs]
+
+    # 같은 값 쌍은 한 번만 계산
+    computed = {}
+    for task in tasks:
+        if task not in computed:
+            computed[task] = cache.get(task) if cache is not None else None
+
+    missing = [task for task, value in computed.items() if value is None]
+    if missing:
+        if executor is None:
+            values = map(_diff_task, missing)
+        else:
+            values = executor.map(_diff_task, missing)
+        for task, value in zip(missing, values):
+            computed[task] = value
+            if cache is not None:
+                cache.put(task, value, len(task[0]) + len(task[1]) + len(value))
+    return [computed[task] for task in tasks]
+
+def _truncate(values, max_length):
+    """
+    문자열 컬럼 전체를 max_length 글자로 자르고, 잘린 값에는 '...'을 붙입니다.
+    """
+    text = values.astype(object).where(values.notna(), '').astype(str)
+    truncated = text.str.slice(0, max_length)
+    return truncated.where(text.str.len() <= max_length, truncated + '...')
+
+def add_change_summary(changes, summary_column, icon, max_length):
+    """
+    변경 사항 DataFrame에 Before → After 요약 컬럼을 추가합니다.
+
+    행 단위 반복 없이 컬럼 단위 문자열 연산으로 요약을 만듭니다.
+
+    Args:
+        changes (DataFrame): col3_changes / col4_changes 등 비교 결과
+        summary_column (str): 추가할 요약 컬럼 이름
+        icon (str): 각 항목 앞에 붙일 아이콘
+        max_length (int): Before/After 값을 표시할 최대 글자 수
+
+    Returns:
+        DataFrame: 요약 컬럼이 추가된 복사본
+    """
+    display_df = changes.copy()
+    before_cols = [col for col in display_df.columns if '_Before (File_A)' in col]
+
+    details = []
+    for before_col in before_cols:
+        after_col = before_col.replace('_Before (File_A)', '_After (File_B)')
+        if after_col in display_df.columns:
+            field_name = before_col.replace('_Before (File_A)', '')
+            details.append(
+                f"{icon} {field_name}: '" + _truncate(display_df[before_col], max_length)
+                + "' → '" + _truncate(display_df[after_col], max_length) + "'"
+            )
+
+    if details:
+        summary = details[0]
+        for detail in details[1:]:
+            summary = summary + " | " + detail
+        display_df[summary_column] = summary
+
+    return display_df
+
+def filter_sort_positions(frame, search=None, search_column=None, sort_column=None, ascending=True):
+    """
+    결과 표의 검색/정렬을 서버에서 처리하고, 표시할 행의 위치를 반환합니다.
+
+    브라우저에는 반환된 위치 중 현재 페이지에 해당하는 행만 보내면 됩니다.
+
+    Args:
+        frame (DataFrame): 비교 결과 카테고리 DataFrame
+        search (str): 포함 여부를 검사할 문자열 (대소문자 무시, 없으면 전체 행)
+        search_column (str): 검색할 컬럼 (없으면 모든 컬럼)
+        sort_column (str): 정렬할 컬럼 (없으면 원래 순서)
+        ascending (bool): 오름차순 여부 (빈 값은 항상 마지막)
+
+    Returns:
+        ndarray: 검색/정렬 결과 행 위치
+    """
+    positions = np.arange(len(frame))
+
+    if search:
+        match = np.zeros(len(frame), dtype=bool)
+        for column in ([search_column] if search_column else frame.columns):
+            values = frame[column]
+            if not (pd.api.types.is_string_dtype(values) or isinstance(values.dtype, pd.CategoricalDtype)):
+                values = values.astype(str)
+            match |= values.str.contains(search, case=False, regex=False, na=False).to_numpy(dtype=bool)
+        positions = positions[match]
+
+    if sort_column:
+        values = frame[sort_column].iloc[positions].reset_index(drop=True)
+        order = values.sort_values(ascending=ascending, kind='stable', na_position='last').index
+        positions = positions[order.to_numpy()]
+
+    return positions
+
+def build_excel_workbook(sheets, progress=None):
+    """
+    여러 DataFrame을 하나의 Excel 파일로 생성합니다.
+
+    openpyxl의 write-only 모드로 행을 순서대로 기록하므로
+    셀 객체 전체를 메모리에 유지하지 않습니다.
+
+    Args:
+        sheets (list): (시트 이름, DataFrame) 목록
+        progress: 시트마다, 그리고 파일 저장 전에 progress(phase, rows)로 호출할 함수 (PerformanceRecorder)
+
+    Returns:
+        bytes: xlsx 파일 내용
+    """
+    # openpyxl은 로딩 비용이 크므로 Excel 출력이 필요할 때만 import
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for sheet_name, frame in sheets:
+        _report_phase(progress, f'sheet {sheet_name}', len(frame))
+        sheet = workbook.create_sheet(title=sheet_name)
+        sheet.append([str(column) for column in frame.columns])
+
+        # 빈 값(NaN)은 빈 셀로 기록
+        for start in range(0, len(frame), EXCEL_CHUNK_ROWS):
+            block = frame.iloc[start:start + EXCEL_CHUNK_ROWS].astype(object)
+            block = block.where(block.notna(), None)
+            for row in block.itertuples(index=False, name=None):
+                sheet.append(row)
+
+    _report_phase(progress, 'save xlsx')
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+def _write_csv_chunks(frame, handle):
+    """
+    DataFrame을 CSV_CHUNK_ROWS행씩 나누어 바이너리 파일 객체에 UTF-8 CSV로 기록합니다.
+
+    전체 CSV 문자열을 한 번에 만들지 않으므로 직렬화 중 메모리 사용량이 청크 크기로 제한됩니다.
+    """
+    frame.iloc[:0].to_csv(handle, index=False, encoding='utf-8')
+    for start in range(0, len(frame), CSV_CHUNK_ROWS):
+        frame.iloc[start:start + CSV_CHUNK_ROWS].to_csv(handle, index=False, header=False, encoding='utf-8')
+
+def build_csv(frame, progress=None):
+    """
+    DataFrame을 청크 단위로 직렬화하여 CSV 파일 내용을 생성합니다.
+
+    Args:
+        frame (DataFrame): 비교 결과 카테고리 또는 병합 결과
+        progress: 시작할 때 progress(phase, rows)로 호출할 함수 (PerformanceRecorder)
+
+    Returns:
+        bytes: UTF-8 CSV 파일 내용
+    """
+    _report_phase(progress, 'csv', len(frame))
+    buffer = io.BytesIO()
+    _write_csv_chunks(frame, buffer)
+    return buffer.getvalue()
+
+def build_delta_csv(delta, progress=None):
+    """
+    create_delta의 결과를 gzip으로 압축한 CSV 파일 내용을 생성합니다 (apply_delta로 바로 읽을 수 있음).
+
+    Args:
+        delta (DataFrame): create_delta의 결과
+        progress: 시작할 때 progress(phase, rows)로 호출할 함수 (PerformanceRecorder)
+
+    Returns:
+        bytes: gzip 파일 내용
+    """
+    _report_phase(progress, 'delta csv', len(delta))
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=ZIP_COMPRESS_LEVEL, mtime=0) as handle:
+        _write_csv_chunks(delta, handle)
+    return buffer.getvalue()
+
+def build_zip_archive(files, progress=None):
+    """
+    여러 DataFrame을 CSV 파일로 묶은 ZIP 압축 파일을 생성합니다.
+
+    각 CSV는 청크 단위로 바로 압축 스트림에 기록하므로, 압축되지 않은 CSV 전체를 메모리에 만들지 않습니다.
+
+    Args:
+        files (list): (파일 이름, DataFrame) 목록
+        progress: 파일마다 progress(phase, rows)로 호출할 함수 (PerformanceRecorder)
+
+    Returns:
+        bytes: zip 파일 내용
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED,
+                         compresslevel=ZIP_COMPRESS_LEVEL) as archive:
+        for file_name, frame in files:
+            _report_phase(progress, file_name, len(frame))
+            with archive.open(file_name, 'w', force_zip64=True) as handle:
+                _write_csv_chunks(frame, handle)
+    return buffer.getvalue()
+
+def build_excel_report(result, progress=None):
+    """
+    비교 결과로 요약 시트와 카테고리별 시트를 포함한 Excel 리포트를 생성합니다.
+
+    Args:
+        result (dict): compare_dataframes의 결과 (moved, duplicates가 있으면 함께 기록)
+        progress: 시트마다 progress(phase, rows)로 호출할 함수 (PerformanceRecorder)
+
+    Returns:
+        bytes: xlsx 파일 내용
+    """
+    # 요약 시트
+    total_modified = len(result['col3_changes']) + len(result['col4_changes']) + len(result['both_changes'])
+    summary_df = pd.DataFrame({
+        'Category': [
+            '1. Records only in A (deleted)',
+            '2. Records only in B (added)',
+            '3-1. Source/Column3 changed only',
+            '3-2. Data/Column4 changed only',
+            '3-3. Both columns changed',
+            'Total modified records'
+        ],
+        'Count': [
+            len(result['only_in_a']),
+            len(result['only_in_b']),
+            len(result['col3_changes']),
+            len(result['col4_changes']),
+            len(result['both_changes']),
+            total_modified
+        ]
+    })
+
+    # 이동 항목/중복 키 보고가 있는 경우에만 요약과 시트에 추가
+    moved = result.get('moved')
+    if moved is not None:
+        summary_df.loc[len(summary_df)] = ['4. Moved (ID changed)', len(moved)]
+    duplicates = result.get('duplicates')
+    if duplicates is not None:
+        summary_df.loc[len(summary_df)] = ['5. Rows with duplicate ID + Name keys', len(duplicates)]
+    sheets = [('0_Summary', summary_df)]
+
+    # 각 분석 결과를 별도 시트에 저장 (비어 있는 카테고리는 제외)
+    sheet_names = {
+        'only_in_a': '1_Only_in_A_Deleted',
+        'only_in_b': '2_Only_in_B_Added',
+        'col3_changes': '3-1_Source_Changes',
+        'col4_changes': '3-2_Data_Changes',
+        'both_changes': '3-3_Both_Changed'
+    }
+    for name in RESULT_CATEGORIES:
+        if not result[name].empty:
+            sheets.append((sheet_names[name], result[name]))
+    if moved is not None and not moved.empty:
+        sheets.append(('4_Moved', moved))
+    if duplicates is not None and not duplicates.empty:
+        sheets.append(('5_Duplicate_Keys', duplicates))
+
+    return build_excel_workbook(sheets, progress)
+
+def _content_hash(source):
+    """
+    업로드된 파일 내용의 SHA-1 해시를 반환합니다.
+    """
+    digest = hashlib.sha1()
+    if hasattr(source, 'getbuffer'):
+        digest.update(source.getbuffer())
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    else:
+        _rewind(source)
+        for block in iter(lambda: source.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _compact_frame(df):
+    """
+    모든 컬럼을 Arrow 기반 문자열로 바꾸고, 반복이 많은 Name 컬럼은 category로 사전 인코딩합니다.
+    """
+    df = df.astype(COMPACT_STRING_DTYPE)
+    df.isetitem(1, df.iloc[:, 1].astype('category'))
+    return df
+
+def _read_csv_arrow(source, encoding, compact, project):
+    """
+    pyarrow의 멀티스레드 CSV 리더로 모든 컬럼을 문자열로 읽습니다.
+
+    헤더는 pandas로 먼저 읽어 컬럼 이름(중복 이름 처리 포함)을 read_csv와 동일하게 맞추고,
+    따옴표 안의 줄바꿈(HTML 값)을 허용합니다.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    sample = _read_sample(source, ENCODING_SAMPLE_BYTES)
+    text = codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+    columns = pd.read_csv(io.StringIO(text), dtype=str, nrows=0).columns.tolist()
+    if len(columns) < 4:
+        raise ValueError("CSV files must have at least 4 columns.")
+
+    # pyarrow는 UTF-8 BOM을 직접 건너뛰며, UTF-8 이외의 인코딩은 읽으면서 변환함
+    table = pa_csv.read_csv(
+        _rewind(source),
+        read_options=pa_csv.ReadOptions(
+            encoding='utf-8' if encoding == 'utf-8-sig' else encoding,
+            column_names=columns, skip_rows=1, use_threads=True
+        ),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in columns},
+            include_columns=columns[:4] if project else None,
+            null_values=CSV_NA_VALUES, strings_can_be_null=True
+        )
+    )
+    if compact:
+        return table.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+    return table.to_pandas()
+
+def read_export(source, compact=False, project=False):
+    """
+    Langify export CSV를 인코딩을 감지하여 읽고 파싱 처리량을 측정합니다.
+
+    pyarrow가 설치되어 있으면 멀티스레드 CSV 리더를 사용하고, 없으면 pandas 리더를 사용합니다.
+
+    Args:
+        source: CSV 경로 또는 파일 객체
+        compact (bool): Arrow 문자열 + category Name 컬럼으로 읽기 (메모리 절약 모드)
+        project (bool): 비교에 필요한 처음 4개 컬럼(ID, Name, Source, Translation)만 읽기
+
+    Returns:
+        (df, ingest): DataFrame과 파싱 정보 dict (encoding, engine, bytes, seconds, mb_per_s)
+    """
+    size = _source_size(source)
+    encoding = detect_encoding(source)
+
+    start = time.perf_counter()
+    try:
+        df = _read_csv_arrow(source, encoding, compact, project)
+        engine = 'pyarrow'
+    except ImportError:
+        df = pd.read_csv(
+            _rewind(source), dtype=COMPACT_STRING_DTYPE if compact else str, encoding=encoding,
+            usecols=range(4) if project else None
+        )
+        engine = 'c'
+    if len(df.columns) < 4:
+        raise ValueError("CSV files must have at least 4 columns.")
+    if compact:
+        df = _compact_frame(df)
+    seconds = time.perf_counter() - start
+
+    ingest = {
+        'encoding': encoding,
+        'engine': engine,
+        'bytes': size,
+        'seconds': seconds,
+        'mb_per_s': size / 1024 / 1024 / seconds if seconds > 0 else None
+    }
+    return df, ingest
+
+def load_export(source, cache=None, compact=False, project=False, progress=None):
+    """
+    Langify export CSV를 읽고 비교용 키와 Source/Translation fingerprint를 함께 생성합니다.
+
+    cache가 주어지면 파일 내용의 해시로 파싱 결과를 캐시하여,
+    같은 파일에 대해서는 다시 파싱하지 않고 DataFrame, 키, fingerprint를 재사용합니다.
+    캐시된 DataFrame은 여러 rerun에서 공유되므로 수정하면 안 됩니다.
+
+    compact=True이면 셀마다 Python 문자열을 만들지 않고 Arrow 문자열 버퍼에 저장하며,
+    Name 컬럼은 category(사전 인코딩)로 저장합니다. 비교/병합/내보내기는 이 dtype을 그대로 유지합니다.
+
+    Args:
+        source: CSV 경로 또는 파일 객체
+        cache (SizedLRUCache): 파싱 캐시 (없으면 캐시하지 않음)
+        compact (bool): 메모리 절약 모드 (pyarrow 필요)
+        project (bool): 처음 4개 컬럼만 읽기 (병합 파일에 나머지 컬럼이 필요 없을 때)
+        progress: 단계(LOAD_PHASES)가 시작될 때마다 progress(phase, rows)로 호출할 함수
+            (PerformanceRecorder, 캐시 적중 시에는 호출하지 않음)
+
+    Returns:
+        (df, key, fingerprints, ingest, cache_hit) - ingest는 read_export의 파싱 정보와
+            content_hash (파일 내용 해시, cache가 없으면 None)
+    """
+    cache_key = (_content_hash(source), compact, project) if cache is not None else None
+    if cache_key is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached + (True,)
+
+    _report_phase(progress, 'read')
+    df, ingest = read_export(source, compact, project)
+    ingest['content_hash'] = cache_key[0] if cache_key is not None else None
+    _report_phase(progress, 'key build', len(df))
+    key = _make_key(df)
+    _report_phase(progress, 'fingerprint', len(df))
+    fingerprints = _row_fingerprints(df)
+
+    if cache_key is not None:
+        size = int(df.memory_usage(deep=True).sum()) + key.nbytes + fingerprints.nbytes
+        cache.put(cache_key, (df, key, fingerprints, ingest), size)
+    return df, key, fingerprints, ingest, False
+
+def save_snapshot(df, store_dir, name=None, fingerprints=None):
+    """
+    export를 스냅샷 저장소에 Parquet 파일로 저장합니다.
+
+    원본 컬럼과 함께 Source/Translation fingerprint를 저장하므로, 다음 비교에서는
+    키와 fingerprint 컬럼만 읽어 변경 여부를 판별할 수 있습니다. (pyarrow 필요)
+
+    Args:
+        df (DataFrame): 저장할 export
+        store_dir (str): 스냅샷 저장소 폴더
+        name (str): 스냅샷 이름 (없으면 마이크로초까지 포함한 현재 시각)
+        fingerprints (ndarray): 미리 계산한 fingerprint (없으면 새로 계산)
+
+    Returns:
+        str: 저장한 스냅샷 파일 경로
+
+    Raises:
+        FileExistsError: name으로 지정한 스냅샷이 이미 있는 경우 (기존 스냅샷은 덮어쓰지 않음)
+    """
+    if len(df.columns) < 4:
+        raise ValueError("CSV files must have at least 4 columns.")
+
+    if fingerprints is None:
+        fingerprints = _row_fingerprints(df)
+    snapshot = df.copy()
+    snapshot[SNAPSHOT_FINGERPRINT_COLUMNS[0]] = fingerprints[0]
+    snapshot[SNAPSHOT_FINGERPRINT_COLUMNS[1]] = fingerprints[1]
+
+    # 파일을 배타적으로 생성 - 시각이 같은 이름이 이미 있으면 번호를 붙임
+    os.makedirs(store_dir, exist_ok=True)
+    stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    path = os.path.join(store_dir, f'{name or stamp}.parquet')
+    suffix = 0
+    while True:
+        try:
+            handle = open(path, 'xb')
+            break
+        except FileExistsError:
+            if name is not None:
+                raise
+            suffix += 1
+            path = os.path.join(store_dir, f'{stamp}-{suffix}.parquet')
+
+    try:
+        with handle:
+            snapshot.to_parquet(handle, index=False, row_group_size=SNAPSHOT_ROW_GROUP_SIZE)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+def latest_snapshot(store_dir):
+    """
+    스냅샷 저장소에서 가장 최근 스냅샷 경로를 반환합니다 (없으면 None).
+
+    수정 시각이 같으면 (같은 초에 저장된 경우 등) 시각 순으로 정렬되는 기본 파일 이름으로 정합니다.
+    """
+    paths = glob.glob(os.path.join(store_dir, '*.parquet'))
+    return max(paths, key=lambda path: (os.path.getmtime(path), os.path.basename(path))) if paths else None
+
+def _read_snapshot_rows(parquet, rows, columns):
+    """
+    스냅샷에서 지정한 행(오름차순 위치)만 읽습니다. 해당 행이 있는 row group만 읽습니다.
+    """
+    counts = np.array([parquet.metadata.row_group(i).num_rows
+                       for i in range(parquet.metadata.num_row_groups)], dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    row_groups = np.searchsorted(starts, rows, side='right') - 1
+    selected = np.unique(row_groups)
+    table = parquet.read_row_groups(selected.tolist(), columns=columns)
+
+    # 읽어온 테이블 안에서의 위치로 변환
+    base = dict(zip(selected, np.concatenate([[0], np.cumsum(counts[selected])[:-1]])))
+    local = np.array([base[g] for g in row_groups], dtype=np.int64) + (rows - starts[row_groups])
+    return table.take(local).to_pandas()
+
+def compare_with_snapshot(snapshot_path, df_b, key_b=None, fingerprints_b=None, duplicate_policy='first'):
+    """
+    저장된 스냅샷(A)과 새 export(B)를 fingerprint로 증분 비교합니다.
+
+    스냅샷에서는 키와 fingerprint 컬럼만 읽어 compare_dataframes와 같은 카테고리로 분류하고,
+    A의 실제 값은 삭제되었거나 fingerprint가 다르거나 키가 중복된 행에 대해서만 읽어옵니다.
+    fingerprint가 같으면 변경되지 않은 것으로 봅니다 (64비트 해시 충돌은 고려하지 않음).
+
+    Args:
+        snapshot_path (str): save_snapshot으로 저장한 스냅샷 경로
+        df_b (DataFrame): 새 export
+        key_b (MultiIndex): 미리 생성한 B의 키 (없으면 새로 생성)
+        fingerprints_b (ndarray): 미리 계산한 B의 fingerprint (없으면 새로 계산)
+        duplicate_policy (str): 중복 키 처리 방식 (compare_dataframes와 동일)
+
+    Returns:
+        dict: only_in_a, only_in_b, col3_changes, col4_changes, both_changes, duplicates
+            (duplicates의 File A Row는 스냅샷의 행 번호)
+
+    Raises:
+        ValueError: 컬럼이 4개 미만이거나, error 방식에서 중복 키가 있는 경우
+    """
+    import pyarrow.parquet as pq
+
+    if len(df_b.columns) < 4:
+        raise ValueError("CSV files must have at least 4 columns.")
+
+    parquet = pq.ParquetFile(snapshot_path)
+    value_columns = [name for name in parquet.schema_arrow.names
+                     if name not in SNAPSHOT_FINGERPRINT_COLUMNS]
+
+    # 1. 스냅샷의 키와 fingerprint만 읽어서 조인 (position 방식이면 순번이 추가된 키로 조인)
+    index_a = parquet.read(columns=value_columns[:2] + SNAPSHOT_FINGERPRINT_COLUMNS).to_pandas()
+    if key_b is None:
+        key_b = _make_key(df_b)
+    prepared = _prepare_duplicate_keys(_make_key(index_a), key_b, duplicate_policy)
+    key_a = prepared['key_a']
+    key_b = prepared['key_b']
+
+    only_a_rows = np.flatnonzero(~key_a.isin(key_b))
+    only_b_mask = ~key_b.isin(key_a)
+    pos_a, pos_b = _join_on_key(key_a, key_b, prepared['keep'])
+
+    # 2. fingerprint가 다른 공통 키만 변경 후보로 남김
+    if fingerprints_b is None:
+        fingerprints_b = _row_fingerprints(df_b)
+    col3_diff = index_a[SNAPSHOT_FINGERPRINT_COLUMNS[0]].to_numpy()[pos_a] != fingerprints_b[0][pos_b]
+    col4_diff = index_a[SNAPSHOT_FINGERPRINT_COLUMNS[1]].to_numpy()[pos_a] != fingerprints_b[1][pos_b]
+    changed = col3_diff | col4_diff
+    pos_a, pos_b = pos_a[changed], pos_b[changed]
+
+    # 3. 필요한 A 행만 스냅샷에서 읽어옴 (원래 행 위치를 인덱스로 유지) - 중복 키 리포트용 행 포함
+    duplicate_rows = np.flatnonzero(prepared['duplicated_a'])
+    needed = np.union1d(np.union1d(only_a_rows, pos_a), duplicate_rows)
+    df_a = _read_snapshot_rows(parquet, needed, value_columns)
+    df_a.index = needed
+
+    occurrences = prepared['occurrences']
+    if occurrences is not None:
+        occurrences = (occurrences[0][needed], occurrences[1])
+    result = _build_result(
+        df_a, df_b,
+        np.isin(needed, only_a_rows), only_b_mask,
+        np.searchsorted(needed, pos_a), pos_b,
+        col3_diff[changed], col4_diff[changed], occurrences
+    )
+
+    # 읽어온 행 안에서의 위치로 리포트를 만든 뒤 File A의 Row를 스냅샷 행 번호로 바꿈
+    duplicates = duplicate_key_report(df_a, df_b, np.isin(needed, duplicate_rows), prepared['duplicated_b'])
+    in_a = (duplicates['File'] == 'A').to_numpy()
+    duplicates.loc[in_a, 'Row'] = duplicate_rows + 1
+    result['duplicates'] = duplicates
+    return result
@@ -0,0 +1,487 @@
+"""
+Langify export 비교/병합 로컬 HTTP 작업 API입니다.
+
+다른 도구가 Streamlit UI 없이 두 export 파일을 올려 비교와 병합을 요청하고,
+작업 상태를 조회한 뒤 결과 파일을 내려받을 수 있습니다. 작업은 BackgroundJobs로 실행되며,
+대기열이 가득 차면 새 작업을 429로 거절하고, 끝난 작업의 결과 파일은 합계가 정해진 크기를 넘지 않도록
+오래된 작업부터 삭제하여 요청이 몰려도 메모리가 계속 늘지 않도록 합니다.
+
+엔드포인트:
+    POST   /jobs                           multipart/form-data - file_a, file_b 파일과 옵션 필드 (202)
+    GET    /jobs/<id>                      작업 상태, 요약, 결과 파일 목록
+    GET    /jobs/<id>/artifacts/<name>     결과 파일 다운로드
+    DELETE /jobs/<id>                      작업 취소 또는 결과 삭제
+    GET    /health                         워커 수, 대기열 한도, 상태별 작업 수
+
+옵션 필드 (create_merged_file 인자와 동일, 모두 선택):
+    merge, include_deleted, include_added, source_changes (use_a/use_b/skip),
+    include_translation_changes, include_both_changes, detect_moved, merge_near_moved, duplicate_policy,
+    excel, compact
+
+사용 예:
+    python langify_server.py --port 8765 --workers 2 --queue-size 4
+    curl -F file_a=@live.csv -F file_b=@modified.csv -F merge=true -F source_changes=use_b \\
+        http://127.0.0.1:8765/jobs
+"""
+import argparse
+import email.message
+import io
+import json
+import sys
+import threading
+from email.parser import BytesHeaderParser
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langify_core import (
+    DUPLICATE_POLICIES,
+    RESULT_CATEGORIES,
+    BackgroundJobs,
+    JobQueueFull,
+    PerformanceRecorder,
+    build_csv,
+    build_excel_report,
+    build_zip_archive,
+    compare_dataframes,
+    create_merged_file,
+    detect_moved_entries,
+    load_export
+)
+
+# 서버 작업의 진행 단계 (BackgroundJobs 진행률 계산용)
+SERVER_JOB_PHASES = ['parse', 'compare', 'merge', 'export']
+
+# 기본 워커 수와 (실행 중인 작업 외에) 대기할 수 있는 작업 수
+SERVER_WORKERS = 1
+SERVER_QUEUE_SIZE = 2
+
+# 요청 본문(두 export 파일 합계)의 최대 크기 (MB)
+SERVER_MAX_UPLOAD_MB = 512
+
+# 끝난 작업의 결과를 보관하는 시간 (초) - 지나면 다음 요청 때 삭제
+SERVER_JOB_TTL_SECONDS = 3600
+
+# 보관하는 결과 파일 합계의 최대 크기 (MB) - 넘으면 가장 오래전에 끝난 작업부터 삭제
+SERVER_MAX_RESULT_MB = 1024
+
+# 거절한 요청의 본문을 읽어서 버릴 때 한 번에 읽는 크기 (bytes)
+SERVER_DISCARD_CHUNK_BYTES = 1024 * 1024
+
+# 429 응답의 Retry-After 헤더 값 (초)
+SERVER_RETRY_AFTER_SECONDS = 5
+
+# 옵션 필드의 기본값 (merge를 제외하면 langify_cli.py의 기본값과 동일)
+JOB_OPTION_DEFAULTS = {
+    'merge': False,
+    'include_deleted': True,
+    'include_added': True,
+    'source_changes': 'skip',
+    'include_translation_changes': True,
+    'include_both_changes': True,
+    'detect_moved': False,
+    'merge_near_moved': False,
+    'duplicate_policy': 'first',
+    'excel': False,
+    'compact': False
+}
+
+# 선택지가 정해진 옵션 필드
+JOB_OPTION_CHOICES = {
+    'source_changes': ['use_a', 'use_b', 'skip'],
+    'duplicate_policy': DUPLICATE_POLICIES
+}
+
+# 결과 파일 이름별 Content-Type
+ARTIFACT_CONTENT_TYPES = {
+    '.zip': 'application/zip',
+    '.csv': 'text/csv; charset=utf-8',
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+}
+
+def parse_multipart(content_type, body):
+    """
+    multipart/form-data 요청 본문을 파일과 일반 필드로 나눕니다.
+
+    큰 CSV를 줄 단위로 파싱하지 않도록 본문은 boundary로만 나누고, 각 부분의 헤더만 파싱합니다.
+
+    Args:
+        content_type (str): 요청의 Content-Type 헤더 (boundary 포함)
+        body (bytes): 요청 본문
+
+    Returns:
+        (files, fields): 필드 이름별 파일 내용(bytes)과 필드 값(str)
+    """
+    header = email.message.Message()
+    header['Content-Type'] = content_type
+    boundary = header.get_param('boundary')
+    if header.get_content_type() != 'multipart/form-data' or not boundary:
+        raise ValueError("The request must be multipart/form-data.")
+
+    files, fields = {}, {}
+    for part in body.split(b'--' + boundary.encode('latin-1'))[1:]:
+        if part.startswith(b'--'):
+            break
+        head, _, payload = part.partition(b'\r\n\r\n')
+        if payload.endswith(b'\r\n'):
+            payload = payload[:-2]
+        headers = BytesHeaderParser().parsebytes(head.lstrip(b'\r\n'))
+        name = headers.get_param('name', header='content-disposition')
+        if name is None:
+            continue
+        if headers.get_param('filename', header='content-disposition') is not None:
+            files[name] = payload
+        else:
+            fields[name] = payload.decode('utf-8')
+    return files, fields
+
+def parse_job_options(fields):
+    """
+    요청의 옵션 필드를 검증하고 기본값을 채웁니다.
+
+    Returns:
+        dict: JOB_OPTION_DEFAULTS와 같은 키의 옵션
+    """
+    unknown = set(fields) - set(JOB_OPTION_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    options = dict(JOB_OPTION_DEFAULTS)
+    for name, value in fields.items():
+        if isinstance(JOB_OPTION_DEFAULTS[name], bool):
+            if value.lower() not in ('true', 'false', '1', '0'):
+                raise ValueError(f"{name} must be true or false.")
+            options[name] = value.lower() in ('true', '1')
+        elif value not in JOB_OPTION_CHOICES[name]:
+            raise ValueError(f"{name} must be one of: {', '.join(JOB_OPTION_CHOICES[name])}")
+        else:
+            options[name] = value
+    return options
+
+def run_job(data_a, data_b, options, progress=None):
+    """
+    백그라운드 작업: 두 export를 비교하고 (요청 시) 병합하여 결과 파일을 만듭니다.
+
+    DataFrame은 작업이 끝나면 버리고 압축된 결과 파일만 보관합니다.
+
+    Returns:
+        dict: summary (카테고리별 건수), artifacts (파일 이름별 bytes), performance (단계별 성능 기록)
+    """
+    with PerformanceRecorder('server job', progress) as recorder:
+        recorder('parse')
+        df_a, key_a, fingerprints_a, _, _ = load_export(io.BytesIO(data_a), compact=options['compact'])
+        df_b, key_b, fingerprints_b, _, _ = load_export(io.BytesIO(data_b), compact=options['compact'])
+
+        recorder('compare', len(df_a) + len(df_b))
+        result = compare_dataframes(df_a, df_b, key_a, key_b, fingerprints_a, fingerprints_b,
+                                    options['duplicate_policy'])
+        if options['detect_moved']:
+            result['moved'] = detect_moved_entries(result['only_in_a'], result['only_in_b'])
+
+        merged_df = None
+        if options['merge']:
+            recorder('merge', len(df_a) + len(df_b))
+            merged_df = create_merged_file(
+                df_a, df_b, result,
+                options['include_deleted'], options['include_added'],
+                options['source_changes'], options['include_translation_changes'],
+                options['include_both_changes'], key_a, key_b, include_moved=options['detect_moved'],
+                duplicate_policy=options['duplicate_policy'], include_near_moved=options['merge_near_moved']
+            )
+
+        # 결과 파일 이름은 langify_cli.py의 출력 파일과 동일
+        recorder('export')
+        files = [(f'{name}.csv', result[name]) for name in RESULT_CATEGORIES]
+        files.append(('duplicate_keys.csv', result['duplicates']))
+        if 'moved' in result:
+            files.append(('moved_records.csv', result['moved']))
+        artifacts = {'langify_comparison_results.zip': build_zip_archive(files)}
+        if merged_df is not None:
+            artifacts['langify_merged_import.csv'] = build_csv(merged_df)
+        if options['excel']:
+            artifacts['langify_comparison_report.xlsx'] = build_excel_report(result)
+
+    summary = {name: len(frame) for name, frame in result.items()}
+    if merged_df is not None:
+        summary['merged'] = len(merged_df)
+    return {'summary': summary, 'artifacts': artifacts, 'performance': recorder.finish()}
+
+def job_result_bytes(output):
+    """
+    run_job 결과가 보관하는 결과 파일의 크기 합계 (bytes)를 반환합니다.
+    """
+    return sum(len(data) for data in output['artifacts'].values())
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """
+    작업 API 요청을 처리합니다. 설정과 작업 풀은 server 객체(make_server)에 있습니다.
+    """
+
+    server_version = 'LangifyJobs/1.0'
+
+    # HTTP/1.1이어야 Expect: 100-continue 요청을 본문을 받기 전에 거절할 수 있음 (handle_expect_100)
+    protocol_version = 'HTTP/1.1'
+
+    # handle_expect_100에서 이 요청의 대기열 자리를 이미 잡았는지 여부
+    slot_reserved = False
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message, headers=None):
+        self._send_json(status, {'error': message}, headers)
+
+    def _reject_busy(self):
+        self.close_connection = True
+        self._send_error(HTTPStatus.TOO_MANY_REQUESTS, "The job queue is full. Retry later.",
+                         {'Retry-After': str(self.server.retry_after), 'Connection': 'close'})
+
+    def _is_jobs_path(self):
+        return self.path.split('?')[0].rstrip('/') == '/jobs'
+
+    def _upload_length(self):
+        """
+        Content-Length를 검증하여 반환합니다. 없거나 잘못되었거나 너무 크면 오류를 보내고 None을 반환합니다.
+        """
+        value = self.headers.get('Content-Length')
+        try:
+            length = int(value) if value is not None else None
+        except ValueError:
+            length = -1
+
+        # 본문을 읽지 않고 응답하므로 연결을 닫음
+        if length is None:
+            self.close_connection = True
+            self._send_error(HTTPStatus.LENGTH_REQUIRED, "Content-Length is required.")
+        elif length < 0:
+            self.close_connection = True
+            self._send_error(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.")
+        elif length > self.server.max_upload_bytes:
+            self.close_connection = True
+            self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                             f"The request is larger than {self.server.max_upload_bytes // 1024 // 1024} MB.")
+        else:
+            return length
+        return None
+
+    def _reserve_slot(self):
+        """
+        업로드할 작업의 대기열 자리를 잡습니다. 업로드 중인 요청도 자리를 차지하며, 자리가 없으면 False.
+        """
+        with self.server.slots_lock:
+            counts = self.server.jobs.counts()
+            if counts['queued'] + counts['running'] + self.server.uploading >= self.server.jobs.max_pending:
+                return False
+            self.server.uploading += 1
+        return True
+
+    def _discard_body(self, length):
+        while length > 0:
+            chunk = self.rfile.read(min(length, SERVER_DISCARD_CHUNK_BYTES))
+            if not chunk:
+                break
+            length -= len(chunk)
+
+    def handle_expect_100(self):
+        # Expect: 100-continue이면 본문을 받기 전에 크기와 대기열 자리를 확인하여 바로 거절
+        if self.command == 'POST' and self._is_jobs_path():
+            if self._upload_length() is None:
+                return False
+            if not self._reserve_slot():
+                self._reject_busy()
+                return False
+            self.slot_reserved = True
+        return super().handle_expect_100()
+
+    def _job_path(self):
+        """
+        /jobs/<id>[/artifacts/<name>] 경로를 (작업 ID, 결과 파일 이름)으로 나눕니다 (형식이 다르면 None).
+        """
+        parts = self.path.split('?')[0].strip('/').split('/')
+        if len(parts) == 2 and parts[0] == 'jobs':
+            return parts[1], None
+        if len(parts) == 4 and parts[0] == 'jobs' and parts[2] == 'artifacts':
+            return parts[1], parts[3]
+        return None
+
+    def _job_status(self, job_id):
+        """
+        작업 상태와 (완료된 경우) 요약, 결과 파일 목록을 반환합니다. 그 사이 삭제된 작업이면 None.
+        """
+        status = self.server.jobs.status(job_id)
+        if status is None:
+            return None
+        payload = {'id': job_id, **status}
+        output = self.server.jobs.result(job_id)
+        if output is not None:
+            payload['summary'] = output['summary']
+            payload['performance'] = output['performance']
+            payload['artifacts'] = [
+                {'name': name, 'bytes': len(data), 'url': f'/jobs/{job_id}/artifacts/{name}'}
+                for name, data in output['artifacts'].items()
+            ]
+        return payload
+
+    def do_POST(self):
+        reserved, self.slot_reserved = self.slot_reserved, False
+        self.server.jobs.purge(self.server.job_ttl)
+        if not self._is_jobs_path():
+            self.close_connection = True
+            self._send_error(HTTPStatus.NOT_FOUND, "Not found.")
+            return
+
+        length = self._upload_length()
+        if length is None:
+            return
+
+        # 자리가 없으면 클라이언트가 429 응답을 읽을 수 있도록 본문을 읽어서 버린 뒤 거절
+        if not reserved and not self._reserve_slot():
+            self._discard_body(length)
+            self._reject_busy()
+            return
+        try:
+            try:
+                files, fields = parse_multipart(self.headers.get('Content-Type', ''), self.rfile.read(length))
+                if 'file_a' not in files or 'file_b' not in files:
+                    raise ValueError("Both file_a and file_b must be uploaded.")
+                options = parse_job_options(fields)
+            except ValueError as e:
+                self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+                return
+
+            try:
+                job_id = self.server.jobs.submit(run_job, files['file_a'], files['file_b'], options,
+                                                 phases=SERVER_JOB_PHASES)
+            except JobQueueFull:
+                self._reject_busy()
+                return
+        finally:
+            with self.server.slots_lock:
+                self.server.uploading -= 1
+        self._send_json(HTTPStatus.ACCEPTED, {'id': job_id, 'url': f'/jobs/{job_id}'},
+                        {'Location': f'/jobs/{job_id}'})
+
+    def do_GET(self):
+        self.server.jobs.purge(self.server.job_ttl)
+        if self.path.split('?')[0].rstrip('/') == '/health':
+            self._send_json(HTTPStatus.OK, {
+                'workers': self.server.jobs.max_workers,
+                'max_pending': self.server.jobs.max_pending,
+                'jobs': self.server.jobs.counts()
+            })
+            return
+
+        job_path = self._job_path()
+        if job_path is None or self.server.jobs.status(job_path[0]) is None:
+            self._send_error(HTTPStatus.NOT_FOUND, "Not found.")
+            return
+        job_id, artifact = job_path
+        if artifact is None:
+            payload = self._job_status(job_id)
+            if payload is None:
+                self._send_error(HTTPStatus.NOT_FOUND, "Not found.")
+            else:
+                self._send_json(HTTPStatus.OK, payload)
+            return
+
+        output = self.server.jobs.result(job_id)
+        if output is None:
+            if self.server.jobs.status(job_id) is None:
+                self._send_error(HTTPStatus.NOT_FOUND, "Not found.")
+            else:
+                self._send_error(HTTPStatus.CONFLICT, "The job has not finished successfully.")
+            return
+        if artifact not in output['artifacts']:
+            self._send_error(HTTPStatus.NOT_FOUND, f"No artifact named {artifact}.")
+            return
+        data = output['artifacts'][artifact]
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', ARTIFACT_CONTENT_TYPES.get(artifact[artifact.rfind('.'):],
+                                                                    'application/octet-stream'))
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Content-Disposition', f'attachment; filename="{artifact}"')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_DELETE(self):
+        job_path = self._job_path()
+        if job_path is None or job_path[1] is not None or self.server.jobs.status(job_path[0]) is None:
+            self._send_error(HTTPStatus.NOT_FOUND, "Not found.")
+            return
+
+        # 실행 중이면 다음 단계에서 취소, 끝났으면 결과 삭제
+        job_id = job_path[0]
+        self.server.jobs.cancel(job_id)
+        self.server.jobs.pop(job_id)
+        status = self.server.jobs.status(job_id)
+        self._send_json(HTTPStatus.OK, {'id': job_id, 'state': status['state'] if status else 'deleted'})
+
+def make_server(host='127.0.0.1', port=8765, workers=SERVER_WORKERS, queue_size=SERVER_QUEUE_SIZE,
+                max_upload_mb=SERVER_MAX_UPLOAD_MB, job_ttl=SERVER_JOB_TTL_SECONDS,
+                max_result_mb=SERVER_MAX_RESULT_MB):
+    """
+    작업 API 서버를 생성합니다 (serve_forever로 실행).
+
+    Args:
+        workers (int): 동시에 실행하는 작업 수
+        queue_size (int): 실행 중인 작업 외에 대기할 수 있는 작업 수 (넘으면 429)
+        max_upload_mb (int): 요청 본문의 최대 크기 (넘으면 413)
+        job_ttl (int): 끝난 작업의 결과를 보관하는 시간 (초)
+        max_result_mb (int): 보관하는 결과 파일 합계의 최대 크기 (넘으면 오래된 작업부터 삭제)
+
+    Returns:
+        ThreadingHTTPServer
+    """
+    server = ThreadingHTTPServer((host, port), JobRequestHandler)
+    server.jobs = BackgroundJobs(max_workers=workers, max_pending=workers + queue_size,
+                                 max_result_bytes=max_result_mb * 1024 * 1024, result_size=job_result_bytes)
+    server.slots_lock = threading.Lock()
+    server.uploading = 0
+    server.max_upload_bytes = max_upload_mb * 1024 * 1024
+    server.job_ttl = job_ttl
+    server.retry_after = SERVER_RETRY_AFTER_SECONDS
+    return server
+
+def build_parser():
+    """
+    명령줄 인자 파서를 생성합니다.
+    """
+    parser = argparse.ArgumentParser(description="Run the local Langify compare/merge job API.")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument('--workers', type=int, default=SERVER_WORKERS,
+                        help=f"Jobs that run at the same time (default: {SERVER_WORKERS})")
+    parser.add_argument('--queue-size', type=int, default=SERVER_QUEUE_SIZE,
+                        help=f"Jobs that may wait for a worker; more are rejected with 429 "
+                             f"(default: {SERVER_QUEUE_SIZE})")
+    parser.add_argument('--max-upload-mb', type=int, default=SERVER_MAX_UPLOAD_MB,
+                        help=f"Largest accepted request body (default: {SERVER_MAX_UPLOAD_MB})")
+    parser.add_argument('--job-ttl', type=int, default=SERVER_JOB_TTL_SECONDS,
+                        help=f"Seconds to keep finished jobs and their files (default: {SERVER_JOB_TTL_SECONDS})")
+    parser.add_argument('--max-result-mb', type=int, default=SERVER_MAX_RESULT_MB,
+                        help=f"Total size of kept result files; the oldest finished jobs are dropped first "
+                             f"(default: {SERVER_MAX_RESULT_MB})")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    server = make_server(args.host, args.port, args.workers, args.queue_size, args.max_upload_mb, args.job_ttl,
+                         args.max_result_mb)
+    print(f"Langify job API on http://{args.host}:{args.port} "
+          f"({args.workers} workers, {args.queue_size} queued jobs)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+벤치마크용 Langify export 파일 쌍(A, B)을 생성합니다.
+
+실제 export와 비슷하게 상품 ID마다 여러 Name(title, body_html 등)을 갖고,
+HTML이 많은 Source와 한중일(CJK) 번역을 포함합니다.
+B는 A에서 일부 행을 삭제/추가/변경하여 만듭니다.
+
+사용 예:
+    python langify_synth.py --rows 1000000 -o data --change-ratio 0.05
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# 상품 하나에 포함되는 Langify 필드
+FIELD_NAMES = [
+    'title', 'body_html', 'handle', 'meta_title', 'meta_description',
+    'option1', 'option2', 'variant_title', 'image_alt', 'tags'
+]
+
+# HTML 값이 주로 들어가는 필드
+HTML_FIELDS = {'body_html', 'meta_description'}
+
+_WORDS_EN = (
+    'organic cotton linen premium soft classic modern lightweight durable handmade '
+    'summer winter collection limited edition gift natural vintage slim relaxed fit '
+    'waterproof breathable eco friendly everyday essential comfort design quality'
+).split()
+
+_WORDS_CJK = (
+    '유기농 면 프리미엄 부드러운 클래식 모던 가벼운 내구성 수제 여름 겨울 컬렉션 한정판 선물 '
+    '天然 复古 修身 宽松 防水 透气 环保 日常 必备 舒适 设计 品质 '
+    'オーガニック コットン リネン 上質 軽量 限定 ギフト ナチュラル'
+).split()
+
+_WORDS_EU = (
+    'algodón orgánico lino suave clásico moderno ligero duradero hecho a mano verano '
+    'coton biologique doux classique léger durable fait main été hiver collection'
+).split()
+
+def _sentence_pool(rng, words, size, min_words, max_words):
+    """
+    단어 목록에서 무작위 문장 size개를 만듭니다.
+    """
+    lengths = rng.integers(min_words, max_words + 1, size)
+    choices = rng.choice(words, lengths.sum())
+    return np.array([' '.join(part) for part in np.split(choices, np.cumsum(lengths)[:-1])], dtype=object)
+
+def _html_pool(rng, sentences, size):
+    """
+    문장들로 상품 설명 형태의 HTML 조각 size개를 만듭니다 (수백 bytes ~ 수 KB).
+    """
+    pool = []
+    for _ in range(size):
+        paragraphs = rng.choice(sentences, rng.integers(2, 8))
+        items = rng.choice(sentences, rng.integers(3, 12))
+        pool.append(
+            '<div class="product-description">'
+            + ''.join(f'<p>{p}</p>' for p in paragraphs)
+            + '<ul>' + ''.join(f'<li><strong>{i.split()[0]}</strong> {i}</li>' for i in items) + '</ul>'
+            + '</div>'
+        )
+    return np.array(pool, dtype=object)
+
+def _make_rows(rng, start, rows, html_ratio, cjk_ratio, pools):
+    """
+    start번째 행부터 rows개의 export 행을 생성합니다. 행 번호가 같으면 키도 같습니다.
+    """
+    row_numbers = np.arange(start, start + rows)
+    product = row_numbers // len(FIELD_NAMES)
+    field = row_numbers % len(FIELD_NAMES)
+
+    ids = pd.Series(product * 7 + 7000000000000).astype(str)
+    names = np.array(FIELD_NAMES, dtype=object)[field]
+
+    # 행마다 고유한 값이 되도록 행 번호를 덧붙임
+    suffix = ' #' + pd.Series(row_numbers).astype(str)
+    use_html = np.isin(names, list(HTML_FIELDS)) & (rng.random(rows) < html_ratio)
+    source = np.where(
+        use_html,
+        pools['html_en'][rng.integers(0, len(pools['html_en']), rows)],
+        pools['en'][rng.integers(0, len(pools['en']), rows)]
+    )
+    use_cjk = rng.random(rows) < cjk_ratio
+    translation = np.where(
+        use_cjk,
+        np.where(use_html,
+                 pools['html_cjk'][rng.integers(0, len(pools['html_cjk']), rows)],
+                 pools['cjk'][rng.integers(0, len(pools['cjk']), rows)]),
+        pools['eu'][rng.integers(0, len(pools['eu']), rows)]
+    )
+
+    return pd.DataFrame({
+        'ID': ids.to_numpy(dtype=object),
+        'Name': names,
+        'Source': (pd.Series(source, dtype=object) + suffix).to_numpy(dtype=object),
+        'Translation': (pd.Series(translation, dtype=object) + suffix).to_numpy(dtype=object)
+    })
+
+def generate_export_pair(rows, delete_ratio=0.02, add_ratio=0.02, change_ratio=0.05,
+                         html_ratio=0.8, cjk_ratio=0.5, seed=0):
+    """
+    비교용 Langify export 쌍을 생성합니다.
+
+    Args:
+        rows (int): A의 행 수
+        delete_ratio (float): B에서 삭제할 A 행의 비율
+        add_ratio (float): B에 새로 추가할 행의 비율 (A 행 수 기준)
+        change_ratio (float): 변경할 공통 행의 비율 (Source/Translation/둘 다 균등 분배)
+        html_ratio (float): body_html/meta_description 값 중 HTML 값의 비율
+        cjk_ratio (float): 번역 중 한중일 텍스트의 비율
+        seed (int): 난수 시드
+
+    Returns:
+        (df_a, df_b): Live export(A)와 Modified export(B)
+    """
+    rng = np.random.default_rng(seed)
+    sentences_en = _sentence_pool(rng, _WORDS_EN, 2000, 4, 14)
+    sentences_cjk = _sentence_pool(rng, _WORDS_CJK, 2000, 4, 14)
+    pools = {
+        'en': sentences_en,
+        'cjk': sentences_cjk,
+        'eu': _sentence_pool(rng, _WORDS_EU, 2000, 4, 14),
+        'html_en': _html_pool(rng, sentences_en, 500),
+        'html_cjk': _html_pool(rng, sentences_cjk, 500)
+    }
+
+    df_a = _make_rows(rng, 0, rows, html_ratio, cjk_ratio, pools)
+
+    # 삭제 - A의 일부 행을 B에서 제외
+    df_b = df_a[rng.random(rows) >= delete_ratio].reset_index(drop=True)
+
+    # 변경 - Source만 / Translation만 / 둘 다 변경
+    kind = rng.integers(0, 3, len(df_b))
+    changed = rng.random(len(df_b)) < change_ratio
+    source_changed = changed & (kind != 1)
+    translation_changed = changed & (kind != 0)
+    df_b.loc[source_changed, 'Source'] = df_b.loc[source_changed, 'Source'] + ' (updated)'
+    df_b.loc[translation_changed, 'Translation'] = df_b.loc[translation_changed, 'Translation'] + ' (revised)'
+
+    # 추가 - A에 없는 새 상품 행
+    added = _make_rows(rng, rows, int(rows * add_ratio), html_ratio, cjk_ratio, pools)
+    df_b = pd.concat([df_b, added], ignore_index=True)
+
+    return df_a, df_b
+
+def build_parser():
+    """
+    명령줄 인자 파서를 생성합니다.
+    """
+    parser = argparse.ArgumentParser(description="Generate a synthetic pair of Langify exports.")
+    parser.add_argument('--rows', type=int, default=100000, help="Rows in export A (default: 100000)")
+    parser.add_argument('-o', '--output-dir', default='.', help="Directory for A.csv and B.csv")
+    parser.add_argument('--delete-ratio', type=float, default=0.02)
+    parser.add_argument('--add-ratio', type=float, default=0.02)
+    parser.add_argument('--change-ratio', type=float, default=0.05)
+    parser.add_argument('--html-ratio', type=float, default=0.8)
+    parser.add_argument('--cjk-ratio', type=float, default=0.5)
+    parser.add_argument('--seed', type=int, default=0)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    df_a, df_b = generate_export_pair(
+        args.rows, args.delete_ratio, args.add_ratio, args.change_ratio,
+        args.html_ratio, args.cjk_ratio, args.seed
+    )
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for name, frame in (('A.csv', df_a), ('B.csv', df_b)):
+        path = os.path.join(args.output_dir, name)
+        frame.to_csv(path, index=False)
+        print(f"{path}: {len(frame)} records, {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+delta 파일을 같은 Live export에 적용하면 병합 결과와 같은 CSV가 만들어지는지 확인합니다.
+"""
+import io
+import itertools
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langify_core import (
+    apply_delta,
+    build_csv,
+    build_delta_csv,
+    compare_dataframes,
+    create_delta,
+    create_merged_file,
+)
+from langify_synth import generate_export_pair
+
+def with_duplicates(df, rows, suffix):
+    """
+    처음 rows개 행을 번역만 바꿔 한 번 더 추가합니다 (중복 키 처리 방식 확인용).
+    """
+    extra = df.iloc[:rows].copy()
+    extra.iloc[:, 3] = extra.iloc[:, 3] + suffix
+    return pd.concat([df, extra], ignore_index=True)
+
+class DeltaRoundTripTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        df_a, df_b = generate_export_pair(300, seed=2)
+        cls.df_a = with_duplicates(df_a, 10, ' (A)')
+        cls.df_b = with_duplicates(df_b, 15, ' (B)')
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path_a = os.path.join(cls.tmp.name, 'a.csv')
+        cls.df_a.to_csv(cls.path_a, index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def apply(self, delta):
+        output = io.BytesIO()
+        apply_delta(self.path_a, delta, output, chunksize=100)
+        return output.getvalue()
+
+    def test_delta_matches_merge_for_every_policy_and_option(self):
+        options = itertools.product([True, False], [True, False], ['use_a', 'use_b', 'skip'], [True, False],
+                                    [True, False])
+        results = {policy: compare_dataframes(self.df_a, self.df_b, duplicate_policy=policy)
+                   for policy in ('first', 'last', 'position')}
+        for option in options:
+            for policy, result in results.items():
+                with self.subTest(policy=policy, option=option):
+                    merged = create_merged_file(self.df_a, self.df_b, result, *option, duplicate_policy=policy)
+                    delta = create_delta(self.df_a, self.df_b, result, *option, duplicate_policy=policy)
+                    self.assertEqual(self.apply(delta), build_csv(merged))
+
+    def test_delta_file_matches_merge(self):
+        result = compare_dataframes(self.df_a, self.df_b, duplicate_policy='position')
+        option = (True, True, 'use_b', True, True)
+        path = os.path.join(self.tmp.name, 'delta.csv.gz')
+        with open(path, 'wb') as f:
+            f.write(build_delta_csv(create_delta(self.df_a, self.df_b, result, *option,
+                                                 duplicate_policy='position')))
+        merged = create_merged_file(self.df_a, self.df_b, result, *option, duplicate_policy='position')
+        self.assertEqual(self.apply(path), build_csv(merged))
+
+    def test_error_policy_raises(self):
+        with self.assertRaises(ValueError):
+            compare_dataframes(self.df_a, self.df_b, duplicate_policy='error')
+        result = compare_dataframes(self.df_a, self.df_b)
+        with self.assertRaises(ValueError):
+            create_delta(self.df_a, self.df_b, result, True, True, 'use_b', True, True, duplicate_policy='error')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+"""
+ID + Name 키 생성에서 빈 값 처리를 확인합니다.
+"""
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langify_core import _key_values, _partition_ids, compare_dataframes
+
+class KeyValuesTest(unittest.TestCase):
+
+    def test_missing_values_become_empty_strings(self):
+        values = pd.Series(['title', np.nan, None], dtype=object)
+        self.assertEqual(list(_key_values(values)), ['title', '', ''])
+
+    def test_missing_name_does_not_match_literal_nan(self):
+        df_a = pd.DataFrame({'ID': pd.Series(['1'], dtype=object), 'Name': pd.Series([np.nan], dtype=object),
+                             'Source': ['a'], 'Translation': ['x']})
+        df_b = pd.DataFrame({'ID': pd.Series(['1'], dtype=object), 'Name': pd.Series(['nan'], dtype=object),
+                             'Source': ['a'], 'Translation': ['x']})
+        result = compare_dataframes(df_a, df_b)
+        self.assertEqual(len(result['only_in_a']), 1)
+        self.assertEqual(len(result['only_in_b']), 1)
+
+    def test_missing_name_partitions_like_empty_name(self):
+        missing = pd.DataFrame({'ID': pd.Series(['1'] * 3, dtype=object),
+                                'Name': pd.Series([np.nan, None, ''], dtype=object)})
+        partitions = _partition_ids(missing, 16)
+        self.assertEqual(len(set(partitions.tolist())), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+이동(ID 변경) 항목 감지와 병합 적용을 확인합니다.
+"""
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langify_core import compare_dataframes, create_merged_file, detect_moved_entries
+from langify_synth import generate_export_pair
+
+DESCRIPTION = 'Soft organic cotton shirt with a relaxed fit for everyday summer wear'
+
+class DetectMovedTest(unittest.TestCase):
+
+    def test_no_moves_gives_empty_frame_and_unchanged_merge(self):
+        for seed in range(3):
+            df_a, df_b = generate_export_pair(5000, seed=seed)
+            result = compare_dataframes(df_a, df_b)
+            result['moved'] = detect_moved_entries(result['only_in_a'], result['only_in_b'])
+            self.assertTrue(result['moved'].empty)
+
+            plain = create_merged_file(df_a, df_b, result, True, True, 'use_b', True, True)
+            moved = create_merged_file(df_a, df_b, result, True, True, 'use_b', True, True,
+                                       include_moved=True, include_near_moved=True)
+            pd.testing.assert_frame_equal(plain, moved)
+
+    def test_shared_markup_is_not_a_near_match(self):
+        df_a = pd.DataFrame({'ID': ['1'], 'Name': ['body_html'], 'Source': [
+            '<div class="product-description"><p>linen summer dress</p><ul><li><strong>fit</strong> slim</li></ul></div>'
+        ], 'Translation': ['a']})
+        df_b = pd.DataFrame({'ID': ['2'], 'Name': ['body_html'], 'Source': [
+            '<div class="product-description"><p>waterproof winter boots</p><ul><li><strong>sole</strong> rubber</li></ul></div>'
+        ], 'Translation': ['b']})
+        result = compare_dataframes(df_a, df_b)
+        self.assertTrue(detect_moved_entries(result['only_in_a'], result['only_in_b']).empty)
+
+    def test_exact_and_near_matches(self):
+        df_a = pd.DataFrame({'ID': ['10', '11', '12'], 'Name': ['title', 'body_html', 'body_html'],
+                             'Source': ['Red', f'<p>{DESCRIPTION}</p>', f'<p>{DESCRIPTION} in size 40</p>'],
+                             'Translation': ['Rot', 'A1', 'A2']})
+        df_b = pd.DataFrame({'ID': ['20', '21', '22'], 'Name': ['title', 'body_html', 'body_html'],
+                             'Source': ['Red', f'<p>{DESCRIPTION}!</p><p>New</p>', f'<p>{DESCRIPTION} in size 42</p>'],
+                             'Translation': ['Rot!', 'B1', 'B2']})
+        result = compare_dataframes(df_a, df_b)
+        moved = detect_moved_entries(result['only_in_a'], result['only_in_b'])
+        result['moved'] = moved
+
+        # 숫자가 다른 행(사이즈 40/42)은 짝짓지 않음
+        self.assertEqual(moved['ID (File_A)'].tolist(), ['10', '11'])
+        self.assertEqual(moved['Match'].tolist(), ['exact', 'near'])
+        self.assertGreaterEqual(moved['Similarity'].iloc[1], 0.9)
+
+        # 기본은 완전 일치만 병합에 적용
+        merged = create_merged_file(df_a, df_b, result, True, True, 'skip', True, True, include_moved=True)
+        self.assertEqual(merged['Translation'].tolist(), ['Rot!', 'A1', 'A2', 'B1', 'B2'])
+        merged = create_merged_file(df_a, df_b, result, True, True, 'skip', True, True,
+                                    include_moved=True, include_near_moved=True)
+        self.assertEqual(merged['Translation'].tolist(), ['Rot!', 'B1', 'A2', 'B2'])
+
+if __name__ == '__main__':
+    unittest.main()
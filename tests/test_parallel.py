@@ -0,0 +1,42 @@
+"""
+병렬 비교(compare_dataframes_parallel)가 메모리 내 비교(compare_dataframes)와 같은 결과를 내는지 확인합니다.
+"""
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langify_core import compare_dataframes, compare_dataframes_parallel
+from langify_synth import generate_export_pair
+
+class ParallelCompareTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        df_a, df_b = generate_export_pair(3000, seed=1)
+        # 중복 키 - 일부 행을 번역만 바꿔 한 번 더 추가
+        extra_a = df_a.iloc[:20].copy()
+        extra_a.iloc[:, 3] += ' (A)'
+        extra_b = df_b.iloc[:30].copy()
+        extra_b.iloc[:, 3] += ' (B)'
+        cls.df_a = pd.concat([df_a, extra_a], ignore_index=True)
+        cls.df_b = pd.concat([df_b, extra_b], ignore_index=True)
+
+    def test_parallel_matches_serial(self):
+        for policy in ('first', 'last', 'position'):
+            expected = compare_dataframes(self.df_a, self.df_b, duplicate_policy=policy)
+            result = compare_dataframes_parallel(self.df_a, self.df_b, workers=2, duplicate_policy=policy)
+            self.assertEqual(sorted(result), sorted(expected))
+            for name, frame in expected.items():
+                with self.subTest(policy=policy, category=name):
+                    pd.testing.assert_frame_equal(result[name], frame)
+
+    def test_error_policy_raises(self):
+        with self.assertRaises(ValueError):
+            compare_dataframes_parallel(self.df_a, self.df_b, workers=2, duplicate_policy='error')
+
+if __name__ == '__main__':
+    unittest.main()
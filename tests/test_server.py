@@ -0,0 +1,121 @@
+"""
+langify_server.py 작업 API의 backpressure(429)와 결과 보관 한도를 확인합니다.
+"""
+import json
+import os
+import socket
+import sys
+import threading
+import unittest
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langify_core import BackgroundJobs
+from langify_server import make_server
+
+EXPORT_A = b'ID,Name,Source,Translation\n1,title,Hello,Hallo\n2,title,World,Welt\n'
+EXPORT_B = b'ID,Name,Source,Translation\n1,title,Hello,Hallo!\n3,title,New,Neu\n'
+BOUNDARY = 'langifytestboundary'
+
+def multipart_body(files, fields=None):
+    parts = []
+    for name, data in files.items():
+        parts.append(f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"; '
+                     f'filename="{name}.csv"\r\nContent-Type: text/csv\r\n\r\n'.encode() + data + b'\r\n')
+    for name, value in (fields or {}).items():
+        parts.append(f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    return b''.join(parts) + f'--{BOUNDARY}--\r\n'.encode()
+
+class JobServerTest(unittest.TestCase):
+
+    def setUp(self):
+        # 워커 1개, 대기열 0 - 작업 하나가 실행 중이면 새 요청은 429
+        self.server = make_server(port=0, workers=1, queue_size=0)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _occupy_worker(self):
+        self.server.jobs.submit(lambda progress: self.release.wait(10))
+
+    def _post(self, body):
+        request = urllib.request.Request(f'{self.base}/jobs', data=body, method='POST',
+                                         headers={'Content-Type': f'multipart/form-data; boundary={BOUNDARY}'})
+        return urllib.request.urlopen(request, timeout=10)
+
+    def test_job_accepted_and_artifacts(self):
+        with self._post(multipart_body({'file_a': EXPORT_A, 'file_b': EXPORT_B}, {'merge': 'true'})) as response:
+            self.assertEqual(response.status, 202)
+            job_id = json.load(response)['id']
+        self.server.jobs._executor.shutdown(wait=True)
+        with urllib.request.urlopen(f'{self.base}/jobs/{job_id}', timeout=10) as response:
+            status = json.load(response)
+        self.assertEqual(status['state'], 'done')
+        self.assertIn('langify_merged_import.csv', [artifact['name'] for artifact in status['artifacts']])
+
+    def test_full_queue_returns_readable_429(self):
+        self._occupy_worker()
+        # 소켓 버퍼보다 큰 본문 (약 20 MB) - 읽지 않고 닫으면 클라이언트는 429 대신 연결 오류를 받음
+        body = multipart_body({'file_a': EXPORT_A * 300000, 'file_b': EXPORT_B * 300000})
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            self._post(body)
+        self.assertEqual(raised.exception.code, 429)
+        self.assertEqual(raised.exception.headers['Retry-After'], str(self.server.retry_after))
+        self.assertIn('error', json.load(raised.exception))
+
+        # 작업이 끝나면 다시 받음
+        self.release.set()
+        self.server.jobs._executor.submit(lambda: None).result()
+        with self._post(multipart_body({'file_a': EXPORT_A, 'file_b': EXPORT_B})) as response:
+            self.assertEqual(response.status, 202)
+
+    def test_full_queue_rejects_before_100_continue(self):
+        self._occupy_worker()
+        with socket.create_connection(self.server.server_address, timeout=10) as connection:
+            connection.sendall(
+                f'POST /jobs HTTP/1.1\r\nHost: localhost\r\nContent-Length: 1000000\r\n'
+                f'Content-Type: multipart/form-data; boundary={BOUNDARY}\r\nExpect: 100-continue\r\n\r\n'.encode()
+            )
+            status_line = connection.makefile('rb').readline()
+        self.assertIn(b' 429 ', status_line)
+        self.assertEqual(self.server.uploading, 0)
+
+    def test_invalid_content_length(self):
+        for value, code in (('abc', b' 400 '), ('-5', b' 400 ')):
+            with socket.create_connection(self.server.server_address, timeout=10) as connection:
+                connection.sendall(f'POST /jobs HTTP/1.1\r\nHost: localhost\r\nContent-Length: {value}\r\n\r\n'.encode())
+                self.assertIn(code, connection.makefile('rb').readline())
+        with socket.create_connection(self.server.server_address, timeout=10) as connection:
+            connection.sendall(b'POST /jobs HTTP/1.1\r\nHost: localhost\r\n\r\n')
+            self.assertIn(b' 411 ', connection.makefile('rb').readline())
+
+    def test_unknown_job_is_404(self):
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            urllib.request.urlopen(f'{self.base}/jobs/missing', timeout=10)
+        self.assertEqual(raised.exception.code, 404)
+
+class BackgroundJobsResultLimitTest(unittest.TestCase):
+
+    def test_oldest_results_are_dropped(self):
+        jobs = BackgroundJobs(max_workers=1, max_result_bytes=250, result_size=len)
+        job_ids = [jobs.submit(lambda progress: b'x' * 100) for _ in range(4)]
+        jobs._executor.shutdown(wait=True)
+        self.assertEqual([jobs.status(job_id) is not None for job_id in job_ids], [False, False, True, True])
+
+    def test_newest_result_is_kept_even_if_too_large(self):
+        jobs = BackgroundJobs(max_workers=1, max_result_bytes=10, result_size=len)
+        job_ids = [jobs.submit(lambda progress: b'x' * 100) for _ in range(2)]
+        jobs._executor.shutdown(wait=True)
+        self.assertIsNone(jobs.status(job_ids[0]))
+        self.assertEqual(jobs.result(job_ids[1]), b'x' * 100)
+
+if __name__ == '__main__':
+    unittest.main()
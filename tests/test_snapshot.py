@@ -0,0 +1,51 @@
+"""
+스냅샷 증분 비교(compare_with_snapshot)가 메모리 내 비교(compare_dataframes)와 같은 결과를 내는지 확인합니다.
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langify_core import compare_dataframes, compare_with_snapshot, save_snapshot
+from langify_synth import generate_export_pair
+
+class SnapshotCompareTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        df_a, df_b = generate_export_pair(3000, seed=4)
+        # 중복 키 - 일부 행을 번역만 바꿔 한 번 더 추가 (A는 파일 중간의 행도 포함)
+        extra_a = pd.concat([df_a.iloc[:20], df_a.iloc[1000:1005]])
+        extra_a.iloc[:, 3] += ' (A)'
+        extra_b = df_b.iloc[:30].copy()
+        extra_b.iloc[:, 3] += ' (B)'
+        cls.df_a = pd.concat([df_a, extra_a], ignore_index=True)
+        cls.df_b = pd.concat([df_b, extra_b], ignore_index=True)
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.snapshot = save_snapshot(cls.df_a, cls.tmp.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_snapshot_matches_in_memory(self):
+        for policy in ('first', 'last', 'position'):
+            expected = compare_dataframes(self.df_a, self.df_b, duplicate_policy=policy)
+            result = compare_with_snapshot(self.snapshot, self.df_b, duplicate_policy=policy)
+            self.assertEqual(sorted(result), sorted(expected))
+            for name, frame in expected.items():
+                with self.subTest(policy=policy, category=name):
+                    # 스냅샷에서 읽은 값은 dtype이 다를 수 있으므로 문자열로 비교
+                    pd.testing.assert_frame_equal(result[name].reset_index(drop=True).astype(str),
+                                                  frame.reset_index(drop=True).astype(str))
+
+    def test_error_policy_raises(self):
+        with self.assertRaises(ValueError):
+            compare_with_snapshot(self.snapshot, self.df_b, duplicate_policy='error')
+
+if __name__ == '__main__':
+    unittest.main()
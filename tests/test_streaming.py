@@ -0,0 +1,65 @@
+"""
+스트리밍 비교(compare_csv_streaming)가 메모리 내 비교(compare_dataframes)와 같은 결과를 내는지 확인합니다.
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langify_core import RESULT_CATEGORIES, compare_csv_streaming, compare_dataframes
+from langify_synth import generate_export_pair
+
+def sorted_rows(frame):
+    """
+    행 순서와 관계없이 비교할 수 있도록 모든 행을 문자열 튜플로 정렬하여 반환합니다.
+    """
+    return sorted(map(tuple, frame.fillna('').astype(str).to_numpy().tolist()))
+
+class StreamingCompareTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        df_a, df_b = generate_export_pair(3000, seed=1)
+        # 중복 키 - 일부 행을 번역만 바꿔 한 번 더 추가
+        extra_a = df_a.iloc[:20].copy()
+        extra_a.iloc[:, 3] += ' (A)'
+        extra_b = df_b.iloc[:30].copy()
+        extra_b.iloc[:, 3] += ' (B)'
+        cls.df_a = pd.concat([df_a, extra_a], ignore_index=True)
+        cls.df_b = pd.concat([df_b, extra_b], ignore_index=True)
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path_a = os.path.join(cls.tmp.name, 'a.csv')
+        cls.path_b = os.path.join(cls.tmp.name, 'b.csv')
+        cls.df_a.to_csv(cls.path_a, index=False)
+        cls.df_b.to_csv(cls.path_b, index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def stream(self, policy):
+        # 1MB 제한과 작은 청크로 여러 파티션, 여러 청크를 거치게 함
+        return compare_csv_streaming(self.path_a, self.path_b, os.path.join(self.tmp.name, policy),
+                                     memory_limit_mb=1, chunksize=500, duplicate_policy=policy)
+
+    def test_streaming_matches_in_memory(self):
+        for policy in ('first', 'last', 'position'):
+            expected = compare_dataframes(self.df_a, self.df_b, duplicate_policy=policy)
+            result = self.stream(policy)
+            for name, frame in expected.items():
+                with self.subTest(policy=policy, category=name):
+                    self.assertEqual(result[name]['count'], len(frame))
+                    if name in RESULT_CATEGORIES:
+                        streamed = pd.read_csv(result[name]['path'], dtype=str, keep_default_na=False)
+                        self.assertEqual(sorted_rows(streamed), sorted_rows(frame))
+
+    def test_error_policy_raises(self):
+        with self.assertRaises(ValueError):
+            self.stream('error')
+
+if __name__ == '__main__':
+    unittest.main()